@@ -0,0 +1,83 @@
+"""
+Benchmark CPU time per response for the JSON decode paths of the providers
+
+Compares the previous `Model(**resp.json())` with the decode paths of
+:mod:`xbox.webapi.common.decoding` on the large test fixtures, and the
+response modes that skip validation.
+
+Usage:
+    python benchmarks/decoding.py --number 200
+"""
+import argparse
+import json
+import os
+import time
+
+from xbox.webapi.api.provider.catalog.models import CatalogResponse
+from xbox.webapi.api.provider.people.models import PeopleResponse
+from xbox.webapi.api.provider.titlehub.models import TitleHubResponse
+from xbox.webapi.common import decoding
+
+RESPONSES_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "data", "responses"
+)
+
+FIXTURES = {
+    "catalog_browse": CatalogResponse,
+    "people_friends_own": PeopleResponse,
+    "titlehub_titlehistory": TitleHubResponse,
+}
+
+
+def parse_with(backend: str):
+    def parse(model, content):
+        decoding.set_json_backend(backend)
+        return decoding.parse_model(model, content)
+
+    return parse
+
+
+def decode_with(mode: decoding.ResponseMode):
+    def parse(model, content):
+        decoding.set_json_backend()
+        ret = decoding.decode(model, content, mode)
+        if mode == decoding.ResponseMode.LAZY:
+            # Partial-field workload: read a single top level field
+            getattr(ret, next(iter(model.model_fields)))
+        return ret
+
+    return parse
+
+
+def measure(parse, model, content: bytes, number: int) -> float:
+    parse(model, content)
+    start = time.process_time()
+    for _ in range(number):
+        parse(model, content)
+    return (time.process_time() - start) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON decode benchmark")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = {"Model(**json.loads())": lambda model, c: model(**json.loads(c))}
+    paths["pydantic model_validate_json"] = parse_with("pydantic")
+    if decoding.orjson is not None:
+        paths["orjson + model_validate"] = parse_with("orjson")
+    paths["response_mode=RAW"] = decode_with(decoding.ResponseMode.RAW)
+    paths["response_mode=DICT"] = decode_with(decoding.ResponseMode.DICT)
+    paths["response_mode=LAZY, 1 field"] = decode_with(decoding.ResponseMode.LAZY)
+
+    for name, model in FIXTURES.items():
+        with open(os.path.join(RESPONSES_PATH, f"{name}.json"), "rb") as f:
+            content = f.read()
+        print(f"{name} ({len(content)} bytes)")
+        for label, parse in paths.items():
+            cpu = measure(parse, model, content, args.number)
+            print(f"  {label:<30} {cpu * 1e6:>9.1f} us CPU/response")
+
+
+if __name__ == "__main__":
+    main()
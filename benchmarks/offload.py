@@ -0,0 +1,106 @@
+"""
+Benchmark event loop stalls while large responses are decoded
+
+Decodes synthetic `MediahubGameclips` responses with 500 clips, while a
+ticker coroutine measures how late it gets scheduled. Compares decoding
+on the event loop with a thread and a process pool.
+
+Usage:
+    python benchmarks/offload.py --responses 20
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import os
+import statistics
+import time
+from types import SimpleNamespace
+
+from httpx import Response
+
+from xbox.webapi.api.provider.baseprovider import BaseProvider
+from xbox.webapi.api.provider.mediahub.models import MediahubGameclips
+from xbox.webapi.common.decoding import ResponseMode
+
+RESPONSES_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "data", "responses"
+)
+TICK = 0.001
+
+
+def make_response(count: int) -> Response:
+    with open(os.path.join(RESPONSES_PATH, "mediahub_gameclips_own.json")) as f:
+        data = json.load(f)
+    data["values"] = data["values"] * count
+    return Response(200, content=json.dumps(data).encode())
+
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def run(executor, response: Response, responses: int) -> dict:
+    client = SimpleNamespace(
+        response_mode=ResponseMode.MODEL,
+        parse_executor=executor,
+        parse_offload_threshold=256 * 1024,
+    )
+    provider = BaseProvider(client)
+    # Warm up the pool
+    await provider._parse_response(response, MediahubGameclips)
+
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            provider._parse_response(response, MediahubGameclips)
+            for _ in range(responses)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+
+    lags.sort()
+    return {
+        "elapsed": elapsed,
+        "p50": statistics.median(lags),
+        "p99": lags[int(len(lags) * 0.99)],
+        "max": lags[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response decode offload benchmark")
+    parser.add_argument("--responses", type=int, default=20)
+    parser.add_argument("--clips", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    response = make_response(args.clips)
+    print(f"{args.responses} responses of {len(response.content)} bytes")
+
+    with ThreadPoolExecutor(args.workers) as threads, ProcessPoolExecutor(
+        args.workers
+    ) as processes:
+        for label, executor in (
+            ("event loop", None),
+            ("thread pool", threads),
+            ("process pool", processes),
+        ):
+            r = asyncio.run(run(executor, response, args.responses))
+            print(
+                f"  {label:<13} total {r['elapsed'] * 1e3:7.1f} ms, loop lag "
+                f"p50 {r['p50'] * 1e3:6.2f} ms, p99 {r['p99'] * 1e3:6.2f} ms, "
+                f"max {r['max'] * 1e3:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
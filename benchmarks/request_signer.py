@@ -0,0 +1,48 @@
+"""
+Benchmark CPU time of RequestSigner per signing backend
+
+Usage:
+    python benchmarks/request_signer.py --number 500
+"""
+import argparse
+from datetime import datetime, timezone
+import time
+
+from ecdsa import NIST256p, SigningKey
+
+from xbox.webapi.common.request_signer import RequestSigner
+from xbox.webapi.common.signing_backend import BACKENDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request signing benchmark")
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    signing_key = SigningKey.generate(curve=NIST256p)
+    timestamp = datetime.now(timezone.utc)
+    body = b'{"Properties": {}}' * 64
+
+    signatures = {}
+    for name in BACKENDS:
+        try:
+            signer = RequestSigner(signing_key, backend=name)
+        except ImportError as e:
+            print(f"{name:<14} skipped: {e}")
+            continue
+
+        def sign():
+            return signer.sign("POST", "/device/authenticate", body, "", timestamp)
+
+        signatures[name] = sign()
+        start = time.process_time()
+        for _ in range(args.number):
+            sign()
+        cpu = (time.process_time() - start) / args.number
+        print(f"{name:<14} {cpu * 1e6:>8.1f} us CPU/signature")
+
+    print(f"identical signatures: {len(set(signatures.values())) == 1}")
+
+
+if __name__ == "__main__":
+    main()
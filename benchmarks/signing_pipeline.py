@@ -0,0 +1,106 @@
+"""
+Microbenchmark of the request signing pipeline of SignedSession
+
+1. CPU time to build the digest of a request body, streamed in 4 KB
+   chunks: previous `body += chunk` + concatenation vs incremental hashing
+2. Event loop lag while many requests are signed concurrently, on the
+   loop vs in a thread pool
+
+Usage:
+    python benchmarks/signing_pipeline.py --number 2000
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import os
+import time
+
+from xbox.webapi.common.request_signer import RequestSigner
+
+SIZES = [0, 256, 1024, 4096, 8192, 65536, 1024 * 1024]
+CHUNK = 4096
+ARGS = dict(
+    signature_version=b"\x00\x00\x00\x01",
+    method="POST",
+    path_and_query="/device/authenticate",
+    authorization="",
+    ts_bytes=RequestSigner.get_timestamp_buffer(datetime.now(timezone.utc)),
+    max_body_bytes=8192,
+)
+
+
+def digest_concat(chunks) -> bytes:
+    body = b""
+    for chunk in chunks:
+        body += chunk
+    return RequestSigner._hash(RequestSigner._concat_data_to_sign(body=body, **ARGS))
+
+
+def digest_incremental(chunks) -> bytes:
+    return RequestSigner._hash_data_to_sign(body_chunks=chunks, **ARGS)
+
+
+def measure(fn, chunks, number: int) -> float:
+    start = time.process_time()
+    for _ in range(number):
+        fn(chunks)
+    return (time.process_time() - start) / number
+
+
+async def loop_lag(signer: RequestSigner, executor, requests: int) -> float:
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+
+    async def sign():
+        # Spread the requests like independent tasks would be
+        await asyncio.sleep(0)
+        return await signer.sign_async(
+            "POST", "/device/authenticate", [b"{}"], executor=executor
+        )
+
+    await asyncio.gather(*(sign() for _ in range(requests)))
+    stop.set()
+    await tick
+    return max(lags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Signing pipeline benchmark")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    print("Digest CPU per request, body in 4 KB chunks")
+    for size in SIZES:
+        body = os.urandom(size)
+        chunks = [body[i : i + CHUNK] for i in range(0, size, CHUNK)]
+        assert digest_concat(chunks) == digest_incremental(chunks)
+        number = max(10, args.number * 1024 // max(size, 1024))
+        old = measure(digest_concat, chunks, number)
+        new = measure(digest_incremental, chunks, number)
+        print(
+            f"  {size:>8} bytes: concat {old * 1e6:8.1f} us, "
+            f"incremental {new * 1e6:6.1f} us"
+        )
+
+    print(f"Max event loop lag, {args.requests} concurrent signatures")
+    for backend in ("ecdsa", "cryptography"):
+        signer = RequestSigner(backend=backend)
+        with ThreadPoolExecutor(2) as executor:
+            for label, ex in (("on loop", None), ("thread pool", executor)):
+                lag = asyncio.run(loop_lag(signer, ex, args.requests))
+                print(f"  {backend:<13} {label:<12} {lag * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark request throughput of SignedSession for different transport configs
+
+Starts a local HTTP/1.1 stub server in a separate process, which answers
+every request after a fixed delay, and fires concurrent requests at it.
+
+Usage:
+    python benchmarks/transport.py --requests 1000 --concurrency 50
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from xbox.webapi.common.signed_session import SignedSession
+from xbox.webapi.common.transport import TransportConfig
+
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 2\r\n"
+    b"\r\n"
+    b"{}"
+)
+
+CONFIGS = {
+    "default": TransportConfig(),
+    "keepalive-100": TransportConfig(max_keepalive_connections=100),
+    "keepalive-100, per-host-50": TransportConfig(
+        max_keepalive_connections=100, max_connections_per_host=50
+    ),
+}
+
+
+async def handle_connection(reader, writer, delay: float, connections):
+    with connections.get_lock():
+        connections.value += 1
+    try:
+        while True:
+            # Requests of the benchmark carry no body
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            await asyncio.sleep(delay)
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(delay: float, port_queue, connections):
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(r, w, delay, connections),
+        "127.0.0.1",
+        0,
+        # Avoid dropped connection attempts, they cost a TCP retransmit (1s)
+        backlog=4096,
+    )
+    port_queue.put(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+def run_server(delay: float, port_queue, connections):
+    asyncio.run(serve(delay, port_queue, connections))
+
+
+async def run(config: TransportConfig, url: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with SignedSession(transport_config=config) as session:
+
+        async def request():
+            async with semaphore:
+                resp = await session.get(url)
+                resp.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[request() for _ in range(requests)])
+        return time.perf_counter() - start
+
+
+async def async_main():
+    parser = argparse.ArgumentParser(description="SignedSession transport benchmark")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--delay", type=float, default=0.02, help="Server latency in seconds"
+    )
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    connections = multiprocessing.Value("i", 0)
+    server = multiprocessing.Process(
+        target=run_server, args=(args.delay, port_queue, connections), daemon=True
+    )
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/users/me/profile"
+
+    try:
+        for name, config in CONFIGS.items():
+            connections.value = 0
+            elapsed = await run(config, url, args.requests, args.concurrency)
+            print(
+                f"{name:<28} {args.requests / elapsed:>8.0f} req/s  "
+                f"{connections.value:>5} connections opened"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(async_main())
@@ -98,3 +98,23 @@ async def test_achievement_one_recent_progress(respx_mock, xbl_client):
 
     assert len(ret.titles) == 32
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_achievements_iter_xboxone(respx_mock, xbl_client):
+    page = get_response_json("achievements_one_gameprogress")
+    last_page = dict(page, pagingInfo={"continuationToken": None, "totalRecords": 64})
+    route = respx_mock.get("https://achievements.xboxlive.com").mock(
+        side_effect=[Response(200, json=page), Response(200, json=last_page)]
+    )
+    achievements = [
+        a
+        async for a in xbl_client.achievements.iter_xboxone_achievements(
+            "2669321029139235", title_id="219630713"
+        )
+    ]
+
+    assert len(achievements) == 64
+    assert route.call_count == 2
+    assert route.calls[1].request.url.params["continuationToken"] == "32"
+    assert route.calls[1].request.url.params["titleId"] == "219630713"
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 from httpx import Response
@@ -97,3 +98,47 @@ async def test_xsts_properties(auth_mgr):
     assert auth_mgr.xsts_token.age_group == "Adult"
     assert auth_mgr.xsts_token.privileges == ""
     assert auth_mgr.xsts_token.user_privileges == ""
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_single_flight(respx_mock, auth_mgr):
+    # Expire Tokens
+    expired = datetime.now(timezone.utc) - timedelta(days=10)
+    auth_mgr.oauth.issued = expired
+    auth_mgr.user_token.not_after = expired
+    auth_mgr.xsts_token.not_after = expired
+
+    route1 = respx_mock.post("https://login.live.com").mock(
+        return_value=Response(200, json=get_response_json("auth_oauth2_token"))
+    )
+    route2 = respx_mock.post("https://user.auth.xboxlive.com/user/authenticate").mock(
+        return_value=Response(200, json=get_response_json("auth_user_token"))
+    )
+    route3 = respx_mock.post("https://xsts.auth.xboxlive.com/xsts/authorize").mock(
+        return_value=Response(200, json=get_response_json("auth_xsts_token"))
+    )
+    await asyncio.gather(*[auth_mgr.refresh_tokens() for _ in range(50)])
+    assert route1.call_count == 1
+    assert route2.call_count == 1
+    assert route3.call_count == 1
+    assert auth_mgr.tokens_valid()
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_ahead_in_background(respx_mock, auth_mgr):
+    now = datetime.now(timezone.utc)
+    auth_mgr.oauth.issued = now
+    auth_mgr.user_token.not_after = now + timedelta(days=1)
+    # Still valid, but within the refresh-ahead window
+    auth_mgr.xsts_token.not_after = now + timedelta(minutes=1)
+
+    route = respx_mock.post("https://xsts.auth.xboxlive.com/xsts/authorize").mock(
+        return_value=Response(200, json=get_response_json("auth_xsts_token"))
+    )
+    await auth_mgr.refresh_tokens()
+    # Caller is not blocked by the refresh
+    assert not route.called
+
+    await auth_mgr._refresh_task
+    assert route.call_count == 1
+    assert auth_mgr.xsts_token.is_valid(timedelta(days=1))
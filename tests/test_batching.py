@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from xbox.webapi.common.batching import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_merges_lookups():
+    batches = []
+
+    async def load_batch(keys):
+        batches.append(keys)
+        return {k: k * 2 for k in keys if k != 3}
+
+    batcher = MicroBatcher(load_batch, max_batch_size=10, window=0.01)
+    results = await asyncio.gather(*[batcher.load(k) for k in [1, 2, 3, 1]])
+
+    assert results == [2, 4, None, 2]
+    assert batches == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_max_batch_size():
+    batches = []
+
+    async def load_batch(keys):
+        batches.append(keys)
+        return {k: k for k in keys}
+
+    batcher = MicroBatcher(load_batch, max_batch_size=2, window=60)
+    results = await asyncio.wait_for(
+        asyncio.gather(*[batcher.load(k) for k in range(4)]), timeout=1
+    )
+
+    assert results == [0, 1, 2, 3]
+    assert batches == [[0, 1], [2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_error():
+    async def load_batch(keys):
+        raise ValueError("failed")
+
+    batcher = MicroBatcher(load_batch, max_batch_size=10, window=0.01)
+    results = await asyncio.gather(
+        batcher.load(1), batcher.load(2), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
@@ -0,0 +1,186 @@
+import time
+
+from httpx import Request, Response
+import pytest
+
+from xbox.webapi.api.client import XboxLiveClient
+from xbox.webapi.authentication.manager import AuthenticationManager
+from xbox.webapi.authentication.models import XSTSDisplayClaims
+from xbox.webapi.common.cache import (
+    CacheEntry,
+    InMemoryCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+)
+
+from tests.common import get_response_json
+
+
+def make_entry(content: bytes, ttl: float = 60) -> CacheEntry:
+    return CacheEntry(
+        200, [("content-type", "application/json")], content, time.time() + ttl
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_title_info(respx_mock, auth_mgr):
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_titleinfo"))
+    )
+    cache = ResponseCache()
+    xbl_client = XboxLiveClient(auth_mgr, cache=cache)
+
+    first = await xbl_client.titlehub.get_title_info("1717113201")
+    second = await xbl_client.titlehub.get_title_info("1717113201")
+
+    assert route.call_count == 1
+    assert first == second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+    await xbl_client.titlehub.get_title_info("1717113201", cache_ttl=0)
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_profile_does_not_consume_rate_limit(respx_mock, auth_mgr):
+    respx_mock.get("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_by_xuid"))
+    )
+    xbl_client = XboxLiveClient(auth_mgr, cache=ResponseCache())
+
+    for _ in range(3):
+        await xbl_client.profile.get_profile_by_xuid("2669321029139235")
+
+    assert xbl_client.profile.rate_limit_read.get_counter() == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_scoped_per_account(respx_mock, auth_mgr):
+    route = respx_mock.get("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_by_xuid"))
+    )
+    cache = ResponseCache()
+    client_a = XboxLiveClient(auth_mgr, cache=cache)
+
+    other_mgr = AuthenticationManager(auth_mgr.session, "abc", "123", "")
+    other_mgr.oauth = auth_mgr.oauth
+    other_mgr.user_token = auth_mgr.user_token
+    xui = [{**auth_mgr.xsts_token.display_claims.xui[0], "xid": "1234567890"}]
+    other_mgr.xsts_token = auth_mgr.xsts_token.model_copy(
+        update={"display_claims": XSTSDisplayClaims(xui=xui)}
+    )
+    client_b = XboxLiveClient(other_mgr, cache=cache)
+
+    # Responses are filtered per requester, other accounts must not get them
+    await client_a.profile.get_profile_by_xuid("2669321029139235")
+    await client_b.profile.get_profile_by_xuid("2669321029139235")
+    assert route.call_count == 2
+
+    await client_b.profile.get_profile_by_xuid("2669321029139235")
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_no_cache_by_default(respx_mock, xbl_client):
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_titleinfo"))
+    )
+    await xbl_client.titlehub.get_title_info("1717113201")
+    await xbl_client.titlehub.get_title_info("1717113201")
+
+    assert route.call_count == 2
+
+
+def test_cache_key():
+    key = ResponseCache.make_key(
+        "GET",
+        "https://profile.xboxlive.com/users/me",
+        params={"b": "2", "a": "1"},
+        headers={"x-xbl-contract-version": "3", "MS-CV": "abc.1"},
+    )
+    # Volatile headers are not part of the key
+    assert key == ResponseCache.make_key(
+        "get",
+        "https://profile.xboxlive.com/users/me",
+        params={"b": "2", "a": "1"},
+        headers={"x-xbl-contract-version": "3", "MS-CV": "abc.2"},
+    )
+    assert key != ResponseCache.make_key(
+        "GET",
+        "https://profile.xboxlive.com/users/me",
+        params={"b": "2", "a": "1"},
+        headers={"x-xbl-contract-version": "2"},
+    )
+    assert key != ResponseCache.make_key(
+        "GET",
+        "https://profile.xboxlive.com/users/me",
+        params={"b": "2", "a": "1"},
+        headers={"x-xbl-contract-version": "3"},
+        scope="2669321029139235",
+    )
+
+
+def test_cache_skips_unsuccessful_responses():
+    cache = ResponseCache()
+    request = Request("GET", "https://example.com")
+    cache.set("key", Response(500, content=b"error", request=request), ttl=60)
+
+    assert cache.get("key", request) is None
+
+
+def test_in_memory_backend_lru_entries():
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.set("a", make_entry(b"a"))
+    backend.set("b", make_entry(b"b"))
+    # Mark "a" as recently used
+    assert backend.get("a") is not None
+    backend.set("c", make_entry(b"c"))
+
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.get("c") is not None
+
+
+def test_in_memory_backend_lru_bytes():
+    entry_size = make_entry(b"x" * 100).size
+    backend = InMemoryCacheBackend(max_bytes=entry_size * 2)
+    for key in "abc":
+        backend.set(key, make_entry(b"x" * 100))
+
+    assert backend.get("a") is None
+    assert backend.get("b") is not None
+    assert backend.get("c") is not None
+
+    # Entries larger than the bound are not cached at all
+    backend.set("d", make_entry(b"x" * entry_size * 3))
+    assert backend.get("d") is None
+    assert backend.get("c") is not None
+
+
+def test_in_memory_backend_expiry():
+    backend = InMemoryCacheBackend()
+    backend.set("a", make_entry(b"a", ttl=-1))
+
+    assert backend.get("a") is None
+
+
+def test_sqlite_backend(tmp_path):
+    path = str(tmp_path / "cache.db")
+    backend = SQLiteCacheBackend(path, max_entries=2)
+    backend.set("a", make_entry(b"a"))
+    backend.set("expired", make_entry(b"b", ttl=-1))
+    backend.close()
+
+    # Entries persist across instances
+    backend = SQLiteCacheBackend(path, max_entries=2)
+    entry = backend.get("a")
+    assert entry.content == b"a"
+    assert entry.headers == [("content-type", "application/json")]
+    assert backend.get("expired") is None
+
+    backend.set("b", make_entry(b"b"))
+    backend.set("c", make_entry(b"c"))
+    assert backend.get("c") is not None
+    assert len([k for k in "abc" if backend.get(k) is not None]) == 2
+    backend.close()
@@ -0,0 +1,87 @@
+import asyncio
+
+from httpx import Response
+import pytest
+
+from xbox.webapi.api.client import XboxLiveClient
+
+from tests.common import get_response_json
+
+
+def mock_title_info(respx_mock):
+    async def slow_response(request):
+        await asyncio.sleep(0.01)
+        return Response(200, json=get_response_json("titlehub_titleinfo"))
+
+    return respx_mock.get("https://titlehub.xboxlive.com").mock(
+        side_effect=slow_response
+    )
+
+
+@pytest.mark.asyncio
+async def test_coalesce_identical_requests(respx_mock, xbl_client):
+    route = mock_title_info(respx_mock)
+
+    results = await asyncio.gather(
+        *[xbl_client.titlehub.get_title_info("1717113201") for _ in range(5)]
+    )
+
+    assert route.call_count == 1
+    assert all(r == results[0] for r in results)
+    assert xbl_client.session.coalesce_hits == 4
+
+    # Completed requests are not reused
+    await xbl_client.titlehub.get_title_info("1717113201")
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_counts_rate_limit_once(respx_mock, xbl_client):
+    respx_mock.get("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_by_xuid"))
+    )
+
+    await asyncio.gather(
+        *[xbl_client.profile.get_profile_by_xuid("2669321029139235") for _ in range(3)]
+    )
+
+    assert xbl_client.profile.rate_limit_read.get_counter() == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce_different_requests(respx_mock, xbl_client):
+    route = mock_title_info(respx_mock)
+
+    await asyncio.gather(
+        xbl_client.titlehub.get_title_info("1717113201"),
+        xbl_client.titlehub.get_title_info("219630713"),
+    )
+
+    assert route.call_count == 2
+    assert xbl_client.session.coalesce_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesce_disabled(respx_mock, auth_mgr):
+    route = mock_title_info(respx_mock)
+    xbl_client = XboxLiveClient(auth_mgr, coalesce_requests=False)
+
+    await asyncio.gather(
+        *[xbl_client.titlehub.get_title_info("1717113201") for _ in range(3)]
+    )
+
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_coalesce_cancelled_caller(respx_mock, xbl_client):
+    route = mock_title_info(respx_mock)
+
+    first = asyncio.ensure_future(xbl_client.titlehub.get_title_info("1717113201"))
+    second = asyncio.ensure_future(xbl_client.titlehub.get_title_info("1717113201"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    ret = await second
+    assert ret.titles
+    assert route.call_count == 1
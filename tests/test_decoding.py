@@ -0,0 +1,215 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from httpx import Response
+from pydantic import ValidationError
+import pytest
+
+from xbox.webapi.api.client import XboxLiveClient
+from xbox.webapi.api.provider.catalog.models import CatalogResponse
+from xbox.webapi.api.provider.people.models import PeopleResponse
+from xbox.webapi.api.provider.presence.models import PresenceBatchResponse
+from xbox.webapi.api.provider.profile.models import ProfileUser
+from xbox.webapi.api.provider.titlehub.models import TitleHubResponse
+from xbox.webapi.common import decoding
+
+from tests.common import get_response, get_response_json
+
+
+@pytest.fixture(params=["pydantic", "orjson"])
+def json_backend(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    decoding.set_json_backend(request.param)
+    yield request.param
+    decoding.set_json_backend()
+
+
+@pytest.mark.parametrize(
+    "model,name",
+    [
+        (CatalogResponse, "catalog_browse"),
+        (PeopleResponse, "people_friends_own"),
+        (TitleHubResponse, "titlehub_titlehistory"),
+        (PresenceBatchResponse, "presence_batch"),
+    ],
+)
+def test_parse_model(json_backend, model, name):
+    content = get_response(name).encode()
+
+    assert decoding.parse_model(model, content) == model.model_validate(
+        decoding.loads(content)
+    )
+
+
+def test_default_json_backend():
+    decoding.set_json_backend()
+    assert decoding.JSON_BACKEND == "pydantic"
+
+
+def test_set_json_backend_unknown():
+    with pytest.raises(ValueError):
+        decoding.set_json_backend("simdjson")
+
+
+def test_lazy_model():
+    content = get_response("titlehub_titlehistory").encode()
+    expected = TitleHubResponse.model_validate_json(content)
+
+    lazy = decoding.decode(TitleHubResponse, content, decoding.ResponseMode.LAZY)
+
+    assert lazy.xuid == expected.xuid
+    assert len(lazy.titles) == len(expected.titles)
+    # Nested models are proxied too, aliased fields resolve to their JSON key
+    title = lazy.titles[0]
+    assert isinstance(title, decoding.LazyModel)
+    assert title.title_id == expected.titles[0].title_id
+    assert title.devices == expected.titles[0].devices
+    assert title.achievement.current_gamerscore == (
+        expected.titles[0].achievement.current_gamerscore
+    )
+    assert lazy.validate() == expected
+
+    with pytest.raises(AttributeError):
+        lazy.unknown_field
+
+
+def test_lazy_model_missing_required_field():
+    content = b'{"xuid": "2669321029139235", "titles": [{"name": "Halo"}]}'
+    lazy = decoding.decode(TitleHubResponse, content, decoding.ResponseMode.LAZY)
+
+    # Fields that are not accessed are not validated
+    assert lazy.titles[0].name == "Halo"
+    with pytest.raises(ValidationError):
+        lazy.titles[0].title_id
+
+
+@pytest.mark.asyncio
+async def test_response_mode(respx_mock, auth_mgr):
+    respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_titlehistory"))
+    )
+    client = XboxLiveClient(auth_mgr, response_mode=decoding.ResponseMode.DICT)
+
+    ret = await client.titlehub.get_title_history("2669321029139235")
+    assert isinstance(ret, dict)
+    assert ret == get_response_json("titlehub_titlehistory")
+
+    # Per call override
+    ret = await client.titlehub.get_title_history(
+        "2669321029139235", response_mode=decoding.ResponseMode.RAW
+    )
+    assert isinstance(ret, bytes)
+
+    ret = await client.titlehub.get_title_history(
+        "2669321029139235", response_mode=decoding.ResponseMode.MODEL
+    )
+    assert isinstance(ret, TitleHubResponse)
+
+
+@pytest.mark.asyncio
+async def test_response_mode_bulk_returns_models(respx_mock, auth_mgr):
+    respx_mock.post("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_batch"))
+    )
+    client = XboxLiveClient(auth_mgr, response_mode=decoding.ResponseMode.RAW)
+
+    profiles = await client.profile.get_profiles_bulk(["2669321029139235"])
+    assert all(isinstance(p, ProfileUser) for p in profiles.values())
+    # Gamertag index is still filled from the validated responses
+    assert all(client.gamertags.get_gamertag(xuid) for xuid in profiles)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", list(decoding.ResponseMode))
+async def test_response_mode_root_model(respx_mock, auth_mgr, mode):
+    respx_mock.post("https://userpresence.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("presence_batch"))
+    )
+    expected = PresenceBatchResponse.model_validate_json(get_response("presence_batch"))
+    client = XboxLiveClient(auth_mgr, response_mode=mode)
+
+    ret = await client.presence.get_presence_batch(["2533274798029092"])
+    if mode == decoding.ResponseMode.RAW:
+        assert PresenceBatchResponse.model_validate_json(ret) == expected
+    elif mode == decoding.ResponseMode.DICT:
+        assert ret == get_response_json("presence_batch")
+    elif mode == decoding.ResponseMode.LAZY:
+        assert [item.xuid for item in ret] == [item.xuid for item in expected.root]
+    else:
+        assert ret == expected.root
+
+
+def test_lazy_root_model():
+    content = get_response("presence_batch").encode()
+    expected = PresenceBatchResponse.model_validate_json(content)
+
+    lazy = decoding.decode(PresenceBatchResponse, content, decoding.ResponseMode.LAZY)
+    assert isinstance(lazy.root[0], decoding.LazyModel)
+    assert lazy.root[0].state == expected.root[0].state
+    assert lazy.validate() == expected
+
+
+def test_lazy_model_non_dict_data():
+    lazy = decoding.decode(TitleHubResponse, b"[]", decoding.ResponseMode.LAZY)
+    with pytest.raises(ValidationError):
+        lazy.xuid
+
+
+class CountingExecutor(Executor):
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(1)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return self.pool.submit(fn, *args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_parse_offload_threshold(respx_mock, auth_mgr):
+    respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_titlehistory"))
+    )
+    executor = CountingExecutor()
+    client = XboxLiveClient(
+        auth_mgr, parse_executor=executor, parse_offload_threshold=1024 * 1024
+    )
+
+    ret = await client.titlehub.get_title_history("2669321029139235")
+    assert isinstance(ret, TitleHubResponse)
+    assert executor.submitted == 0
+
+    client.parse_offload_threshold = 1024
+    offloaded = await client.titlehub.get_title_history("2669321029139235")
+    assert offloaded == ret
+    assert executor.submitted == 1
+
+    # Nothing to decode
+    await client.titlehub.get_title_history(
+        "2669321029139235", response_mode=decoding.ResponseMode.RAW
+    )
+    assert executor.submitted == 1
+
+    lazy = await client.titlehub.get_title_history(
+        "2669321029139235", response_mode=decoding.ResponseMode.LAZY
+    )
+    assert isinstance(lazy, decoding.LazyModel)
+    assert lazy.validate() == ret
+    assert executor.submitted == 2
+    executor.pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_parse_offload_process_pool(respx_mock, auth_mgr):
+    respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("titlehub_titlehistory"))
+    )
+    with ProcessPoolExecutor(1) as executor:
+        client = XboxLiveClient(
+            auth_mgr, parse_executor=executor, parse_offload_threshold=0
+        )
+        ret = await client.titlehub.get_title_history("2669321029139235")
+
+    assert ret == TitleHubResponse.model_validate(
+        get_response_json("titlehub_titlehistory")
+    )
@@ -132,3 +132,35 @@ async def test_gameclips_saved_community(respx_mock, xbl_client):
 
     assert len(ret.game_clips) == 99
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_gameclips_iter_saved_clips(respx_mock, xbl_client):
+    page = get_response_json("gameclips_saved_xuid")
+    last_page = dict(page, pagingInfo={"continuationToken": None})
+    route = respx_mock.get("https://gameclipsmetadata.xboxlive.com").mock(
+        side_effect=[Response(200, json=page), Response(200, json=last_page)]
+    )
+    clips = [
+        clip async for clip in xbl_client.gameclips.iter_saved_clips("2669321029139235")
+    ]
+
+    assert len(clips) == 50
+    assert route.call_count == 2
+    assert "continuationToken" not in route.calls[0].request.url.params
+    assert (
+        route.calls[1].request.url.params["continuationToken"] == "abcde_vwxyzGQAAAA2"
+    )
+
+
+@pytest.mark.asyncio
+async def test_gameclips_iter_saved_clips_max_items(respx_mock, xbl_client):
+    route = respx_mock.get("https://gameclipsmetadata.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("gameclips_saved_own"))
+    )
+    clips = [clip async for clip in xbl_client.gameclips.iter_saved_clips(max_items=5)]
+
+    assert len(clips) == 5
+    assert route.call_count == 1
+    assert route.calls[0].request.url.path == "/users/me/clips/saved"
+    assert route.calls[0].request.url.params["maxItems"] == "5"
@@ -0,0 +1,124 @@
+from httpx import Response
+import pytest
+
+from xbox.webapi.api.client import XboxLiveClient
+from xbox.webapi.api.gamertags import GamertagResolver
+
+from tests.common import get_response_json
+
+
+@pytest.mark.asyncio
+async def test_index_filled_by_responses(respx_mock, xbl_client):
+    respx_mock.get("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_by_xuid"))
+    )
+    respx_mock.get("https://usersearch.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("usersearch_live_search"))
+    )
+    respx_mock.get("https://peoplehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("people_friends_own"))
+    )
+    await xbl_client.profile.get_profile_by_xuid("2669321029139235")
+    await xbl_client.usersearch.get_live_search("tux")
+    friends = await xbl_client.people.get_friends_own()
+
+    gamertags = xbl_client.gamertags
+    assert gamertags.get_gamertag("2669321029139235") == "e"
+    assert gamertags.get_xuid("E") == "2669321029139235"
+    assert gamertags.get_xuid("tux") == "2533274895244106"
+
+    person = friends.people[0]
+    assert gamertags.get_xuid(person.gamertag) == person.xuid
+    assert gamertags.get_xuid(person.unique_modern_gamertag) == person.xuid
+
+
+@pytest.mark.asyncio
+async def test_resolve_xuids(respx_mock, xbl_client):
+    route = respx_mock.get("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_by_gamertag"))
+    )
+    xbl_client.gamertags.add("2533274895244106", "Tux")
+
+    ret = await xbl_client.gamertags.resolve_xuids(["tux", "e"])
+    assert ret == {"tux": "2533274895244106", "e": "2669321029139235"}
+    # Only the miss went to the network
+    assert route.call_count == 1
+
+    await xbl_client.gamertags.resolve_xuids(["tux", "e"])
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_xuids_not_found(respx_mock, xbl_client):
+    respx_mock.get("https://profile.xboxlive.com").mock(return_value=Response(404))
+
+    assert await xbl_client.gamertags.resolve_xuids(["doesnotexist"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_resolve_gamertags(respx_mock, xbl_client):
+    route = respx_mock.post("https://profile.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("profile_batch"))
+    )
+    ret = await xbl_client.gamertags.resolve_gamertags(
+        ["2669321029139235", "2584878536129841"]
+    )
+
+    assert route.call_count == 1
+    assert set(ret) == {"2669321029139235", "2584878536129841"}
+
+
+def test_rename_drops_old_gamertag(xbl_client):
+    gamertags = xbl_client.gamertags
+    gamertags.add("1", "OldName")
+    gamertags.add("1", "NewName")
+
+    assert gamertags.get_xuid("OldName") is None
+    assert gamertags.get_xuid("newname") == "1"
+    assert gamertags.get_gamertag("1") == "NewName"
+
+
+def test_persist_index(tmp_path, auth_mgr):
+    path = str(tmp_path / "gamertags.json")
+    client = XboxLiveClient(auth_mgr, gamertag_index_file=path)
+    client.gamertags.add("1", "Name", "Name#1234")
+    client.gamertags.save()
+
+    resolver = GamertagResolver(client, path)
+    assert len(resolver) == 1
+    assert resolver.get_xuid("name#1234") == "1"
+    assert resolver.get_gamertag("1") == "Name"
+
+
+def test_index_written_back(tmp_path, auth_mgr):
+    path = tmp_path / "gamertags.json"
+    client = XboxLiveClient(auth_mgr, gamertag_index_file=str(path))
+    client.gamertags.save_interval = 0
+
+    # Saved as the index grows
+    client.gamertags.add("1", "Name")
+    assert len(GamertagResolver(client, str(path))) == 1
+
+    # Debounced, the rest is written on flush
+    client.gamertags.save_interval = 60
+    client.gamertags.add("2", "Other")
+    assert len(GamertagResolver(client, str(path))) == 1
+    client.gamertags.flush()
+    assert len(GamertagResolver(client, str(path))) == 2
+
+
+def test_gamertag_moved_to_other_xuid(auth_mgr):
+    resolver = GamertagResolver(XboxLiveClient(auth_mgr))
+    resolver.add("1", "Foo", "Foo#1234")
+    resolver.add("3", "Bar")
+
+    resolver.add("2", "Foo")
+    assert resolver.get_xuid("foo") == "2"
+    assert resolver.get_gamertag("2") == "Foo"
+    # Previous owner keeps its other gamertags only
+    assert resolver.get_gamertag("1") == "Foo#1234"
+    assert resolver.get_xuid("foo#1234") == "1"
+
+    resolver.add("2", "Bar")
+    assert resolver.get_gamertag("3") is None
+    assert len(resolver) == 2
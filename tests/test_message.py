@@ -83,3 +83,22 @@ async def test_message_send_too_long(xbl_client):
         await xbl_client.message.send_message("12345", message)
 
     assert "exceeds max length" in str(err)
+
+
+@pytest.mark.asyncio
+async def test_iter_conversation_messages(respx_mock, xbl_client):
+    page = get_response_json("message_get_conversation")
+    route = respx_mock.get("https://xblmessaging.xboxlive.com").mock(
+        side_effect=[
+            Response(200, json=dict(page, continuationToken="next")),
+            Response(200, json=page),
+        ]
+    )
+    messages = [
+        m
+        async for m in xbl_client.message.iter_conversation_messages("2669321029139235")
+    ]
+
+    assert len(messages) == 4
+    assert route.call_count == 2
+    assert route.calls[1].request.url.params["continuationToken"] == "next"
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from xbox.webapi.common.pagination import paginate
+
+
+def make_fetcher(pages, calls):
+    async def fetch_page(continuation_token):
+        calls.append(continuation_token)
+        index = int(continuation_token or 0)
+        next_token = str(index + 1) if index + 1 < len(pages) else None
+        return pages[index], next_token
+
+    return fetch_page
+
+
+@pytest.mark.asyncio
+async def test_paginate_all_pages():
+    calls = []
+    fetch_page = make_fetcher([[1, 2], [3, 4], [5]], calls)
+
+    assert [item async for item in paginate(fetch_page)] == [1, 2, 3, 4, 5]
+    assert calls == [None, "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_paginate_max_items():
+    calls = []
+    fetch_page = make_fetcher([[1, 2], [3, 4], [5]], calls)
+
+    assert [item async for item in paginate(fetch_page, max_items=3)] == [1, 2, 3]
+    # The page after the cap is never requested
+    assert calls == [None, "1"]
+
+    calls.clear()
+    assert [item async for item in paginate(fetch_page, max_items=2)] == [1, 2]
+    assert calls == [None]
+
+
+@pytest.mark.asyncio
+async def test_paginate_prefetch():
+    calls = []
+    fetch_page = make_fetcher([[1, 2], [3]], calls)
+    iterator = paginate(fetch_page)
+
+    assert await iterator.__anext__() == 1
+    await asyncio.sleep(0)
+    # Next page requested while the first one is consumed
+    assert calls == [None, "1"]
+    await iterator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_paginate_no_prefetch():
+    calls = []
+    fetch_page = make_fetcher([[1, 2], [3]], calls)
+    iterator = paginate(fetch_page, prefetch=False)
+
+    assert await iterator.__anext__() == 1
+    await asyncio.sleep(0)
+    assert calls == [None]
+    assert [item async for item in iterator] == [2, 3]
+    assert calls == [None, "1"]
+
+
+@pytest.mark.asyncio
+async def test_paginate_stops_on_empty_page():
+    async def fetch_page(continuation_token):
+        return [], "always"
+
+    assert [item async for item in paginate(fetch_page)] == []
@@ -1,6 +1,11 @@
+import asyncio
+import json
+
 from httpx import Response
 import pytest
 
+from xbox.webapi.api.client import XboxLiveClient
+
 from tests.common import get_response_json
 
 
@@ -79,3 +84,21 @@ async def test_people_summary_by_gamertag(respx_mock, xbl_client):
     await xbl_client.people.get_friends_summary_by_gamertag("e")
 
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_person_own_micro_batching(respx_mock, auth_mgr):
+    route = respx_mock.post("https://peoplehub.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("people_batch"))
+    )
+    xbl_client = XboxLiveClient(auth_mgr, micro_batch_window=0.01)
+    xuids = [p["xuid"] for p in get_response_json("people_batch")["people"]]
+
+    people = await asyncio.gather(
+        *[xbl_client.people.get_person_own(x) for x in xuids + ["1"]]
+    )
+
+    assert route.call_count == 1
+    assert json.loads(route.calls[0].request.content)["xuids"] == xuids + ["1"]
+    assert [p.xuid for p in people[:-1]] == xuids
+    assert people[-1] is None
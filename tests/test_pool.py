@@ -0,0 +1,114 @@
+import asyncio
+
+from httpx import Response
+import pytest
+import pytest_asyncio
+
+from xbox.webapi.api.pool import XboxLiveClientPool
+from xbox.webapi.authentication.models import (
+    OAuth2TokenResponse,
+    XAUResponse,
+    XSTSResponse,
+)
+from xbox.webapi.authentication.scheduler import RefreshScheduler
+from xbox.webapi.common.signed_session import SignedSession
+
+from tests.common import get_response, get_response_json
+
+
+@pytest_asyncio.fixture(scope="function")
+async def pool():
+    pool = XboxLiveClientPool()
+    for token in ("token_a", "token_b"):
+        mgr = pool.create_auth_manager("abc", "123", "http://localhost")
+        mgr.oauth = OAuth2TokenResponse.model_validate_json(
+            get_response("auth_oauth2_token")
+        )
+        mgr.user_token = XAUResponse.model_validate_json(
+            get_response("auth_user_token")
+        )
+        mgr.xsts_token = XSTSResponse.model_validate_json(
+            get_response("auth_xsts_token")
+        ).model_copy(update={"token": token})
+        pool.add_account(mgr)
+    async with pool:
+        yield pool
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_session(pool):
+    client_a, client_b = pool.clients
+
+    assert client_a._auth_mgr.session is pool.session
+    assert client_b._auth_mgr.session is pool.session
+    # Separate budgets per account
+    assert client_a.profile.rate_limit_read is not client_b.profile.rate_limit_read
+
+    foreign = pool.create_auth_manager("abc", "123", "http://localhost")
+    foreign.session = SignedSession()
+    with pytest.raises(ValueError):
+        pool.add_account(foreign)
+    await foreign.session.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_routes_by_remaining_budget(pool):
+    client_a, client_b = pool.clients
+    for _ in range(5):
+        client_a.profile.rate_limit_read.increment()
+
+    assert client_a.profile.rate_limit_read.get_remaining() == 5
+    assert client_b.profile.rate_limit_read.get_remaining() == 10
+    assert pool.get_client("profile") is client_b
+
+    # Providers without rate limits rotate
+    assert [pool.get_client("titlehub") for _ in range(4)] == [
+        client_a,
+        client_b,
+        client_a,
+        client_b,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pool_spreads_concurrent_requests(respx_mock, pool):
+    tokens = []
+
+    def handler(request):
+        tokens.append(request.headers["Authorization"].rsplit(";", 1)[1])
+        return Response(200, json=get_response_json("profile_by_xuid"))
+
+    respx_mock.get("https://profile.xboxlive.com").mock(side_effect=handler)
+
+    await asyncio.gather(
+        *(pool.profile.get_profile_by_xuid(str(xuid)) for xuid in range(10))
+    )
+
+    assert sorted(tokens) == ["token_a"] * 5 + ["token_b"] * 5
+    for client in pool.clients:
+        assert client.profile.rate_limit_read.get_remaining() == 5
+
+
+@pytest.mark.asyncio
+async def test_pool_does_not_route_own_requests(pool):
+    with pytest.raises(AttributeError):
+        pool.presence.get_presence_own
+
+
+@pytest.mark.asyncio
+async def test_pool_refresh_scheduler(pool):
+    scheduler = RefreshScheduler()
+    pool.refresh_scheduler = scheduler
+    mgr = pool.create_auth_manager("abc", "123", "http://localhost")
+    source = pool.clients[0]._auth_mgr
+    mgr.oauth, mgr.user_token, mgr.xsts_token = (
+        source.oauth,
+        source.user_token,
+        source.xsts_token,
+    )
+    client = pool.add_account(mgr)
+
+    # oauth, user and xsts token
+    assert scheduler.pending == 3
+    pool.remove_account(client)
+    assert id(mgr) not in scheduler._managers
@@ -1,6 +1,10 @@
+import asyncio
+import json
+
 from httpx import Response
 import pytest
 
+from xbox.webapi.api.client import XboxLiveClient
 from xbox.webapi.api.provider.presence.models import PresenceState
 
 from tests.common import get_response_json
@@ -70,3 +74,40 @@ async def test_presence_own_set_fail(respx_mock, xbl_client):
 
     assert route.called
     assert not ret
+
+
+@pytest.mark.asyncio
+async def test_presence_bulk(respx_mock, xbl_client):
+    def echo_presence(request):
+        users = json.loads(request.content)["users"]
+        assert len(users) <= xbl_client.presence.BATCH_MAX_XUIDS
+        return Response(200, json=[{"xuid": x, "state": "Offline"} for x in users])
+
+    route = respx_mock.post("https://userpresence.xboxlive.com/users/batch").mock(
+        side_effect=echo_presence
+    )
+    xuids = [str(2533274800000000 + i) for i in range(2500)]
+    ret = await xbl_client.presence.get_presence_bulk(xuids + xuids[:100])
+
+    # 2500 unique xuids -> 3 batches
+    assert route.call_count == 3
+    assert len(ret) == 2500
+    assert ret[xuids[1234]].xuid == xuids[1234]
+
+
+@pytest.mark.asyncio
+async def test_presence_micro_batching(respx_mock, auth_mgr):
+    def echo_presence(request):
+        users = json.loads(request.content)["users"]
+        return Response(200, json=[{"xuid": x, "state": "Offline"} for x in users])
+
+    batch_route = respx_mock.post("https://userpresence.xboxlive.com/users/batch").mock(
+        side_effect=echo_presence
+    )
+    xbl_client = XboxLiveClient(auth_mgr, micro_batch_window=0.01)
+
+    xuids = [str(2533274800000000 + i) for i in range(10)]
+    items = await asyncio.gather(*[xbl_client.presence.get_presence(x) for x in xuids])
+
+    assert batch_route.call_count == 1
+    assert [item.xuid for item in items] == xuids
@@ -1,6 +1,11 @@
+import asyncio
+import json
+
 from httpx import Response
 import pytest
 
+from xbox.webapi.api.client import XboxLiveClient
+
 from tests.common import get_response_json
 
 
@@ -40,3 +45,51 @@ async def test_profiles_batch(respx_mock, xbl_client):
     assert len(ret.profile_users) == 2
 
     assert route.called
+
+
+@pytest.mark.asyncio
+async def test_profiles_bulk(respx_mock, xbl_client):
+    def echo_profiles(request):
+        user_ids = json.loads(request.content)["userIds"]
+        assert len(user_ids) <= xbl_client.profile.BATCH_MAX_XUIDS
+        users = [
+            {"id": x, "hostId": x, "settings": [], "isSponsoredUser": False}
+            for x in user_ids
+        ]
+        return Response(200, json={"profileUsers": users})
+
+    route = respx_mock.post(
+        "https://profile.xboxlive.com/users/batch/profile/settings"
+    ).mock(side_effect=echo_profiles)
+    xuids = [str(2533274800000000 + i) for i in range(250)]
+    ret = await xbl_client.profile.get_profiles_bulk(xuids + xuids[:50])
+
+    # 250 unique xuids -> 3 batches
+    assert route.call_count == 3
+    assert len(ret) == 250
+    assert ret[xuids[123]].host_id == xuids[123]
+
+
+@pytest.mark.asyncio
+async def test_profile_by_xuid_micro_batching(respx_mock, auth_mgr):
+    def echo_profiles(request):
+        users = [
+            {"id": x, "hostId": x, "settings": [], "isSponsoredUser": False}
+            for x in json.loads(request.content)["userIds"]
+        ]
+        return Response(200, json={"profileUsers": users})
+
+    batch_route = respx_mock.post(
+        "https://profile.xboxlive.com/users/batch/profile/settings"
+    ).mock(side_effect=echo_profiles)
+    xbl_client = XboxLiveClient(auth_mgr, micro_batch_window=0.01)
+
+    xuids = [str(2533274800000000 + i) for i in range(5)]
+    responses = await asyncio.gather(
+        *[xbl_client.profile.get_profile_by_xuid(x) for x in xuids]
+    )
+
+    assert batch_route.call_count == 1
+    assert [r.profile_users[0].id for r in responses] == xuids
+    settings = json.loads(batch_route.calls[0].request.content)["settings"]
+    assert settings == xbl_client.profile.SINGLE_PROFILE_SETTINGS
@@ -1,13 +1,31 @@
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import multiprocessing
 
-from httpx import Response
+from httpx import HTTPStatusError, Response
 import pytest
 
+from xbox.webapi.api.client import XboxLiveClient
 from xbox.webapi.api.provider.ratelimitedprovider import RateLimitedProvider
 from xbox.webapi.common.exceptions import RateLimitExceededException, XboxException
-from xbox.webapi.common.ratelimits import CombinedRateLimit
-from xbox.webapi.common.ratelimits.models import TimePeriod
+from xbox.webapi.common.ratelimits import (
+    CombinedRateLimit,
+    RateLimit,
+    SlidingWindowRateLimit,
+    parse_retry_after,
+)
+from xbox.webapi.common.ratelimits.models import (
+    IncrementResult,
+    LimitType,
+    ParsedRateLimit,
+    RateLimitPolicy,
+    TimePeriod,
+)
+from xbox.webapi.common.ratelimits.stores import (
+    InMemoryRateLimitStore,
+    SQLiteRateLimitStore,
+)
 
 from tests.common import get_response_json
 
@@ -240,3 +258,301 @@ async def test_ratelimits_exceeded_sustain_only(respx_mock, xbl_client):
     # The SUSTAIN counter has not been reset during this test, so the try again in should be 300 seconds since we started this test.
     delta: timedelta = try_again_in - start_time
     assert delta.seconds == TimePeriod.SUSTAIN.value  # 300 seconds (5 minutes)
+
+
+class ShortRateLimit(RateLimit):
+    """Rate limit allowing `limit` requests per `period` seconds"""
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.counter = 0
+        self.reset_after = None
+
+    def _reset_if_required(self):
+        if self.reset_after is not None and self.reset_after < datetime.now():
+            self.counter = 0
+            self.reset_after = None
+
+    def get_counter(self) -> int:
+        return self.counter
+
+    def get_reset_after(self):
+        return self.reset_after
+
+    def is_exceeded(self) -> bool:
+        self._reset_if_required()
+        return self.counter >= self.limit
+
+    def increment(self) -> IncrementResult:
+        self._reset_if_required()
+        self.counter += 1
+        if self.counter == 1:
+            self.reset_after = datetime.now() + timedelta(seconds=self.period)
+        return IncrementResult(counter=self.counter, exceeded=self.is_exceeded())
+
+
+@pytest.mark.asyncio
+async def test_ratelimits_policy_wait(respx_mock, xbl_client):
+    route = respx_mock.get("https://social.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("people_summary_own"))
+    )
+    rate_limit = ShortRateLimit(limit=2, period=0.2)
+    order = []
+
+    async def make_request(i: int):
+        await xbl_client.session.get(
+            "https://social.xboxlive.com/users/me/summary",
+            rate_limits=rate_limit,
+            rate_limit_policy=RateLimitPolicy.WAIT,
+            # Identical requests, do not share one network call
+            coalesce=False,
+        )
+        order.append(i)
+
+    start_time = datetime.now()
+    await asyncio.gather(*[make_request(i) for i in range(5)])
+
+    # 5 requests at 2 per window need three windows
+    assert datetime.now() - start_time >= timedelta(seconds=0.4)
+    assert route.call_count == 5
+    assert order == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_ratelimits_policy_per_provider(xbl_client):
+    assert xbl_client.session.rate_limit_policy == RateLimitPolicy.RAISE
+    assert xbl_client.people.rate_limit_policy is None
+
+    xbl_client.people.rate_limit_policy = RateLimitPolicy.WAIT
+    assert xbl_client.people.rate_limit_read.policy == RateLimitPolicy.WAIT
+    assert xbl_client.people.rate_limit_write.policy == RateLimitPolicy.WAIT
+
+
+def test_ratelimitedprovider_default_limit_class(xbl_client):
+    for limit in xbl_client.people.rate_limit_read.get_limits():
+        assert isinstance(limit, SlidingWindowRateLimit)
+
+
+def test_sliding_window_no_double_burst_at_boundary(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        "xbox.webapi.common.ratelimits.stores.monotonic", lambda: now[0]
+    )
+
+    limit = SlidingWindowRateLimit(TimePeriod.BURST, LimitType.READ, 10)
+
+    # Spend the budget late in a would-be fixed window
+    now[0] += 14
+    for _ in range(10):
+        limit.increment()
+    assert limit.is_exceeded()
+
+    # A fixed window starting at the first request would have reset by now
+    now[0] += 2
+    assert limit.is_exceeded()
+    assert limit.get_counter() == 10
+
+    # Budget frees once the requests leave the window
+    now[0] += 13
+    assert not limit.is_exceeded()
+    assert limit.get_counter() == 0
+    assert limit.get_reset_after() is None
+
+
+def test_sliding_window_frees_one_slot_at_a_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        "xbox.webapi.common.ratelimits.stores.monotonic", lambda: now[0]
+    )
+
+    limit = SlidingWindowRateLimit(TimePeriod.BURST, LimitType.READ, 2)
+    limit.increment()
+    now[0] += 5
+    result = limit.increment()
+    assert result.counter == 2
+    assert result.exceeded
+
+    reset_after = limit.get_reset_after()
+    assert timedelta(seconds=9) < reset_after - datetime.now() <= timedelta(seconds=10)
+
+    # Oldest request leaves the window, second is still counted
+    now[0] += 10
+    assert not limit.is_exceeded()
+    assert limit.get_counter() == 1
+
+
+@pytest.mark.asyncio
+async def test_ratelimits_server_throttle(respx_mock, xbl_client):
+    route = respx_mock.get("https://social.xboxlive.com").mock(
+        return_value=Response(
+            429,
+            headers={"Retry-After": "30"},
+            json={
+                "code": 429,
+                "source": "Microsoft.Xbox.Services.Throttling",
+                "description": "Rate limit exceeded",
+                "limitType": "Rate",
+                "currentRequests": "6",
+                "maxRequests": "5",
+                "periodInSeconds": "15",
+            },
+        )
+    )
+    rate_limit = xbl_client.people.rate_limit_read
+
+    with pytest.raises(HTTPStatusError):
+        await xbl_client.people.get_friends_summary_own()
+    assert route.called
+
+    # Server reported limit replaces the local burst limit
+    assert rate_limit.get_limits_by_period(TimePeriod.BURST)[0].get_limit() == 5
+    assert rate_limit.get_limits_by_period(TimePeriod.SUSTAIN)[0].get_limit() == 30
+
+    # Retry-After is honored, even though local counters are not exceeded
+    assert rate_limit.is_exceeded()
+    delta = rate_limit.get_reset_after() - datetime.now()
+    assert timedelta(seconds=29) < delta <= timedelta(seconds=30)
+
+    with pytest.raises(RateLimitExceededException):
+        await xbl_client.people.get_friends_summary_own()
+    assert route.call_count == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("invalid") is None
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("-5") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    seconds = parse_retry_after(format_datetime(retry_at, usegmt=True))
+    assert 58 < seconds <= 60
+
+
+def test_sqlite_store_shared_between_connections(tmp_path):
+    path = str(tmp_path / "ratelimits.db")
+    # Two connections, as used by two processes
+    store_a = SQLiteRateLimitStore(path)
+    store_b = SQLiteRateLimitStore(path)
+
+    limit = ParsedRateLimit(read=3, write=3, period=TimePeriod.BURST)
+    worker_a = CombinedRateLimit(limit, type=LimitType.READ, store=store_a, key="x")
+    worker_b = CombinedRateLimit(limit, type=LimitType.READ, store=store_b, key="x")
+    other_key = CombinedRateLimit(limit, type=LimitType.READ, store=store_b, key="y")
+
+    worker_a.increment()
+    worker_b.increment()
+    assert worker_a.get_counter() == 2
+    assert not worker_b.is_exceeded()
+
+    worker_a.increment()
+    assert worker_b.is_exceeded()
+    assert worker_b.get_reset_after() is not None
+    assert not other_key.is_exceeded()
+
+    store_a.close()
+    store_b.close()
+
+
+def test_store_shared_between_clients(auth_mgr):
+    store = InMemoryRateLimitStore()
+    client_a = XboxLiveClient(auth_mgr, rate_limit_store=store)
+    client_b = XboxLiveClient(auth_mgr, rate_limit_store=store)
+
+    for _ in range(client_a.people.RATE_LIMITS["burst"]):
+        client_a.people.rate_limit_read.increment()
+
+    # Same xuid, provider and limit type share one budget
+    assert client_b.people.rate_limit_read.is_exceeded()
+    assert not client_b.people.rate_limit_write.is_exceeded()
+    assert not client_b.profile.rate_limit_read.is_exceeded()
+
+
+@pytest.mark.asyncio
+async def test_ratelimits_raise_concurrent_shared_store(respx_mock, auth_mgr):
+    async def respond(request):
+        # Keep all requests in flight at once
+        await asyncio.sleep(0.01)
+        return Response(200, json=get_response_json("people_summary_own"))
+
+    route = respx_mock.get("https://social.xboxlive.com").mock(side_effect=respond)
+    store = InMemoryRateLimitStore()
+    clients = [
+        XboxLiveClient(auth_mgr, rate_limit_store=store, coalesce_requests=False)
+        for _ in range(2)
+    ]
+
+    results = await asyncio.gather(
+        *[clients[i % 2].people.get_friends_summary_own() for i in range(40)],
+        return_exceptions=True,
+    )
+
+    # Slots are reserved before sending, only the burst budget goes out
+    burst = clients[0].people.RATE_LIMITS["burst"]
+    assert route.call_count == burst
+    exceeded = [r for r in results if isinstance(r, RateLimitExceededException)]
+    assert len(exceeded) == 40 - burst
+
+
+def spend_budget(path: str, attempts: int, results) -> None:
+    store = SQLiteRateLimitStore(path, timeout=30)
+    limit = ParsedRateLimit(read=10, write=10, period=TimePeriod.SUSTAIN)
+    rate_limit = CombinedRateLimit(limit, type=LimitType.READ, store=store, key="x")
+    results.put(sum(rate_limit.try_increment() for _ in range(attempts)))
+    store.close()
+
+
+def test_sqlite_store_try_add_atomic_across_processes(tmp_path):
+    path = str(tmp_path / "ratelimits.db")
+    SQLiteRateLimitStore(path).close()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=spend_budget, args=(path, 10, results)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    counted = sum(results.get(timeout=60) for _ in processes)
+    for process in processes:
+        process.join()
+
+    # Every process passed the check of an empty log, only the budget was counted
+    assert counted == 10
+
+
+@pytest.mark.parametrize("store_class", [InMemoryRateLimitStore, SQLiteRateLimitStore])
+def test_combined_try_increment(tmp_path, store_class):
+    store = (
+        SQLiteRateLimitStore(str(tmp_path / "ratelimits.db"))
+        if store_class is SQLiteRateLimitStore
+        else InMemoryRateLimitStore()
+    )
+    burst = ParsedRateLimit(read=3, write=3, period=TimePeriod.BURST)
+    sustain = ParsedRateLimit(read=5, write=5, period=TimePeriod.SUSTAIN)
+    rate_limit = CombinedRateLimit(
+        burst, sustain, type=LimitType.READ, store=store, key="x"
+    )
+
+    assert [rate_limit.try_increment() for _ in range(4)] == [True] * 3 + [False]
+    # A failed attempt is not counted by any limit
+    assert [limit.get_counter() for limit in rate_limit.get_limits()] == [3, 3]
+
+    rate_limit.set_retry_after(30)
+    rate_limit.set_server_limit(10, TimePeriod.BURST.value)
+    assert not rate_limit.try_increment()
+
+
+def test_shared_store_without_xsts_token(auth_mgr):
+    # Clients may be created before authenticating
+    auth_mgr.xsts_token, xsts_token = None, auth_mgr.xsts_token
+    client = XboxLiveClient(auth_mgr, rate_limit_store=InMemoryRateLimitStore())
+    client.people.rate_limit_policy = RateLimitPolicy.WAIT
+
+    auth_mgr.xsts_token = xsts_token
+    rate_limit = client.people.rate_limit_read
+    assert rate_limit.policy == RateLimitPolicy.WAIT
+    assert rate_limit.get_limits()[0].get_window(0)[0].startswith(xsts_token.xuid)
@@ -0,0 +1,160 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from xbox.webapi.authentication.manager import AuthenticationManager
+from xbox.webapi.authentication.models import XSTSResponse, utc_now
+from xbox.webapi.authentication.scheduler import RefreshScheduler
+
+
+def expire_xsts_in(auth_mgr: AuthenticationManager, delta: timedelta) -> None:
+    auth_mgr.xsts_token = auth_mgr.xsts_token.model_copy(
+        update={"not_after": utc_now() + delta}
+    )
+
+
+def mock_xsts_refresh(auth_mgr: AuthenticationManager, calls: list, delay=0.0):
+    token = auth_mgr.xsts_token
+
+    async def request_xsts_token() -> XSTSResponse:
+        calls.append(auth_mgr)
+        await asyncio.sleep(delay)
+        return token.model_copy(update={"not_after": utc_now() + timedelta(hours=1)})
+
+    auth_mgr.request_xsts_token = request_xsts_token
+
+
+@pytest.mark.asyncio
+async def test_refresh_before_expiry(auth_mgr):
+    calls = []
+    expire_xsts_in(auth_mgr, timedelta(seconds=1.05))
+    mock_xsts_refresh(auth_mgr, calls)
+    expires = auth_mgr.xsts_token.not_after
+
+    scheduler = RefreshScheduler(
+        refresh_ahead=timedelta(seconds=1), jitter=timedelta(0)
+    )
+    scheduler.add(auth_mgr)
+    assert scheduler.pending == 3
+    assert scheduler.get_next_due() == expires - timedelta(seconds=1)
+
+    async with scheduler:
+        await asyncio.sleep(0.2)
+
+    assert calls == [auth_mgr]
+    assert auth_mgr.xsts_token.not_after > expires
+    assert scheduler.metrics.refreshes == 1
+    assert scheduler.metrics.failures == 0
+    assert scheduler.metrics.expired == 0
+    assert 0 <= scheduler.metrics.max_lag < 0.2
+    # Rescheduled for the new token
+    assert scheduler.pending == 3
+    assert scheduler.get_next_due() > utc_now() + timedelta(minutes=30)
+
+
+@pytest.mark.asyncio
+async def test_refresh_failure_retried(auth_mgr):
+    expire_xsts_in(auth_mgr, timedelta(seconds=-1))
+
+    async def request_xsts_token():
+        raise ConnectionError("Network is unreachable")
+
+    auth_mgr.request_xsts_token = request_xsts_token
+    scheduler = RefreshScheduler(
+        refresh_ahead=timedelta(seconds=1),
+        jitter=timedelta(0),
+        retry_delay=timedelta(seconds=60),
+    )
+    scheduler.add(auth_mgr)
+
+    async with scheduler:
+        await asyncio.sleep(0.1)
+
+    assert scheduler.metrics.failures == 1
+    assert scheduler.metrics.expired == 1
+    assert scheduler.pending == 3
+    assert scheduler.get_next_due() > utc_now() + timedelta(seconds=25)
+
+
+@pytest.mark.asyncio
+async def test_tiers_tracked_after_refresh(auth_mgr):
+    # Only an OAuth token, as stored by the auth script
+    mgr = AuthenticationManager(auth_mgr.session, "abc", "123", "http://localhost")
+    mgr.oauth = auth_mgr.oauth.model_copy(
+        update={"issued": utc_now() - timedelta(seconds=auth_mgr.oauth.expires_in - 1)}
+    )
+
+    async def refresh_oauth_token():
+        return auth_mgr.oauth.model_copy(update={"issued": utc_now()})
+
+    async def request_user_token():
+        return auth_mgr.user_token
+
+    async def request_xsts_token():
+        return auth_mgr.xsts_token
+
+    mgr.refresh_oauth_token = refresh_oauth_token
+    mgr.request_user_token = request_user_token
+    mgr.request_xsts_token = request_xsts_token
+
+    scheduler = RefreshScheduler(
+        refresh_ahead=timedelta(seconds=1), jitter=timedelta(0)
+    )
+    scheduler.add(mgr)
+    assert scheduler.pending == 1
+
+    async with scheduler:
+        await asyncio.sleep(0.1)
+
+    assert scheduler.metrics.refreshes == 1
+    # User and XSTS tokens issued by the refresh are scheduled too
+    tiers = sorted(entry.tier for _, _, entry in scheduler._heap)
+    assert tiers == ["oauth", "user", "xsts"]
+
+    # Tracked tiers are not scheduled twice
+    scheduler._track(mgr)
+    assert scheduler.pending == 3
+
+
+@pytest.mark.asyncio
+async def test_bounded_concurrency(auth_mgr):
+    calls = []
+    auth_mgrs = []
+    for _ in range(6):
+        mgr = AuthenticationManager(auth_mgr.session, "abc", "123", "http://localhost")
+        mgr.oauth = auth_mgr.oauth
+        mgr.user_token = auth_mgr.user_token
+        mgr.xsts_token = auth_mgr.xsts_token
+        expire_xsts_in(mgr, timedelta(seconds=0.5))
+        mock_xsts_refresh(mgr, calls, delay=0.05)
+        auth_mgrs.append(mgr)
+
+    scheduler = RefreshScheduler(
+        refresh_ahead=timedelta(seconds=1), jitter=timedelta(0), max_concurrency=2
+    )
+    for mgr in auth_mgrs:
+        scheduler.add(mgr)
+    scheduler.remove(auth_mgrs[-1])
+
+    async with scheduler:
+        await asyncio.sleep(0.02)
+        assert len(calls) == 2
+        await asyncio.sleep(0.2)
+
+    assert sorted(map(id, calls)) == sorted(map(id, auth_mgrs[:-1]))
+    assert scheduler.metrics.refreshes == 5
+    # Waiting for a free slot shows up as lag
+    assert scheduler.metrics.max_lag >= 0.1
+
+
+def test_jitter(auth_mgr):
+    scheduler = RefreshScheduler(
+        refresh_ahead=timedelta(minutes=5), jitter=timedelta(minutes=1)
+    )
+    expires = utc_now() + timedelta(hours=1)
+    dues = [scheduler._get_due(expires) for _ in range(100)]
+
+    latest = (expires - timedelta(minutes=5)).timestamp()
+    assert all(latest - 60 <= due <= latest for due in dues)
+    assert len(set(dues)) > 1
@@ -1,9 +1,18 @@
 import base64
 from binascii import unhexlify
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
 import pytest
+from ecdsa import NIST256p, NIST384p, SigningKey
 from ecdsa.keys import VerifyingKey, BadSignatureError
 
 from xbox.webapi.common.request_signer import RequestSigner
+from xbox.webapi.common.signing_backend import (
+    CryptographyBackend,
+    EcdsaBackend,
+    get_signing_backend,
+)
 
 
 def test_synthetic_proof_key(synthetic_request_signer: RequestSigner):
@@ -101,3 +110,87 @@ def test_import(ecdsa_signing_key_str: str):
     export = signer.export_signing_key()
 
     assert ecdsa_signing_key_str == export
+
+
+@pytest.mark.parametrize("backend", ["ecdsa", "cryptography"])
+def test_backend_signature(
+    ecdsa_signing_key: SigningKey, synthetic_timestamp, backend: str
+):
+    if backend == "cryptography":
+        pytest.importorskip("cryptography")
+    signer = RequestSigner(ecdsa_signing_key, backend=backend)
+    assert signer.backend.name == backend
+
+    test_signature = signer.sign(
+        method="POST",
+        path_and_query="/path?query=1",
+        body=b"thebodygoeshere",
+        authorization="XBL3.0 x=userid;jsonwebtoken",
+        timestamp=synthetic_timestamp,
+    )
+
+    assert (
+        test_signature
+        == "AAAAAQHWE40Q98yAFe3R7GuZfvGA350cH7hWgg4HIHjaD9lGYiwxki6bNyGnB8dMEIfEmBiuNuGUfWjY5lL2h44X/VMGOkPIezVb7Q=="
+    )
+
+
+def test_backends_byte_compatible():
+    pytest.importorskip("cryptography")
+    for _ in range(20):
+        signing_key = SigningKey.generate(curve=NIST256p)
+        digest = hashlib.sha256(os.urandom(64)).digest()
+
+        signature = CryptographyBackend(signing_key).sign_digest(digest)
+
+        assert signature == EcdsaBackend(signing_key).sign_digest(digest)
+        assert signing_key.verifying_key.verify_digest(signature, digest)
+
+
+def test_backend_selection(ecdsa_signing_key: SigningKey):
+    pytest.importorskip("cryptography")
+    assert get_signing_backend(ecdsa_signing_key).name == "cryptography"
+    # Curves other than P-256 are left to ecdsa
+    other_key = SigningKey.generate(curve=NIST384p)
+    assert get_signing_backend(other_key).name == "ecdsa"
+
+    with pytest.raises(ValueError):
+        get_signing_backend(ecdsa_signing_key, "openssl")
+
+
+@pytest.mark.parametrize("size", [0, 15, 8191, 8192, 8193, 65536])
+def test_hash_data_to_sign_chunked(synthetic_timestamp, size: int):
+    ts_bytes = RequestSigner.get_timestamp_buffer(synthetic_timestamp)
+    body = os.urandom(size)
+    args = dict(
+        signature_version=b"\x00\x00\x00\x01",
+        method="POST",
+        path_and_query="/path?query=1",
+        authorization="XBL3.0 x=userid;jsonwebtoken",
+        ts_bytes=ts_bytes,
+        max_body_bytes=8192,
+    )
+    expected = RequestSigner._hash(
+        RequestSigner._concat_data_to_sign(body=body, **args)
+    )
+    chunks = [body[i : i + 1000] for i in range(0, size, 1000)]
+
+    assert RequestSigner._hash_data_to_sign(body_chunks=chunks, **args) == expected
+
+
+@pytest.mark.asyncio
+async def test_sign_async(synthetic_request_signer: RequestSigner, synthetic_timestamp):
+    args = dict(
+        method="POST",
+        path_and_query="/path?query=1",
+        authorization="XBL3.0 x=userid;jsonwebtoken",
+        timestamp=synthetic_timestamp,
+    )
+    expected = synthetic_request_signer.sign(body=b"thebodygoeshere", **args)
+
+    with ThreadPoolExecutor(1) as executor:
+        signature = await synthetic_request_signer.sign_async(
+            body_chunks=[b"thebody", b"goes", b"here"], executor=executor, **args
+        )
+
+    assert signature == expected
@@ -0,0 +1,143 @@
+import httpx
+from httpx import Response
+import pytest
+
+from xbox.webapi.api.client import XboxLiveClient
+from xbox.webapi.common.retry import NO_RETRY, RetryBudget, RetryPolicy
+
+from tests.common import get_response_json
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+
+@pytest.fixture
+def retrying_client(auth_mgr):
+    return XboxLiveClient(auth_mgr, retry_policy=FAST_RETRY)
+
+
+@pytest.mark.asyncio
+async def test_retry_server_error(respx_mock, retrying_client):
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        side_effect=[
+            Response(503),
+            httpx.ConnectError("Connection reset"),
+            Response(200, json=get_response_json("titlehub_titleinfo")),
+        ]
+    )
+    ret = await retrying_client.titlehub.get_title_info("1717113201")
+
+    assert ret.titles
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up_after_max_attempts(respx_mock, retrying_client):
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(500)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await retrying_client.titlehub.get_title_info("1717113201")
+
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_not_by_default(respx_mock, xbl_client):
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(503)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await xbl_client.titlehub.get_title_info("1717113201")
+
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_idempotent_methods_only(respx_mock, retrying_client):
+    route = respx_mock.post("https://profile.xboxlive.com").mock(
+        return_value=Response(503)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await retrying_client.profile.get_profiles(["2669321029139235"])
+
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_per_provider_and_call(respx_mock, retrying_client):
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(503)
+    )
+    retrying_client.titlehub.retry_policy = NO_RETRY
+    with pytest.raises(httpx.HTTPStatusError):
+        await retrying_client.titlehub.get_title_info("1717113201")
+    assert route.call_count == 1
+
+    # Per call policy overrides the provider policy
+    with pytest.raises(httpx.HTTPStatusError):
+        await retrying_client.titlehub.get_title_info(
+            "1717113201", retry_policy=FAST_RETRY
+        )
+    assert route.call_count == 1 + 3
+
+    # Back to the client policy
+    retrying_client.titlehub.retry_policy = None
+    assert "titlehub.xboxlive.com" not in retrying_client.session.retry_policies
+
+
+@pytest.mark.asyncio
+async def test_retry_after_too_long(respx_mock, retrying_client):
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(429, headers={"Retry-After": "120"})
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await retrying_client.titlehub.get_title_info("1717113201")
+
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_exhausted(respx_mock, auth_mgr):
+    budget = RetryBudget(ratio=0, min_retries_per_second=0.1, ttl=10)
+    xbl_client = XboxLiveClient(auth_mgr, retry_policy=FAST_RETRY, retry_budget=budget)
+    route = respx_mock.get("https://titlehub.xboxlive.com").mock(
+        return_value=Response(503)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await xbl_client.titlehub.get_title_info("1717113201")
+
+    # Budget allows a single retry
+    assert route.call_count == 2
+    assert budget.exhausted == 1
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(base_delay=1, max_delay=10)
+
+    delay = None
+    for _ in range(20):
+        delay = policy.get_delay(delay)
+        assert 1 <= delay <= 10
+
+    # Retry-After is a lower bound, unless it exceeds max_delay
+    assert policy.get_delay(None, retry_after=5) >= 5
+    assert policy.get_delay(None, retry_after=11) is None
+
+
+def test_retry_budget_ratio(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("xbox.webapi.common.retry.monotonic", lambda: now[0])
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0, ttl=10)
+
+    for _ in range(4):
+        budget.record_request()
+    assert budget.try_withdraw()
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
+
+    # Requests and retries expire after ttl
+    now[0] += 10
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
@@ -1,7 +1,12 @@
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
 from httpx import Request, Response
 import pytest
 
 from xbox.webapi.common.signed_session import SignedSession
+from xbox.webapi.common.transport import HostLimitedTransport, TransportConfig
 
 from tests.common import get_response_json
 
@@ -60,3 +65,82 @@ async def test_sending_signed(synthetic_request_signer, respx_mock):
 
     assert route.called
     assert resp.request.headers.get("Signature") is not None
+
+
+@pytest.mark.asyncio
+async def test_sending_signed_executor(synthetic_request_signer, respx_mock):
+    route = respx_mock.post("https://xsts.auth.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("auth_xsts_token"))
+    )
+
+    with ThreadPoolExecutor(1) as executor:
+        signed_session = SignedSession(synthetic_request_signer, sign_executor=executor)
+        request = Request(
+            "POST",
+            "https://xsts.auth.xboxlive.com/xsts/authorize",
+            json={"RelyingParty": "http://xboxlive.com"},
+        )
+        async with signed_session:
+            resp = await signed_session.send_request_signed(request)
+
+    assert route.called
+    signature = base64.b64decode(resp.request.headers["Signature"])
+    digest = synthetic_request_signer._hash(
+        synthetic_request_signer._concat_data_to_sign(
+            signature[:4],
+            "POST",
+            "/xsts/authorize",
+            request.content,
+            "",
+            signature[4:12],
+            8192,
+        )
+    )
+    assert synthetic_request_signer.verify_digest(signature[12:], digest)
+
+
+@pytest.mark.asyncio
+async def test_transport_config(synthetic_request_signer):
+    config = TransportConfig(
+        max_connections=200, max_keepalive_connections=50, read_timeout=30
+    )
+    signed_session = SignedSession(synthetic_request_signer, transport_config=config)
+
+    async with signed_session:
+        assert signed_session.timeout.read == 30
+        assert signed_session.timeout.connect == 5
+        pool = signed_session._transport._pool
+        assert pool._max_connections == 200
+        assert pool._max_keepalive_connections == 50
+
+
+@pytest.mark.asyncio
+async def test_transport_max_connections_per_host(synthetic_request_signer, respx_mock):
+    in_flight = {"profile.xboxlive.com": 0, "titlehub.xboxlive.com": 0}
+    peak = dict(in_flight)
+
+    async def slow_response(request):
+        host = request.url.host
+        in_flight[host] += 1
+        peak[host] = max(peak[host], in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return Response(200, json={})
+
+    respx_mock.get(url__regex=r"https://.*\.xboxlive\.com").mock(
+        side_effect=slow_response
+    )
+    config = TransportConfig(max_connections_per_host=2)
+    signed_session = SignedSession(synthetic_request_signer, transport_config=config)
+    assert isinstance(signed_session._transport, HostLimitedTransport)
+
+    async with signed_session:
+        await asyncio.gather(
+            *[
+                signed_session.get(f"https://{host}/")
+                for host in in_flight
+                for _ in range(5)
+            ]
+        )
+
+    assert peak == {"profile.xboxlive.com": 2, "titlehub.xboxlive.com": 2}
@@ -0,0 +1,199 @@
+import asyncio
+from datetime import timedelta
+import json
+import multiprocessing
+import time
+
+import pytest
+
+from xbox.webapi.authentication.manager import AuthenticationManager
+from xbox.webapi.authentication.models import TokenSet, utc_now
+from xbox.webapi.authentication.stores import FileTokenStore, SQLiteTokenStore
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def make_store(request, tmp_path):
+    if request.param == "file":
+        return lambda: FileTokenStore(str(tmp_path / "tokens.json"))
+    return lambda: SQLiteTokenStore(str(tmp_path / "tokens.db"))
+
+
+def get_tokens(auth_mgr: AuthenticationManager) -> TokenSet:
+    return TokenSet(
+        oauth=auth_mgr.oauth,
+        user_token=auth_mgr.user_token,
+        xsts_token=auth_mgr.xsts_token,
+    )
+
+
+def hold_lock(path: str, seconds: float, ready) -> None:
+    store = FileTokenStore(path)
+    with store.locked():
+        ready.set()
+        time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_roundtrip(make_store, auth_mgr):
+    make_store().save_from(auth_mgr)
+
+    # A fresh process starts without tokens
+    new_mgr = AuthenticationManager(auth_mgr.session, "abc", "123", "")
+    assert make_store().load_into(new_mgr)
+    assert get_tokens(new_mgr) == get_tokens(auth_mgr)
+    assert new_mgr.xsts_token.userhash == auth_mgr.xsts_token.userhash
+
+
+@pytest.mark.asyncio
+async def test_load_missing(make_store, auth_mgr):
+    store = make_store()
+    assert store.load() is None
+    assert not store.load_into(auth_mgr)
+    assert auth_mgr.xsts_token is not None
+
+
+@pytest.mark.asyncio
+async def test_keys(make_store, auth_mgr):
+    store = make_store()
+    store.save(TokenSet(oauth=auth_mgr.oauth), "a")
+    store.save(TokenSet(xsts_token=auth_mgr.xsts_token), "b")
+
+    assert store.load("a") == TokenSet(oauth=auth_mgr.oauth)
+    assert store.load("b") == TokenSet(xsts_token=auth_mgr.xsts_token)
+    assert store.load() is None
+
+
+@pytest.mark.asyncio
+async def test_save_keeps_newer_tokens(make_store, auth_mgr):
+    store = make_store()
+    store.save_from(auth_mgr)
+
+    # A process that refreshed earlier saves its tokens afterwards
+    older = auth_mgr.xsts_token.model_copy(
+        update={"not_after": utc_now() + timedelta(hours=1)}
+    )
+    store.save(TokenSet(xsts_token=older))
+
+    assert store.load() == get_tokens(auth_mgr)
+
+    newer = auth_mgr.xsts_token.model_copy(
+        update={"not_after": auth_mgr.xsts_token.not_after + timedelta(hours=1)}
+    )
+    store.save(TokenSet(xsts_token=newer))
+
+    tokens = store.load()
+    assert tokens.xsts_token == newer
+    assert tokens.oauth == auth_mgr.oauth
+    assert tokens.user_token == auth_mgr.user_token
+
+
+@pytest.mark.asyncio
+async def test_refresh_skipped_with_stored_tokens(make_store, auth_mgr, respx_mock):
+    make_store().save_from(auth_mgr)
+
+    new_mgr = AuthenticationManager(auth_mgr.session, "abc", "123", "")
+    make_store().load_into(new_mgr)
+    await new_mgr.refresh_tokens()
+
+    assert not respx_mock.calls
+
+
+def test_legacy_file(tmp_path, auth_mgr):
+    path = tmp_path / "tokens.json"
+    path.write_text(auth_mgr.oauth.model_dump_json())
+    store = FileTokenStore(str(path))
+
+    tokens = store.load()
+    assert tokens.oauth == auth_mgr.oauth
+    assert tokens.user_token is None
+
+    # Rewritten in the new format
+    store.save(tokens)
+    assert store.load() == tokens
+    assert list(json.loads(path.read_text())) == ["default"]
+
+
+def test_file_store_atomic_write(tmp_path, auth_mgr):
+    store = FileTokenStore(str(tmp_path / "tokens.json"))
+    store.save_from(auth_mgr)
+
+    # No temporary files are left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "tokens.json",
+        "tokens.json.lock",
+    ]
+
+
+def test_file_store_lock_across_processes(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=hold_lock, args=(path, 0.5, ready))
+    process.start()
+    try:
+        assert ready.wait(5)
+        start = time.monotonic()
+        FileTokenStore(path).load()
+        assert time.monotonic() - start > 0.2
+    finally:
+        process.join()
+
+
+def test_lock_reentrant(make_store):
+    store = make_store()
+    with store.locked():
+        with store.locked():
+            store.save(TokenSet())
+        assert store.load() == TokenSet()
+
+
+@pytest.mark.asyncio
+async def test_alocked_suspends_coroutines(make_store):
+    stores = [make_store(), make_store()]
+    held = []
+
+    async def hold(store):
+        async with store.alocked():
+            held.append(store)
+            await asyncio.sleep(0.05)
+            assert held == [store]
+            held.remove(store)
+            store.save(TokenSet())
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.ensure_future(tick())
+    try:
+        await asyncio.gather(*[hold(store) for store in stores])
+    finally:
+        ticker.cancel()
+
+    # The event loop kept running while the second coroutine waited
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_alocked_waits_for_process_in_thread(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=hold_lock, args=(path, 0.3, ready))
+
+    async def acquire():
+        async with FileTokenStore(path).alocked():
+            pass
+
+    process.start()
+    try:
+        assert ready.wait(5)
+        waiting = asyncio.ensure_future(acquire())
+        # Still held by the other process, the event loop is not blocked
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+        await asyncio.wait_for(waiting, 5)
+    finally:
+        process.join()
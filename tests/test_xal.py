@@ -1,6 +1,12 @@
+from datetime import timedelta
+
 from httpx import AsyncClient, Response
 import pytest
 
+from xbox.webapi.authentication.models import utc_now
+from xbox.webapi.authentication.xal import XALManager
+from xbox.webapi.common.signed_session import SignedSession
+
 from tests.common import get_response_json
 
 
@@ -23,6 +29,61 @@ async def test_get_device_token(respx_mock, xal_mgr):
     assert route.called
 
 
+@pytest.mark.asyncio
+async def test_title_endpoints_cached(respx_mock, xal_mgr, monkeypatch):
+    monkeypatch.setattr(XALManager, "_title_endpoints", None)
+    route = respx_mock.get("https://title.mgt.xboxlive.com").mock(
+        return_value=Response(200, json=get_response_json("auth_title_endpoints"))
+    )
+    async with AsyncClient() as client:
+        endpoints = await xal_mgr.get_title_endpoints(client)
+        assert await XALManager.get_title_endpoints(client) is endpoints
+        assert route.call_count == 1
+
+        await xal_mgr.get_title_endpoints(client, ttl=timedelta(0))
+        assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_device_token_reused(respx_mock, xal_mgr):
+    route = respx_mock.post(
+        "https://device.auth.xboxlive.com/device/authenticate"
+    ).mock(return_value=Response(200, json=get_response_json("auth_device_token")))
+    token = await xal_mgr.get_device_token()
+    assert await xal_mgr.get_device_token() is token
+    assert route.call_count == 1
+
+    xal_mgr.device_token = token.model_copy(
+        update={"not_after": utc_now() + timedelta(minutes=1)}
+    )
+    assert await xal_mgr.get_device_token() == token
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_device_state_roundtrip(respx_mock, xal_mgr):
+    assert xal_mgr.export_device_state() is None
+    respx_mock.post("https://device.auth.xboxlive.com/device/authenticate").mock(
+        return_value=Response(200, json=get_response_json("auth_device_token"))
+    )
+    await xal_mgr.get_device_token()
+    state = xal_mgr.export_device_state()
+
+    async with SignedSession() as session:
+        new_mgr = XALManager(
+            session, xal_mgr.device_id, xal_mgr.app_params, xal_mgr.client_params
+        )
+        new_mgr.import_device_state(state)
+
+        # The device token is bound to the proof key of the signing key
+        assert (
+            session.request_signer.proof_field
+            == xal_mgr.session.request_signer.proof_field
+        )
+        assert await new_mgr.get_device_token() is state.device_token
+        assert respx_mock.calls.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_sisu_authentication(respx_mock, xal_mgr):
     route = respx_mock.post("https://sisu.xboxlive.com/authenticate").mock(
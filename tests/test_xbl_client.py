@@ -1,4 +1,10 @@
+import httpx
+from httpx import Response
+import pytest
+
 from xbox.webapi.api.client import XboxLiveClient
+from xbox.webapi.common.signed_session import SignedSession
+from xbox.webapi.common.transport import TransportConfig
 
 
 def test_authorization_header(auth_mgr):
@@ -8,3 +14,37 @@ def test_authorization_header(auth_mgr):
         client._auth_mgr.xsts_token.authorization_header_value
         == "XBL3.0 x=abcdefg;123456789"
     )
+
+
+@pytest.mark.asyncio
+async def test_warmup(respx_mock, xbl_client, caplog):
+    respx_mock.head("https://cqs.xboxlive.com").mock(
+        side_effect=httpx.ConnectError("Name or service not known")
+    )
+    route = respx_mock.head(url__regex=r"https://.*").mock(return_value=Response(404))
+    ret = await xbl_client.warmup()
+
+    assert ret["https://profile.xboxlive.com"] is True
+    assert ret["https://peoplehub.xboxlive.com"] is True
+    assert ret["https://social.xboxlive.com"] is True
+    assert ret["https://cqs.xboxlive.com"] is False
+    # Account provider declares its endpoints as BASE_URL_*
+    assert ret["https://user.mgt.xboxlive.com"] is True
+    assert ret["https://accounts.xboxlive.com"] is True
+    # One connection per host, no matter how many providers share it
+    assert route.call_count == len(ret) - 1
+    assert "Authorization" not in route.calls[0].request.headers
+    # Default keep-alive expiry drops the connections after 5 seconds
+    assert "keepalive_expiry" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_warmup_keepalive_expiry(respx_mock, auth_mgr, caplog):
+    respx_mock.head(url__regex=r"https://.*").mock(return_value=Response(404))
+    async with SignedSession(
+        transport_config=TransportConfig(keepalive_expiry=300)
+    ) as session:
+        auth_mgr.session = session
+        await XboxLiveClient(auth_mgr).warmup(refresh_tokens=False)
+
+    assert "keepalive_expiry" not in caplog.text
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import timedelta
+
+from httpx import Response
+import pytest
+
+from xbox.webapi.authentication.models import XSTSResponse, utc_now
+from xbox.webapi.authentication.xsts_cache import XSTSTokenCache
+
+from tests.common import get_response, get_response_json
+
+XSTS_URL = "https://xsts.auth.xboxlive.com/xsts/authorize"
+
+
+def make_token(expires_in: timedelta) -> XSTSResponse:
+    token = XSTSResponse.model_validate_json(get_response("auth_xsts_token"))
+    return token.model_copy(update={"not_after": utc_now() + expires_in})
+
+
+def make_issuer(calls: list, expires_in=timedelta(hours=1), delay=0.0):
+    async def issue() -> XSTSResponse:
+        calls.append(None)
+        await asyncio.sleep(delay)
+        return make_token(expires_in)
+
+    return issue
+
+
+@pytest.mark.asyncio
+async def test_request_xsts_token_cached(respx_mock, auth_mgr):
+    route = respx_mock.post(XSTS_URL).mock(
+        return_value=Response(200, json=get_response_json("auth_xsts_token"))
+    )
+
+    token = await auth_mgr.request_xsts_token("http://a.xboxlive.com")
+    assert await auth_mgr.request_xsts_token("http://a.xboxlive.com") is token
+    assert route.call_count == 1
+
+    await auth_mgr.request_xsts_token("http://b.xboxlive.com")
+    assert route.call_count == 2
+    assert b"http://b.xboxlive.com" in route.calls[1].request.content
+
+
+@pytest.mark.asyncio
+async def test_refresh_reissues_default_token(respx_mock, auth_mgr):
+    route = respx_mock.post(XSTS_URL).mock(
+        return_value=Response(200, json=get_response_json("auth_xsts_token"))
+    )
+    await auth_mgr.request_xsts_token()
+    auth_mgr.xsts_token.not_after = utc_now() - timedelta(minutes=1)
+
+    await auth_mgr.refresh_tokens()
+    assert route.call_count == 2
+    assert auth_mgr.xsts_token.is_valid()
+
+
+@pytest.mark.asyncio
+async def test_xal_xsts_authorization_cached(respx_mock, xal_mgr):
+    route = respx_mock.post(XSTS_URL).mock(
+        return_value=Response(200, json=get_response_json("auth_xsts_token"))
+    )
+
+    for _ in range(2):
+        await xal_mgr.xsts_authorization(
+            "eyDevice", "eyTitle", "eyUser", "http://a.xboxlive.com"
+        )
+    assert route.call_count == 1
+
+    await xal_mgr.xsts_authorization(
+        "eyDevice", "eyTitle", "eyOtherUser", "http://a.xboxlive.com"
+    )
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    cache = XSTSTokenCache()
+    calls = []
+    issue = make_issuer(calls, delay=0.01)
+
+    tokens = await asyncio.gather(*[cache.get("rp", "user", issue) for _ in range(5)])
+    assert len(calls) == 1
+    assert all(token is tokens[0] for token in tokens)
+
+
+@pytest.mark.asyncio
+async def test_refresh_ahead():
+    cache = XSTSTokenCache(refresh_ahead=timedelta(minutes=5))
+    calls = []
+
+    old = await cache.get("rp", "user", make_issuer(calls, timedelta(minutes=1)))
+
+    # Returned right away, a new token is issued in the background
+    assert await cache.get("rp", "user", make_issuer(calls)) is old
+    await asyncio.sleep(0.01)
+    assert len(calls) == 2
+
+    new = await cache.get("rp", "user", make_issuer(calls))
+    assert new is not old
+    assert new.is_valid(timedelta(minutes=30))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_and_invalidated():
+    cache = XSTSTokenCache()
+    calls = []
+
+    await cache.get("rp", "user", make_issuer(calls, timedelta(seconds=-1)))
+    await cache.get("rp", "user", make_issuer(calls))
+    assert len(calls) == 2
+
+    cache.invalidate("rp", "user")
+    await cache.get("rp", "user", make_issuer(calls))
+    assert len(calls) == 3
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_issuance_not_cached():
+    cache = XSTSTokenCache()
+    calls = []
+
+    async def fail() -> XSTSResponse:
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("unauthorized")
+
+    results = await asyncio.gather(
+        cache.get("rp", "user", fail),
+        cache.get("rp", "user", fail),
+        return_exceptions=True,
+    )
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(cache) == 0
+
+    await cache.get("rp", "user", make_issuer(calls))
+    assert len(calls) == 2
@@ -4,15 +4,21 @@ Xbox Live Client
 Basic factory that stores :class:`XboxLiveLanguage`, User authorization data
 and available `Providers`
 """
+import asyncio
+from concurrent.futures import Executor
+from datetime import datetime
 import logging
-from typing import Any
+from typing import Any, Dict, Optional
+import weakref
 
-from httpx import Response
+from httpx import URL, HTTPError, Request, Response
 from ms_cv import CorrelationVector
 
+from xbox.webapi.api.gamertags import GamertagResolver
 from xbox.webapi.api.language import DefaultXboxLiveLanguages, XboxLiveLanguage
 from xbox.webapi.api.provider.account import AccountProvider
 from xbox.webapi.api.provider.achievements import AchievementsProvider
+from xbox.webapi.api.provider.baseprovider import BaseProvider
 from xbox.webapi.api.provider.catalog import CatalogProvider
 from xbox.webapi.api.provider.cqs import CQSProvider
 from xbox.webapi.api.provider.gameclips import GameclipProvider
@@ -28,16 +34,56 @@ from xbox.webapi.api.provider.titlehub import TitlehubProvider
 from xbox.webapi.api.provider.usersearch import UserSearchProvider
 from xbox.webapi.api.provider.userstats import UserStatsProvider
 from xbox.webapi.authentication.manager import AuthenticationManager
+from xbox.webapi.common.batching import unique
+from xbox.webapi.common.cache import ResponseCache
+from xbox.webapi.common.decoding import ResponseMode
 from xbox.webapi.common.exceptions import RateLimitExceededException
-from xbox.webapi.common.ratelimits import RateLimit
+from xbox.webapi.common.ratelimits import (
+    CombinedRateLimit,
+    RateLimit,
+    parse_retry_after,
+)
+from xbox.webapi.common.ratelimits.models import RateLimitPolicy
+from xbox.webapi.common.ratelimits.stores import RateLimitStore
+from xbox.webapi.common.retry import RetryBudget, RetryPolicy
 
 log = logging.getLogger("xbox.api")
 
+# Idempotent methods whose concurrent, identical requests share one network call
+COALESCED_METHODS = {"GET", "HEAD"}
+# Keep-alive expiry (seconds) below which warmed connections are likely
+# dropped before the first requests are sent
+WARMUP_MIN_KEEPALIVE_EXPIRY = 60.0
+
 
 class Session:
-    def __init__(self, auth_mgr: AuthenticationManager):
+    def __init__(
+        self,
+        auth_mgr: AuthenticationManager,
+        rate_limit_policy: RateLimitPolicy = RateLimitPolicy.RAISE,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
         self._auth_mgr = auth_mgr
         self._cv = CorrelationVector()
+        self.rate_limit_policy = rate_limit_policy
+        self.cache = cache
+        # Share one network call between identical, concurrent GET/HEAD requests
+        self.coalesce_requests = coalesce_requests
+        # Number of requests served by joining an identical in-flight request
+        self.coalesce_hits = 0
+        # Request key -> asyncio.Task of the in-flight request
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Default retry policy, no retries if None
+        self.retry_policy = retry_policy
+        # Host -> retry policy, set by providers
+        self.retry_policies: Dict[str, RetryPolicy] = {}
+        # Shared by all requests, so retries can't multiply the load of an outage
+        self.retry_budget = retry_budget or RetryBudget()
+        # RateLimit -> asyncio.Lock, waiters queue up per rate limit object
+        self._rate_limit_locks = weakref.WeakKeyDictionary()
 
     async def request(
         self,
@@ -48,7 +94,8 @@ class Session:
         **kwargs: Any,
     ) -> Response:
         """Proxy Request and add Auth/CV headers."""
-        headers = kwargs.pop("headers", {})
+        # Copied, providers pass their class level header dicts
+        headers = dict(kwargs.pop("headers", None) or {})
         params = kwargs.pop("params", None)
         data = kwargs.pop("data", None)
 
@@ -59,6 +106,25 @@ class Session:
 
         # Rate limit object
         rate_limits: RateLimit = kwargs.pop("rate_limits", None)
+        rate_limit_policy: Optional[RateLimitPolicy] = kwargs.pop(
+            "rate_limit_policy", None
+        )
+
+        # Seconds to cache the response for, if the session has a cache
+        cache_ttl: Optional[float] = kwargs.pop("cache_ttl", None)
+
+        # Join an identical in-flight request, if enabled on the session
+        coalesce: bool = kwargs.pop("coalesce", True)
+
+        # Handled by the provider when decoding the response
+        kwargs.pop("response_mode", None)
+
+        # Per call, per provider (by host) or session wide retry policy
+        retry_policy: Optional[RetryPolicy] = (
+            kwargs.pop("retry_policy", None)
+            or self.retry_policies.get(URL(url).host)
+            or self.retry_policy
+        )
 
         if include_auth:
             # Ensure tokens valid
@@ -76,27 +142,201 @@ class Session:
             headers.update(extra_headers)
         if extra_params:
             # query parameters
-            params = params or {}
-            params.update(extra_params)
+            params = {**(params or {}), **extra_params}
         if extra_data:
             # form encoded post data
-            data = data or {}
-            data.update(extra_data)
+            data = {**(data or {}), **extra_data}
 
-        if rate_limits:
-            # Check if rate limits have been exceeded for this endpoint
-            if rate_limits.is_exceeded():
-                raise RateLimitExceededException("Rate limit exceeded", rate_limits)
+        cache_key = None
+        if self.cache is not None and cache_ttl and method.upper() == "GET":
+            # Cached per account, the key leaves out the Authorization header
+            scope = self._auth_mgr.xsts_token.xuid if include_auth else ""
+            cache_key = ResponseCache.make_key(method, url, params, headers, scope)
+            cached = self.cache.get(
+                cache_key, Request(method, url, params=params, headers=headers)
+            )
+            if cached is not None:
+                return cached
 
-        response = await self._auth_mgr.session.request(
-            method, url, **kwargs, headers=headers, params=params, data=data
+        send = self._send(
+            method,
+            url,
+            rate_limits,
+            rate_limit_policy,
+            retry_policy,
+            cache_key,
+            cache_ttl,
+            **kwargs,
+            headers=headers,
+            params=params,
+            data=data,
         )
+        if not (
+            coalesce
+            and self.coalesce_requests
+            and method.upper() in COALESCED_METHODS
+            and data is None
+            and not kwargs
+        ):
+            return await send
+
+        key = cache_key or ResponseCache.make_key(method, url, params, headers)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(send)
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_inflight_done(key, t))
+        else:
+            send.close()
+            self.coalesce_hits += 1
+        # A cancelled caller must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        rate_limits: Optional[RateLimit],
+        rate_limit_policy: Optional[RateLimitPolicy],
+        retry_policy: Optional[RetryPolicy],
+        cache_key: Optional[str],
+        cache_ttl: Optional[float],
+        **kwargs: Any,
+    ) -> Response:
+        """
+        Send the request, repeating it on transient failures per `retry_policy`
+        """
+        self.retry_budget.record_request()
+        attempt = 1
+        delay: Optional[float] = None
+        while True:
+            try:
+                response = await self._send_once(
+                    method, url, rate_limits, rate_limit_policy, **kwargs
+                )
+            except Exception as e:
+                if not (
+                    retry_policy
+                    and retry_policy.should_retry(method, attempt, exception=e)
+                    and self.retry_budget.try_withdraw()
+                ):
+                    raise
+                delay = retry_policy.get_delay(delay)
+                reason = repr(e)
+            else:
+                if not (
+                    retry_policy
+                    and retry_policy.should_retry(method, attempt, response=response)
+                ):
+                    break
+                delay = retry_policy.get_delay(
+                    delay, parse_retry_after(response.headers.get("Retry-After"))
+                )
+                if delay is None or not self.retry_budget.try_withdraw():
+                    break
+                reason = f"HTTP {response.status_code}"
+
+            log.debug(
+                "Retrying %s %s in %.2fs, attempt=%d, reason=%s",
+                method,
+                url,
+                delay,
+                attempt,
+                reason,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
 
+        if cache_key is not None:
+            self.cache.set(cache_key, response, cache_ttl)
+
+        return response
+
+    async def _send_once(
+        self,
+        method: str,
+        url: str,
+        rate_limits: Optional[RateLimit],
+        rate_limit_policy: Optional[RateLimitPolicy],
+        **kwargs: Any,
+    ) -> Response:
         if rate_limits:
-            rate_limits.increment()
+            rate_limit_policy = (
+                rate_limit_policy or rate_limits.policy or self.rate_limit_policy
+            )
+            if rate_limit_policy == RateLimitPolicy.WAIT:
+                # Request is counted when it leaves the queue
+                await self._wait_for_rate_limit(rate_limits)
+            elif not rate_limits.try_increment():
+                # Reserve the request atomically, concurrent requests and
+                # clients sharing the store cannot all pass the check at once
+                raise RateLimitExceededException("Rate limit exceeded", rate_limits)
+
+        response = await self._auth_mgr.session.request(method, url, **kwargs)
+
+        if rate_limits and response.status_code == 429:
+            self._apply_server_rate_limit(rate_limits, response)
 
         return response
 
+    def _on_inflight_done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark exception as retrieved, all callers may have been cancelled
+            task.exception()
+
+    @staticmethod
+    def _apply_server_rate_limit(rate_limits: RateLimit, response: Response) -> None:
+        """
+        Feed the throttling details of a HTTP 429 response back into the rate limit.
+
+        Xbox Live sends a `Retry-After` header and reports the limit that was hit
+        in the response body, e.g.
+        {"maxRequests": 10, "periodInSeconds": 15, "currentRequests": 11, ...}
+        """
+        if not isinstance(rate_limits, CombinedRateLimit):
+            return
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+
+        if isinstance(body, dict):
+            try:
+                max_requests = int(body["maxRequests"])
+                period_in_seconds = int(body["periodInSeconds"])
+            except (KeyError, TypeError, ValueError):
+                pass
+            else:
+                rate_limits.set_server_limit(max_requests, period_in_seconds)
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            rate_limits.set_retry_after(retry_after)
+        log.debug(
+            "Throttled by server, url=%s, retry_after=%s", response.url, retry_after
+        )
+
+    async def _wait_for_rate_limit(self, rate_limits: RateLimit) -> None:
+        """
+        Wait until the rate limit allows another request and count it.
+
+        Waiting requests are released in FIFO order. Checking and counting is
+        atomic, so clients sharing a rate limit store never exceed it together.
+        """
+        lock = self._rate_limit_locks.get(rate_limits)
+        if lock is None:
+            lock = self._rate_limit_locks[rate_limits] = asyncio.Lock()
+
+        async with lock:
+            while not rate_limits.try_increment():
+                reset_after = rate_limits.get_reset_after()
+                delay = (
+                    (reset_after - datetime.now()).total_seconds() if reset_after else 0
+                )
+                await asyncio.sleep(max(delay, 0.01))
+
     async def get(self, url: str, **kwargs: Any) -> Response:
         return await self.request("GET", url, **kwargs)
 
@@ -124,10 +364,44 @@ class XboxLiveClient:
         self,
         auth_mgr: AuthenticationManager,
         language: XboxLiveLanguage = DefaultXboxLiveLanguages.United_States,
+        rate_limit_policy: RateLimitPolicy = RateLimitPolicy.RAISE,
+        rate_limit_store: Optional[RateLimitStore] = None,
+        cache: Optional[ResponseCache] = None,
+        gamertag_index_file: Optional[str] = None,
+        micro_batch_window: Optional[float] = None,
+        coalesce_requests: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        response_mode: ResponseMode = ResponseMode.MODEL,
+        parse_executor: Optional[Executor] = None,
+        parse_offload_threshold: int = 256 * 1024,
     ):
         self._auth_mgr = auth_mgr
-        self.session = Session(auth_mgr)
+        self.session = Session(
+            auth_mgr,
+            rate_limit_policy=rate_limit_policy,
+            cache=cache,
+            coalesce_requests=coalesce_requests,
+            retry_policy=retry_policy,
+            retry_budget=retry_budget,
+        )
         self._language = language
+        # Shared storage for rate limit budgets, requires valid XSTS token
+        self.rate_limit_store = rate_limit_store
+        # Gamertag <-> xuid index, filled from profile, people and search responses.
+        # Written back to `gamertag_index_file` at most once a minute as it grows,
+        # call `self.gamertags.flush()` (or close the pool) to save the rest.
+        self.gamertags = GamertagResolver(self, gamertag_index_file)
+        # Seconds to collect single profile/presence/people lookups into one
+        # batch request, disabled if None
+        self.micro_batch_window = micro_batch_window
+        # Default return type of provider methods, overridable per call via
+        # `response_mode`. Bulk lookups and iterators always return models.
+        self.response_mode = response_mode
+        # Thread or process pool to decode response bodies of at least
+        # `parse_offload_threshold` bytes in, decoded on the event loop if None
+        self.parse_executor = parse_executor
+        self.parse_offload_threshold = parse_offload_threshold
 
         self.cqs = CQSProvider(self)
         self.lists = ListsProvider(self)
@@ -146,6 +420,56 @@ class XboxLiveClient:
         self.catalog = CatalogProvider(self)
         self.smartglass = SmartglassProvider(self)
 
+    async def warmup(self, refresh_tokens: bool = True) -> Dict[str, bool]:
+        """
+        Open pooled connections to the hosts of all providers
+
+        DNS lookups and TLS handshakes are done in parallel upfront, instead
+        of in the first request to each provider. Connections stay in the
+        pool for the keep-alive expiry of the session's transport config.
+        The default `TransportConfig.keepalive_expiry` of 5 seconds drops
+        them 5 seconds after warmup, a warning is logged for expiries below
+        `WARMUP_MIN_KEEPALIVE_EXPIRY`. Raise it when using warmup, e.g.
+        `SignedSession(transport_config=TransportConfig(keepalive_expiry=300))`.
+
+        Args:
+            refresh_tokens: Refresh authentication tokens at the same time
+
+        Returns: Dict of base URL -> True if a connection was established
+        """
+        keepalive_expiry = self._auth_mgr.session.transport_config.keepalive_expiry
+        if keepalive_expiry is not None and (
+            keepalive_expiry < WARMUP_MIN_KEEPALIVE_EXPIRY
+        ):
+            log.warning(
+                "Warmed connections are dropped after %ss idle, "
+                "raise TransportConfig.keepalive_expiry to keep them open",
+                keepalive_expiry,
+            )
+
+        urls = unique(
+            url
+            for provider in vars(self).values()
+            if isinstance(provider, BaseProvider)
+            for url in provider.get_base_urls()
+        )
+
+        async def connect(url: str) -> bool:
+            try:
+                # Any response will do, bypass auth, rate limits and retries
+                await self._auth_mgr.session.head(url)
+            except HTTPError as e:
+                log.debug("Warmup of %s failed: %r", url, e)
+                return False
+            return True
+
+        warmups = asyncio.gather(*[connect(url) for url in urls])
+        if refresh_tokens:
+            _, results = await asyncio.gather(self._auth_mgr.refresh_tokens(), warmups)
+        else:
+            results = await warmups
+        return dict(zip(urls, results))
+
     @property
     def xuid(self) -> str:
         """
@@ -0,0 +1,218 @@
+"""
+Gamertag Resolver
+
+Bidirectional gamertag <-> xuid index, filled from every profile, people and
+user search response. Lookups only go to the network on a miss.
+"""
+import json
+import logging
+import os
+import tempfile
+from time import monotonic
+from typing import Dict, Iterable, List, Optional
+
+from httpx import HTTPStatusError
+
+from xbox.webapi.api.provider.people.models import PeopleResponse
+from xbox.webapi.api.provider.profile.models import ProfileResponse, ProfileSettings
+from xbox.webapi.api.provider.usersearch.models import UserSearchResponse
+from xbox.webapi.common.batching import gather_bounded, unique
+from xbox.webapi.common.decoding import ResponseMode
+
+log = logging.getLogger("xbox.api.gamertags")
+
+
+class GamertagResolver:
+    def __init__(
+        self,
+        client,
+        path: Optional[str] = None,
+        max_concurrency: int = 4,
+        save_interval: float = 60.0,
+    ):
+        """
+        Initialize the resolver, load the index from `path` if it exists
+
+        Changes are written back to `path` at most every `save_interval`
+        seconds, when the index is updated. Call :meth:`flush` before
+        exiting to write the latest changes.
+
+        Args:
+            client (:class:`XboxLiveClient`): Instance of XboxLiveClient
+            path: File to persist the index in, see :meth:`save`
+            max_concurrency: Maximum number of lookups in-flight on a miss
+            save_interval: Minimum seconds between automatic saves
+        """
+        self.client = client
+        self.path = path
+        self.max_concurrency = max_concurrency
+        self.save_interval = save_interval
+
+        # Index changed since it was loaded or saved
+        self._dirty = False
+        self._last_save = monotonic()
+
+        # xuid -> gamertags, classic gamertag first
+        self._gamertags: Dict[str, List[str]] = {}
+        # lowercase gamertag -> xuid, gamertags are case-insensitive
+        self._xuids: Dict[str, str] = {}
+
+        if path and os.path.exists(path):
+            self.load()
+            self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._gamertags)
+
+    def add(self, xuid: str, *gamertags: str) -> None:
+        """
+        Add or update the gamertags of a xuid
+
+        Gamertags previously known for this xuid are dropped, as
+        renamed gamertags can be claimed by other users. Gamertags
+        claimed from another xuid are dropped from that xuid.
+
+        Args:
+            xuid: Xbox User Id
+            gamertags: Classic gamertag first, followed by e.g. the unique modern gamertag
+        """
+        gamertags = [gt for gt in unique(gamertags) if gt]
+        if not gamertags or self._gamertags.get(xuid) == gamertags:
+            return
+
+        for old in self._gamertags.get(xuid, []):
+            if self._xuids.get(old.lower()) == xuid:
+                del self._xuids[old.lower()]
+
+        self._gamertags[xuid] = gamertags
+        for gamertag in gamertags:
+            key = gamertag.lower()
+            owner = self._xuids.get(key)
+            if owner is not None and owner != xuid:
+                # Claimed by this xuid, the previous owner was renamed
+                remaining = [gt for gt in self._gamertags[owner] if gt.lower() != key]
+                if remaining:
+                    self._gamertags[owner] = remaining
+                else:
+                    del self._gamertags[owner]
+            self._xuids[key] = xuid
+
+        self._dirty = True
+        if self.path and monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def observe(self, response) -> None:
+        """
+        Add all (xuid, gamertag) pairs carried by a response
+
+        Args:
+            response: :class:`ProfileResponse`, :class:`PeopleResponse` or
+                :class:`UserSearchResponse`, other types are ignored
+        """
+        if isinstance(response, ProfileResponse):
+            for user in response.profile_users:
+                settings = {s.id: s.value for s in user.settings}
+                self.add(
+                    user.id,
+                    settings.get(ProfileSettings.GAMERTAG.value, ""),
+                    settings.get(ProfileSettings.UNIQUE_MODERN_GAMERTAG.value, ""),
+                )
+        elif isinstance(response, PeopleResponse):
+            for person in response.people:
+                self.add(person.xuid, person.gamertag, person.unique_modern_gamertag)
+        elif isinstance(response, UserSearchResponse):
+            for result in response.results:
+                self.add(result.result.id, result.result.gamertag)
+
+    def get_xuid(self, gamertag: str) -> Optional[str]:
+        """
+        Get xuid from the index, without network access
+        """
+        return self._xuids.get(gamertag.lower())
+
+    def get_gamertag(self, xuid: str) -> Optional[str]:
+        """
+        Get gamertag from the index, without network access
+        """
+        gamertags = self._gamertags.get(str(xuid))
+        return gamertags[0] if gamertags else None
+
+    async def resolve_xuids(self, gamertags: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve gamertags to xuids, looking up misses concurrently
+
+        Args:
+            gamertags: Gamertags to resolve
+
+        Returns: Dict of gamertag -> xuid, unknown gamertags are left out
+        """
+        gamertags = unique(gamertags)
+        misses = [gt for gt in gamertags if self.get_xuid(gt) is None]
+
+        async def lookup(gamertag: str) -> None:
+            try:
+                # Response is added to the index by the provider
+                await self.client.profile.get_profile_by_gamertag(
+                    gamertag, response_mode=ResponseMode.MODEL
+                )
+            except HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                log.debug(f"Gamertag not found: {gamertag}")
+
+        await gather_bounded((lookup(gt) for gt in misses), self.max_concurrency)
+        return {
+            gt: self.get_xuid(gt) for gt in gamertags if self.get_xuid(gt) is not None
+        }
+
+    async def resolve_gamertags(self, xuids: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve xuids to gamertags, looking up misses with batch requests
+
+        Args:
+            xuids: Xbox User Ids to resolve
+
+        Returns: Dict of xuid -> gamertag, unknown xuids are left out
+        """
+        xuids = unique(str(x) for x in xuids)
+        misses = [x for x in xuids if self.get_gamertag(x) is None]
+        if misses:
+            # Responses are added to the index by the provider
+            await self.client.profile.get_profiles_bulk(
+                misses, max_concurrency=self.max_concurrency
+            )
+        return {
+            x: self.get_gamertag(x) for x in xuids if self.get_gamertag(x) is not None
+        }
+
+    def load(self) -> None:
+        """
+        Load the index from `path`
+        """
+        with open(self.path, encoding="utf8") as f:
+            data = json.load(f)
+        for xuid, gamertags in data.items():
+            self.add(xuid, *gamertags)
+
+    def flush(self) -> None:
+        """
+        Write the index to `path`, if it changed since the last save
+        """
+        if self.path and self._dirty:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Write the index to `path`, atomically replacing the previous file
+        """
+        self._dirty = False
+        self._last_save = monotonic()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode="w", encoding="utf8") as f:
+                json.dump(self._gamertags, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,169 @@
+"""
+Xbox Live Client Pool
+
+Serve many accounts over a single connection pool, spreading account
+independent lookups over the accounts with the most rate limit budget left.
+"""
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from xbox.webapi.api.client import XboxLiveClient
+from xbox.webapi.authentication.manager import AuthenticationManager
+from xbox.webapi.authentication.scheduler import RefreshScheduler
+from xbox.webapi.common.signed_session import SignedSession
+
+
+class XboxLiveClientPool:
+    # Providers whose lookups return the same data for any account
+    ROUTED_PROVIDERS = ("profile", "presence", "titlehub")
+
+    def __init__(
+        self,
+        session: Optional[SignedSession] = None,
+        refresh_scheduler: Optional[RefreshScheduler] = None,
+        **client_kwargs,
+    ):
+        """
+        Pool of :class:`XboxLiveClient`, one per account
+
+        All accounts share `session`, i.e. its connection pool, while tokens
+        and rate limit budgets are kept per account.
+
+        Usage::
+
+            pool = XboxLiveClientPool()
+            for tokens in stored_tokens:
+                auth_mgr = pool.create_auth_manager(client_id, client_secret, redirect_uri)
+                auth_mgr.oauth = tokens
+                # Fetch user and XSTS tokens, so all of them are refreshed ahead
+                await auth_mgr.refresh_tokens()
+                pool.add_account(auth_mgr)
+
+            # Sent by the account with the most read budget left
+            profile = await pool.profile.get_profile_by_xuid(xuid)
+
+        Args:
+            session: Session shared by all accounts, a new one if omitted
+            refresh_scheduler: Refreshes the tokens of added accounts in the
+                background, instead of on their next request
+            client_kwargs: Arguments for each :class:`XboxLiveClient`
+        """
+        self.session = session or SignedSession()
+        self.refresh_scheduler = refresh_scheduler
+        self.clients: List[XboxLiveClient] = []
+        self._client_kwargs = client_kwargs
+        # In-flight routed requests per client, by id(client)
+        self._inflight: Dict[int, int] = {}
+        # Where the search for the best client starts, rotates on ties
+        self._offset = 0
+
+        # pool.profile, pool.presence, ...
+        for provider in self.ROUTED_PROVIDERS:
+            setattr(self, provider, _RoutedProvider(self, provider))
+
+    def create_auth_manager(
+        self, client_id: str, client_secret: str, redirect_uri: str, **kwargs
+    ) -> AuthenticationManager:
+        """
+        Create an :class:`AuthenticationManager` on the shared session
+        """
+        return AuthenticationManager(
+            self.session, client_id, client_secret, redirect_uri, **kwargs
+        )
+
+    def add_account(self, auth_mgr: AuthenticationManager) -> XboxLiveClient:
+        """
+        Add an account
+
+        Tokens are refreshed by the refresh scheduler of the pool, if any,
+        otherwise on demand by requests.
+
+        Args:
+            auth_mgr: Authentication manager using the session of the pool,
+                preferably authenticated, i.e. holding user and XSTS tokens
+
+        Returns: Client of the account, e.g. for requests on behalf of it
+        """
+        if auth_mgr.session is not self.session:
+            raise ValueError("Authentication manager must use the session of the pool")
+        client = XboxLiveClient(auth_mgr, **self._client_kwargs)
+        self.clients.append(client)
+        self._inflight[id(client)] = 0
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.add(auth_mgr)
+        return client
+
+    def remove_account(self, client: XboxLiveClient) -> None:
+        self.clients.remove(client)
+        self._inflight.pop(id(client), None)
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.remove(client._auth_mgr)
+
+    def get_client(self, provider: str) -> XboxLiveClient:
+        """
+        Get the client of the account with the most read budget left for `provider`
+
+        In-flight requests count against the budget, as they are not
+        accounted for by the rate limits until they are sent. Ties, e.g. for
+        providers without rate limits, are broken by rotating over the accounts.
+
+        Args:
+            provider: Provider attribute name, e.g. "profile"
+
+        Returns: Client to send the request with
+        """
+        if not self.clients:
+            raise LookupError("No accounts in the pool")
+
+        best: Optional[XboxLiveClient] = None
+        best_score: Tuple[float, int] = (-math.inf, 0)
+        count = len(self.clients)
+        for i in range(count):
+            client = self.clients[(self._offset + i) % count]
+            inflight = self._inflight[id(client)]
+            rate_limit = getattr(getattr(client, provider), "rate_limit_read", None)
+            remaining = math.inf if rate_limit is None else rate_limit.get_remaining()
+            score = (remaining - inflight, -inflight)
+            if best is None or score > best_score:
+                best, best_score = client, score
+
+        self._offset = (self.clients.index(best) + 1) % count
+        return best
+
+    async def _call(self, provider: str, method: str, *args, **kwargs) -> Any:
+        client = self.get_client(provider)
+        self._inflight[id(client)] += 1
+        try:
+            return await getattr(getattr(client, provider), method)(*args, **kwargs)
+        finally:
+            if id(client) in self._inflight:
+                self._inflight[id(client)] -= 1
+
+    async def aclose(self) -> None:
+        for client in self.clients:
+            client.gamertags.flush()
+        await self.session.aclose()
+
+    async def __aenter__(self) -> "XboxLiveClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class _RoutedProvider:
+    def __init__(self, pool: XboxLiveClientPool, provider: str):
+        self._pool = pool
+        self._provider = provider
+
+    def __getattr__(self, method: str) -> Callable:
+        # Requests about the own account have to go through `pool.clients`
+        if method.startswith("_") or method.endswith("_own"):
+            raise AttributeError(
+                f"'{self._provider}' method '{method}' is not routed by the pool"
+            )
+
+        async def call(*args, **kwargs):
+            return await self._pool._call(self._provider, method, *args, **kwargs)
+
+        return call
@@ -3,13 +3,19 @@ Achievements
 
 Get Xbox 360 and Xbox One Achievement data
 """
+from typing import AsyncIterator, Optional
+
 from xbox.webapi.api.provider.achievements.models import (
+    Achievement,
     Achievement360ProgressResponse,
     Achievement360Response,
     AchievementResponse,
     RecentProgressResponse,
+    Title,
 )
 from xbox.webapi.api.provider.ratelimitedprovider import RateLimitedProvider
+from xbox.webapi.common.decoding import ResponseMode
+from xbox.webapi.common.pagination import paginate
 
 
 class AchievementsProvider(RateLimitedProvider):
@@ -41,7 +47,7 @@ class AchievementsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return AchievementResponse(**resp.json())
+        return await self._parse_response(resp, AchievementResponse, **kwargs)
 
     async def get_achievements_xbox360_all(
         self, xuid, title_id, **kwargs
@@ -66,7 +72,7 @@ class AchievementsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return Achievement360Response(**resp.json())
+        return await self._parse_response(resp, Achievement360Response, **kwargs)
 
     async def get_achievements_xbox360_earned(
         self, xuid, title_id, **kwargs
@@ -91,7 +97,7 @@ class AchievementsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return Achievement360Response(**resp.json())
+        return await self._parse_response(resp, Achievement360Response, **kwargs)
 
     async def get_achievements_xbox360_recent_progress_and_info(
         self, xuid, **kwargs
@@ -113,7 +119,9 @@ class AchievementsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return Achievement360ProgressResponse(**resp.json())
+        return await self._parse_response(
+            resp, Achievement360ProgressResponse, **kwargs
+        )
 
     async def get_achievements_xboxone_gameprogress(
         self, xuid, title_id, **kwargs
@@ -138,7 +146,7 @@ class AchievementsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return AchievementResponse(**resp.json())
+        return await self._parse_response(resp, AchievementResponse, **kwargs)
 
     async def get_achievements_xboxone_recent_progress_and_info(
         self, xuid, **kwargs
@@ -160,4 +168,99 @@ class AchievementsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return RecentProgressResponse(**resp.json())
+        return await self._parse_response(resp, RecentProgressResponse, **kwargs)
+
+    def iter_xboxone_achievements(
+        self,
+        xuid,
+        title_id: Optional[str] = None,
+        max_items: Optional[int] = None,
+        page_size: int = 100,
+        prefetch: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[Achievement]:
+        """
+        Iterate Xbox One achievements across all pages, optionally filter for title Id
+
+        Usage::
+
+            achievements = client.achievements.iter_xboxone_achievements(xuid)
+            async for achievement in achievements:
+                ...
+
+        Args:
+            xuid (str): Xbox User Id
+            title_id: Optional Xbox One Title Id filter
+            max_items: Stop after this many items, unlimited if omitted
+            page_size: Item count to load per request
+            prefetch: Request the next page while the current one is consumed
+
+        Returns: Async iterator over :class:`Achievement`
+        """
+        if max_items is not None:
+            page_size = min(page_size, max_items)
+        url = f"{self.ACHIEVEMENTS_URL}/users/xuid({xuid})/achievements"
+
+        # Items are always yielded as models
+        kwargs["response_mode"] = ResponseMode.MODEL
+
+        async def fetch_page(continuation_token):
+            params = {"maxItems": page_size}
+            if title_id:
+                params["titleId"] = title_id
+            resp = await self._get_page(
+                url, params, continuation_token, self.HEADERS_GAME_PROGRESS, **kwargs
+            )
+            parsed = await self._parse_response(resp, AchievementResponse, **kwargs)
+            return parsed.achievements, parsed.paging_info.continuation_token
+
+        return paginate(fetch_page, max_items, prefetch)
+
+    def iter_xboxone_recent_progress_and_info(
+        self,
+        xuid,
+        max_items: Optional[int] = None,
+        page_size: int = 100,
+        prefetch: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[Title]:
+        """
+        Iterate recent achievement progress of all titles across all pages
+
+        Args:
+            xuid (str): Xbox User Id
+            max_items: Stop after this many items, unlimited if omitted
+            page_size: Item count to load per request
+            prefetch: Request the next page while the current one is consumed
+
+        Returns: Async iterator over :class:`Title`
+        """
+        if max_items is not None:
+            page_size = min(page_size, max_items)
+        url = f"{self.ACHIEVEMENTS_URL}/users/xuid({xuid})/history/titles"
+
+        # Items are always yielded as models
+        kwargs["response_mode"] = ResponseMode.MODEL
+
+        async def fetch_page(continuation_token):
+            params = {"maxItems": page_size}
+            resp = await self._get_page(
+                url, params, continuation_token, self.HEADERS_GAME_PROGRESS, **kwargs
+            )
+            parsed = await self._parse_response(resp, RecentProgressResponse, **kwargs)
+            return parsed.titles, parsed.paging_info.continuation_token
+
+        return paginate(fetch_page, max_items, prefetch)
+
+    async def _get_page(self, url, params, continuation_token, headers, **kwargs):
+        if continuation_token:
+            params["continuationToken"] = continuation_token
+        resp = await self.client.session.get(
+            url,
+            params=params,
+            headers=headers,
+            rate_limits=self.rate_limit_read,
+            **kwargs,
+        )
+        resp.raise_for_status()
+        return resp
@@ -3,9 +3,19 @@ BaseProvider
 
 Subclassed by every *real* provider
 """
+import asyncio
+from typing import Any, List, Optional, Type
+
+from httpx import URL, Response
+
+from xbox.webapi.common.decoding import LazyModel, ModelT, ResponseMode, decode
+from xbox.webapi.common.retry import RetryPolicy
 
 
 class BaseProvider:
+    # None -> Use the retry policy of the client session
+    RETRY_POLICY: Optional[RetryPolicy] = None
+
     def __init__(self, client):
         """
         Initialize an the BaseProvider
@@ -14,3 +24,76 @@ class BaseProvider:
             client (:class:`XboxLiveClient`): Instance of XboxLiveClient
         """
         self.client = client
+        self._retry_policy: Optional[RetryPolicy] = None
+        if self.RETRY_POLICY is not None:
+            self.retry_policy = self.RETRY_POLICY
+
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
+        """
+        Retry policy for requests to the hosts of this provider
+
+        Overrides the policy of the client session, `None` to use the session policy.
+        """
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, policy: Optional[RetryPolicy]) -> None:
+        self._retry_policy = policy
+        for host in self._get_hosts():
+            if policy is None:
+                self.client.session.retry_policies.pop(host, None)
+            else:
+                self.client.session.retry_policies[host] = policy
+
+    async def _parse_response(
+        self,
+        response: Response,
+        model: Type[ModelT],
+        response_mode: Optional[ResponseMode] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Decode the JSON body of a response, by default validated into `model`
+
+        Bodies of at least `parse_offload_threshold` bytes are decoded in the
+        `parse_executor` of the client, if set, to keep the event loop responsive.
+
+        Args:
+            response: HTTP response
+            model: Pydantic model class of the response
+            response_mode: Overrides the response mode of the client
+            kwargs: Remaining arguments of the provider method, ignored
+
+        Returns: `model` instance, or bytes, dict or :class:`LazyModel`
+            depending on the response mode
+        """
+        mode = response_mode or self.client.response_mode
+        content = response.content
+        executor = self.client.parse_executor
+        if (
+            executor is None
+            or mode == ResponseMode.RAW
+            or len(content) < self.client.parse_offload_threshold
+        ):
+            return decode(model, content, mode)
+
+        loop = asyncio.get_running_loop()
+        if mode == ResponseMode.LAZY:
+            # Only the JSON decoding is worth offloading, the proxy is cheap
+            data = await loop.run_in_executor(
+                executor, decode, model, content, ResponseMode.DICT
+            )
+            return LazyModel(model, data)
+        return await loop.run_in_executor(executor, decode, model, content, mode)
+
+    def get_base_urls(self) -> List[str]:
+        """
+        Get the service endpoints, declared as class attributes named `*URL*`
+        (e.g. `PROFILE_URL`, `BASE_URL_ACCOUNT`) holding an http(s) URL
+        """
+        urls = [getattr(self, name) for name in dir(type(self)) if "URL" in name]
+        return [url for url in urls if isinstance(url, str) and url.startswith("http")]
+
+    def _get_hosts(self) -> List[str]:
+        return [URL(url).host for url in self.get_base_urls()]
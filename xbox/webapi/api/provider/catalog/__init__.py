@@ -16,6 +16,8 @@ from xbox.webapi.api.provider.catalog.models import (
 class CatalogProvider(BaseProvider):
     CATALOG_URL = "https://displaycatalog.mp.microsoft.com"
     SEPERATOR = ","
+    # Seconds to keep product lookups in the response cache, if enabled
+    CACHE_TTL = 3600
 
     async def get_products(
         self,
@@ -33,11 +35,12 @@ class CatalogProvider(BaseProvider):
             "market": self.client.language.short_id,
         }
         url = f"{self.CATALOG_URL}/v7.0/products"
+        kwargs.setdefault("cache_ttl", self.CACHE_TTL)
         resp = await self.client.session.get(
             url, params=params, include_auth=False, **kwargs
         )
         resp.raise_for_status()
-        return CatalogResponse(**resp.json())
+        return await self._parse_response(resp, CatalogResponse, **kwargs)
 
     async def get_product_from_alternate_id(
         self,
@@ -57,11 +60,12 @@ class CatalogProvider(BaseProvider):
             "value": id,
         }
         url = f"{self.CATALOG_URL}/v7.0/products/lookup"
+        kwargs.setdefault("cache_ttl", self.CACHE_TTL)
         resp = await self.client.session.get(
             url, params=params, include_auth=False, **kwargs
         )
         resp.raise_for_status()
-        return CatalogResponse(**resp.json())
+        return await self._parse_response(resp, CatalogResponse, **kwargs)
 
     async def product_search(
         self,
@@ -84,4 +88,4 @@ class CatalogProvider(BaseProvider):
             url, params=params, include_auth=False, **kwargs
         )
         resp.raise_for_status()
-        return CatalogSearchResponse(**resp.json())
+        return await self._parse_response(resp, CatalogSearchResponse, **kwargs)
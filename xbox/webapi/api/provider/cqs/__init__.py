@@ -43,7 +43,7 @@ class CQSProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_CQS, **kwargs
         )
         resp.raise_for_status()
-        return CqsChannelListResponse(**resp.json())
+        return await self._parse_response(resp, CqsChannelListResponse, **kwargs)
 
     async def get_schedule(
         self,
@@ -81,4 +81,4 @@ class CQSProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_CQS, **kwargs
         )
         resp.raise_for_status()
-        return CqsScheduleResponse(**resp.json())
+        return await self._parse_response(resp, CqsScheduleResponse, **kwargs)
@@ -1,8 +1,12 @@
 """
 Gameclips - Get gameclip info
 """
+from typing import AsyncIterator, Optional
+
 from xbox.webapi.api.provider.baseprovider import BaseProvider
-from xbox.webapi.api.provider.gameclips.models import GameclipsResponse
+from xbox.webapi.api.provider.gameclips.models import GameClip, GameclipsResponse
+from xbox.webapi.common.decoding import ResponseMode
+from xbox.webapi.common.pagination import paginate
 
 
 class GameclipProvider(BaseProvider):
@@ -27,10 +31,15 @@ class GameclipProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_GAMECLIPS_METADATA, **kwargs
         )
         resp.raise_for_status()
-        return GameclipsResponse(**resp.json())
+        return await self._parse_response(resp, GameclipsResponse, **kwargs)
 
     async def get_recent_own_clips(
-        self, title_id: str = None, skip_items: int = 0, max_items: int = 25, **kwargs
+        self,
+        title_id: str = None,
+        skip_items: int = 0,
+        max_items: int = 25,
+        continuation_token: Optional[str] = None,
+        **kwargs,
     ) -> GameclipsResponse:
         """
         Get own recent clips, optionally filter for title Id
@@ -39,6 +48,7 @@ class GameclipProvider(BaseProvider):
             title_id: Title ID to filter
             skip_items: Item count to skip
             max_items: Maximum item count to load
+            continuation_token: Continuation token from a previous page
 
         Returns:
             :class:`GameclipsResponse`: Game clip Response
@@ -49,11 +59,13 @@ class GameclipProvider(BaseProvider):
         url += "/clips"
 
         params = {"skipItems": skip_items, "maxItems": max_items}
+        if continuation_token:
+            params["continuationToken"] = continuation_token
         resp = await self.client.session.get(
             url, params=params, headers=self.HEADERS_GAMECLIPS_METADATA, **kwargs
         )
         resp.raise_for_status()
-        return GameclipsResponse(**resp.json())
+        return await self._parse_response(resp, GameclipsResponse, **kwargs)
 
     async def get_recent_clips_by_xuid(
         self,
@@ -61,6 +73,7 @@ class GameclipProvider(BaseProvider):
         title_id: str = None,
         skip_items: int = 0,
         max_items: int = 25,
+        continuation_token: Optional[str] = None,
         **kwargs,
     ) -> GameclipsResponse:
         """
@@ -71,6 +84,7 @@ class GameclipProvider(BaseProvider):
             title_id: Optional title id filter
             skip_items: Item count to skip
             max_items: Maximum item count to load
+            continuation_token: Continuation token from a previous page
 
         Returns:
             :class:`GameclipsResponse`: Game clip Response
@@ -81,11 +95,13 @@ class GameclipProvider(BaseProvider):
         url += "/clips"
 
         params = {"skipItems": skip_items, "maxItems": max_items}
+        if continuation_token:
+            params["continuationToken"] = continuation_token
         resp = await self.client.session.get(
             url, params=params, headers=self.HEADERS_GAMECLIPS_METADATA, **kwargs
         )
         resp.raise_for_status()
-        return GameclipsResponse(**resp.json())
+        return await self._parse_response(resp, GameclipsResponse, **kwargs)
 
     async def get_saved_community_clips_by_title_id(
         self, title_id: str, **kwargs
@@ -105,10 +121,15 @@ class GameclipProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_GAMECLIPS_METADATA, **kwargs
         )
         resp.raise_for_status()
-        return GameclipsResponse(**resp.json())
+        return await self._parse_response(resp, GameclipsResponse, **kwargs)
 
     async def get_saved_own_clips(
-        self, title_id: str = None, skip_items: int = 0, max_items: int = 25, **kwargs
+        self,
+        title_id: str = None,
+        skip_items: int = 0,
+        max_items: int = 25,
+        continuation_token: Optional[str] = None,
+        **kwargs,
     ) -> GameclipsResponse:
         """
         Get own saved clips, optionally filter for title Id an
@@ -117,6 +138,7 @@ class GameclipProvider(BaseProvider):
             title_id: Optional Title ID to filter
             skip_items: Item count to skip
             max_items: Maximum item count to load
+            continuation_token: Continuation token from a previous page
 
         Returns:
             :class:`GameclipsResponse`: Game clip Response
@@ -127,11 +149,13 @@ class GameclipProvider(BaseProvider):
         url += "/clips/saved"
 
         params = {"skipItems": skip_items, "maxItems": max_items}
+        if continuation_token:
+            params["continuationToken"] = continuation_token
         resp = await self.client.session.get(
             url, params=params, headers=self.HEADERS_GAMECLIPS_METADATA, **kwargs
         )
         resp.raise_for_status()
-        return GameclipsResponse(**resp.json())
+        return await self._parse_response(resp, GameclipsResponse, **kwargs)
 
     async def get_saved_clips_by_xuid(
         self,
@@ -139,6 +163,7 @@ class GameclipProvider(BaseProvider):
         title_id: str = None,
         skip_items: int = 0,
         max_items: int = 25,
+        continuation_token: Optional[str] = None,
         **kwargs,
     ) -> GameclipsResponse:
         """
@@ -149,6 +174,7 @@ class GameclipProvider(BaseProvider):
             title_id: Optional title id filter
             skip_items: Item count to skip
             max_items: Maximum item count to load
+            continuation_token: Continuation token from a previous page
 
         Returns:
             :class:`GameclipsResponse`: Game clip Response
@@ -159,8 +185,114 @@ class GameclipProvider(BaseProvider):
         url += "/clips/saved"
 
         params = {"skipItems": skip_items, "maxItems": max_items}
+        if continuation_token:
+            params["continuationToken"] = continuation_token
         resp = await self.client.session.get(
             url, params=params, headers=self.HEADERS_GAMECLIPS_METADATA, **kwargs
         )
         resp.raise_for_status()
-        return GameclipsResponse(**resp.json())
+        return await self._parse_response(resp, GameclipsResponse, **kwargs)
+
+    def iter_recent_clips(
+        self,
+        xuid: Optional[str] = None,
+        title_id: str = None,
+        max_items: Optional[int] = None,
+        page_size: int = 25,
+        prefetch: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[GameClip]:
+        """
+        Iterate recent clips across all pages, optionally filter for title Id
+
+        Usage::
+
+            async for item in client.gameclips.iter_recent_clips(xuid):
+                ...
+
+        Args:
+            xuid: XUID of user, own clips if omitted
+            title_id: Optional title id filter
+            max_items: Stop after this many items, unlimited if omitted
+            page_size: Item count to load per request
+            prefetch: Request the next page while the current one is consumed
+
+        Returns: Async iterator over :class:`GameClip`
+        """
+        if max_items is not None:
+            page_size = min(page_size, max_items)
+
+        # Items are always yielded as models
+        kwargs["response_mode"] = ResponseMode.MODEL
+
+        async def fetch_page(continuation_token):
+            if xuid is None:
+                resp = await self.get_recent_own_clips(
+                    title_id,
+                    max_items=page_size,
+                    continuation_token=continuation_token,
+                    **kwargs,
+                )
+            else:
+                resp = await self.get_recent_clips_by_xuid(
+                    xuid,
+                    title_id,
+                    max_items=page_size,
+                    continuation_token=continuation_token,
+                    **kwargs,
+                )
+            return resp.game_clips, resp.paging_info.continuation_token
+
+        return paginate(fetch_page, max_items, prefetch)
+
+    def iter_saved_clips(
+        self,
+        xuid: Optional[str] = None,
+        title_id: str = None,
+        max_items: Optional[int] = None,
+        page_size: int = 25,
+        prefetch: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[GameClip]:
+        """
+        Iterate saved clips across all pages, optionally filter for title Id
+
+        Usage::
+
+            async for item in client.gameclips.iter_saved_clips(xuid):
+                ...
+
+        Args:
+            xuid: XUID of user, own clips if omitted
+            title_id: Optional title id filter
+            max_items: Stop after this many items, unlimited if omitted
+            page_size: Item count to load per request
+            prefetch: Request the next page while the current one is consumed
+
+        Returns: Async iterator over :class:`GameClip`
+        """
+        if max_items is not None:
+            page_size = min(page_size, max_items)
+
+        # Items are always yielded as models
+        kwargs["response_mode"] = ResponseMode.MODEL
+
+        async def fetch_page(continuation_token):
+            if xuid is None:
+                resp = await self.get_saved_own_clips(
+                    title_id,
+                    max_items=page_size,
+                    continuation_token=continuation_token,
+                    **kwargs,
+                )
+            else:
+                resp = await self.get_saved_clips_by_xuid(
+                    xuid,
+                    title_id,
+                    max_items=page_size,
+                    continuation_token=continuation_token,
+                    **kwargs,
+                )
+            return resp.game_clips, resp.paging_info.continuation_token
+
+        return paginate(fetch_page, max_items, prefetch)
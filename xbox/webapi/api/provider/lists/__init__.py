@@ -29,7 +29,7 @@ class ListsProvider(BaseProvider):
             url, json=post_body, headers=self.HEADERS_LISTS, **kwargs
         )
         resp.raise_for_status()
-        return ListMetadata(**resp.json())
+        return await self._parse_response(resp, ListMetadata, **kwargs)
 
     async def get_items(
         self, xuid: str, listname: str = "XBLPins", **kwargs
@@ -47,7 +47,7 @@ class ListsProvider(BaseProvider):
         url = self.LISTS_URL + f"/users/xuid({xuid})/lists/PINS/{listname}"
         resp = await self.client.session.get(url, headers=self.HEADERS_LISTS, **kwargs)
         resp.raise_for_status()
-        return ListsResponse(**resp.json())
+        return await self._parse_response(resp, ListsResponse, **kwargs)
 
     async def insert_items(
         self, xuid: str, post_body: dict, listname: str = "XBLPins", **kwargs
@@ -67,4 +67,4 @@ class ListsProvider(BaseProvider):
             url, json=post_body, headers=self.HEADERS_LISTS, **kwargs
         )
         resp.raise_for_status()
-        return ListMetadata(**resp.json())
+        return await self._parse_response(resp, ListMetadata, **kwargs)
@@ -35,7 +35,7 @@ class MediahubProvider(BaseProvider):
             url, json=post_data, headers=self.HEADERS, **kwargs
         )
         resp.raise_for_status()
-        return MediahubGameclips(**resp.json())
+        return await self._parse_response(resp, MediahubGameclips, **kwargs)
 
     async def fetch_own_screenshots(
         self, skip: int = 0, count: int = 500, **kwargs
@@ -60,4 +60,4 @@ class MediahubProvider(BaseProvider):
             url, json=post_data, headers=self.HEADERS, **kwargs
         )
         resp.raise_for_status()
-        return MediahubScreenshots(**resp.json())
+        return await self._parse_response(resp, MediahubScreenshots, **kwargs)
@@ -3,12 +3,17 @@ Message - Read and send messages
 
 TODO: Support group messaging
 """
+from typing import AsyncIterator, Optional
+
 from xbox.webapi.api.provider.baseprovider import BaseProvider
 from xbox.webapi.api.provider.message.models import (
     ConversationResponse,
     InboxResponse,
+    Message,
     SendMessageResponse,
 )
+from xbox.webapi.common.decoding import ResponseMode
+from xbox.webapi.common.pagination import paginate
 
 
 class MessageProvider(BaseProvider):
@@ -29,27 +34,73 @@ class MessageProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_MESSAGE, **kwargs
         )
         resp.raise_for_status()
-        return InboxResponse(**resp.json())
+        return await self._parse_response(resp, InboxResponse, **kwargs)
 
     async def get_conversation(
-        self, xuid: str, max_items: int = 100, **kwargs
+        self,
+        xuid: str,
+        max_items: int = 100,
+        continuation_token: Optional[str] = None,
+        **kwargs,
     ) -> ConversationResponse:
         """
         Get detailed conversation info
 
         Args:
             xuid: Xuid of user having a conversation with
+            max_items: Maximum message count to load
+            continuation_token: Continuation token from a previous page
 
         Returns:
             :class:`ConversationResponse`: Conversation Response
         """
         url = f"{self.MSG_URL}/network/Xbox/users/me/conversations/users/xuid({xuid})"
         params = {"maxItems": max_items}
+        if continuation_token:
+            params["continuationToken"] = continuation_token
         resp = await self.client.session.get(
             url, params=params, headers=self.HEADERS_MESSAGE, **kwargs
         )
         resp.raise_for_status()
-        return ConversationResponse(**resp.json())
+        return await self._parse_response(resp, ConversationResponse, **kwargs)
+
+    def iter_conversation_messages(
+        self,
+        xuid: str,
+        max_items: Optional[int] = None,
+        page_size: int = 100,
+        prefetch: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[Message]:
+        """
+        Iterate messages of a conversation across all pages
+
+        Usage::
+
+            async for message in client.message.iter_conversation_messages(xuid):
+                ...
+
+        Args:
+            xuid: Xuid of user having a conversation with
+            max_items: Stop after this many messages, unlimited if omitted
+            page_size: Message count to load per request
+            prefetch: Request the next page while the current one is consumed
+
+        Returns: Async iterator over :class:`Message`
+        """
+        if max_items is not None:
+            page_size = min(page_size, max_items)
+
+        # Items are always yielded as models
+        kwargs["response_mode"] = ResponseMode.MODEL
+
+        async def fetch_page(continuation_token):
+            resp = await self.get_conversation(
+                xuid, page_size, continuation_token=continuation_token, **kwargs
+            )
+            return resp.messages or [], resp.continuation_token
+
+        return paginate(fetch_page, max_items, prefetch)
 
     async def delete_conversation(
         self, conversation_id: str, horizon: str, **kwargs
@@ -131,4 +182,4 @@ class MessageProvider(BaseProvider):
             url, json=post_data, headers=self.HEADERS_MESSAGE, **kwargs
         )
         resp.raise_for_status()
-        return SendMessageResponse(**resp.json())
+        return await self._parse_response(resp, SendMessageResponse, **kwargs)
@@ -1,14 +1,17 @@
 """
 People - Access friendlist from own profiles and others
 """
-from typing import List
+from typing import Dict, List, Optional
 
 from xbox.webapi.api.provider.ratelimitedprovider import RateLimitedProvider
 from xbox.webapi.api.provider.people.models import (
     PeopleDecoration,
     PeopleResponse,
     PeopleSummaryResponse,
+    Person,
 )
+from xbox.webapi.common.batching import MicroBatcher
+from xbox.webapi.common.decoding import ResponseMode
 
 
 class PeopleProvider(RateLimitedProvider):
@@ -20,6 +23,8 @@ class PeopleProvider(RateLimitedProvider):
         "Accept-Language": "overwrite in __init__",
     }
     SEPERATOR = ","
+    # Maximum number of xuids per micro-batched request
+    BATCH_MAX_XUIDS = 100
 
     # NOTE: Rate Limits are noted for social.xboxlive.com ONLY
     RATE_LIMITS = {"burst": 10, "sustain": 30}
@@ -35,6 +40,12 @@ class PeopleProvider(RateLimitedProvider):
         self._headers = {**self.HEADERS_PEOPLE}
         self._headers.update({"Accept-Language": self.client.language.locale})
 
+        self._batcher: Optional[MicroBatcher[str, Person]] = None
+        if client.micro_batch_window is not None:
+            self._batcher = MicroBatcher(
+                self._load_people, self.BATCH_MAX_XUIDS, client.micro_batch_window
+            )
+
     async def get_friends_own(
         self, decoration_fields: List[PeopleDecoration] = None, **kwargs
     ) -> PeopleResponse:
@@ -56,7 +67,9 @@ class PeopleProvider(RateLimitedProvider):
         url = f"{self.PEOPLE_URL}/users/me/people/social/decoration/{decoration}"
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return PeopleResponse(**resp.json())
+        parsed = await self._parse_response(resp, PeopleResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
 
     async def get_friends_by_xuid(
         self, xuid: str, decoration_fields: List[PeopleDecoration] = None, **kwargs
@@ -79,7 +92,9 @@ class PeopleProvider(RateLimitedProvider):
         url = f"{self.PEOPLE_URL}/users/xuid({xuid})/people/social/decoration/{decoration}"
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return PeopleResponse(**resp.json())
+        parsed = await self._parse_response(resp, PeopleResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
 
     async def get_friends_own_batch(
         self,
@@ -110,7 +125,33 @@ class PeopleProvider(RateLimitedProvider):
             url, json={"xuids": xuids}, headers=self._headers, **kwargs
         )
         resp.raise_for_status()
-        return PeopleResponse(**resp.json())
+        parsed = await self._parse_response(resp, PeopleResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
+
+    async def get_person_own(self, xuid: str, **kwargs) -> Optional[Person]:
+        """
+        Get metadata of a single user, as seen by the own profile
+
+        If micro-batching is enabled on the client, lookups without extra
+        arguments are merged into :meth:`get_friends_own_batch` requests.
+
+        Args:
+            xuid: XUID
+
+        Returns:
+            :class:`Person`: Person, `None` if not returned by the service
+        """
+        if self._batcher is not None and not kwargs:
+            return await self._batcher.load(str(xuid))
+
+        kwargs["response_mode"] = ResponseMode.MODEL
+        resp = await self.get_friends_own_batch([str(xuid)], **kwargs)
+        return next((p for p in resp.people if p.xuid == str(xuid)), None)
+
+    async def _load_people(self, xuids: List[str]) -> Dict[str, Person]:
+        resp = await self.get_friends_own_batch(xuids, response_mode=ResponseMode.MODEL)
+        return {person.xuid: person for person in resp.people}
 
     async def get_friend_recommendations(self, **kwargs) -> PeopleResponse:
         """
@@ -122,7 +163,9 @@ class PeopleProvider(RateLimitedProvider):
         url = f"{self.PEOPLE_URL}/users/me/people/recommendations"
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return PeopleResponse(**resp.json())
+        parsed = await self._parse_response(resp, PeopleResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
 
     async def get_friends_summary_own(self, **kwargs) -> PeopleSummaryResponse:
         """
@@ -136,7 +179,7 @@ class PeopleProvider(RateLimitedProvider):
             url, headers=self.HEADERS_SOCIAL, rate_limits=self.rate_limit_read, **kwargs
         )
         resp.raise_for_status()
-        return PeopleSummaryResponse(**resp.json())
+        return await self._parse_response(resp, PeopleSummaryResponse, **kwargs)
 
     async def get_friends_summary_by_xuid(
         self, xuid: str, **kwargs
@@ -155,7 +198,7 @@ class PeopleProvider(RateLimitedProvider):
             url, headers=self.HEADERS_SOCIAL, rate_limits=self.rate_limit_read, **kwargs
         )
         resp.raise_for_status()
-        return PeopleSummaryResponse(**resp.json())
+        return await self._parse_response(resp, PeopleSummaryResponse, **kwargs)
 
     async def get_friends_summary_by_gamertag(
         self, gamertag: str, **kwargs
@@ -174,4 +217,4 @@ class PeopleProvider(RateLimitedProvider):
             url, headers=self.HEADERS_SOCIAL, rate_limits=self.rate_limit_read, **kwargs
         )
         resp.raise_for_status()
-        return PeopleSummaryResponse(**resp.json())
+        return await self._parse_response(resp, PeopleSummaryResponse, **kwargs)
@@ -1,7 +1,7 @@
 """
 Presence - Get online status of friends
 """
-from typing import List
+from typing import Dict, List, Optional
 
 from xbox.webapi.api.provider.baseprovider import BaseProvider
 from xbox.webapi.api.provider.presence.models import (
@@ -10,11 +10,29 @@ from xbox.webapi.api.provider.presence.models import (
     PresenceLevel,
     PresenceState,
 )
+from xbox.webapi.common.batching import MicroBatcher, chunks, gather_bounded, unique
+from xbox.webapi.common.decoding import ResponseMode
+from xbox.webapi.common.exceptions import XboxException
 
 
 class PresenceProvider(BaseProvider):
     PRESENCE_URL = "https://userpresence.xboxlive.com"
     HEADERS_PRESENCE = {"x-xbl-contract-version": "3", "Accept": "application/json"}
+    # Maximum number of xuids per batch request
+    BATCH_MAX_XUIDS = 1100
+
+    def __init__(self, client):
+        """
+        Initialize Baseclass, set up micro-batching if enabled on the client
+
+        Args:
+            client (:class:`XboxLiveClient`): Instance of XboxLiveClient
+        """
+        super().__init__(client)
+        # One batcher per presence level, created on first use
+        self._batchers: Optional[Dict[str, MicroBatcher[str, PresenceItem]]] = None
+        if client.micro_batch_window is not None:
+            self._batchers = {}
 
     async def get_presence(
         self,
@@ -25,6 +43,9 @@ class PresenceProvider(BaseProvider):
         """
         Get presence for given xuid
 
+        If micro-batching is enabled on the client, lookups without extra
+        arguments are merged into :meth:`get_presence_batch` requests.
+
         Args:
             xuid: XUID
             presence_level: Filter level
@@ -32,13 +53,40 @@ class PresenceProvider(BaseProvider):
         Returns:
             :class:`PresenceItem`: Presence Response
         """
+        if (
+            self._batchers is not None
+            and not kwargs
+            and self.client.response_mode == ResponseMode.MODEL
+        ):
+            item = await self._get_batcher(presence_level).load(str(xuid))
+            if item is not None:
+                return item
+
         url = self.PRESENCE_URL + "/users/xuid(" + xuid + ")?level=" + presence_level
 
         resp = await self.client.session.get(
             url, headers=self.HEADERS_PRESENCE, **kwargs
         )
         resp.raise_for_status()
-        return PresenceItem(**resp.json())
+        return await self._parse_response(resp, PresenceItem, **kwargs)
+
+    def _get_batcher(self, presence_level: PresenceLevel) -> MicroBatcher:
+        batcher = self._batchers.get(presence_level)
+        if batcher is None:
+
+            async def load(xuids: List[str]) -> Dict[str, PresenceItem]:
+                items = await self.get_presence_batch(
+                    xuids,
+                    presence_level=presence_level,
+                    response_mode=ResponseMode.MODEL,
+                )
+                return {item.xuid: item for item in items}
+
+            batcher = MicroBatcher(
+                load, self.BATCH_MAX_XUIDS, self.client.micro_batch_window
+            )
+            self._batchers[presence_level] = batcher
+        return batcher
 
     async def get_presence_batch(
         self,
@@ -57,8 +105,8 @@ class PresenceProvider(BaseProvider):
 
         Returns: List[:class:`PresenceItem`]: List of presence items
         """
-        if len(xuids) > 1100:
-            raise Exception("Xuid list length is > 1100")
+        if len(xuids) > self.BATCH_MAX_XUIDS:
+            raise XboxException(f"Xuid list length is > {self.BATCH_MAX_XUIDS}")
 
         url = self.PRESENCE_URL + "/users/batch"
         post_data = {
@@ -70,9 +118,45 @@ class PresenceProvider(BaseProvider):
             url, json=post_data, headers=self.HEADERS_PRESENCE, **kwargs
         )
         resp.raise_for_status()
-        parsed = PresenceBatchResponse.model_validate(resp.json())
+        parsed = await self._parse_response(resp, PresenceBatchResponse, **kwargs)
+        if isinstance(parsed, (bytes, list)):
+            # RAW and DICT response modes, the body is the list itself
+            return parsed
         return parsed.root
 
+    async def get_presence_bulk(
+        self,
+        xuids: List[str],
+        online_only: bool = False,
+        presence_level: PresenceLevel = PresenceLevel.USER,
+        max_concurrency: int = 4,
+        **kwargs,
+    ) -> Dict[str, PresenceItem]:
+        """
+        Get presence for any number of xuids
+
+        Duplicates are removed and the list is split into batch requests,
+        which are sent concurrently.
+
+        Args:
+            xuids: List of XUIDs
+            online_only: Only get online profiles
+            presence_level: Filter level
+            max_concurrency: Maximum number of batch requests in-flight
+
+        Returns: Dict[str, :class:`PresenceItem`]: Presence items by xuid
+        """
+        kwargs["response_mode"] = ResponseMode.MODEL
+        xuids = unique(str(x) for x in xuids)
+        batches = await gather_bounded(
+            (
+                self.get_presence_batch(chunk, online_only, presence_level, **kwargs)
+                for chunk in chunks(xuids, self.BATCH_MAX_XUIDS)
+            ),
+            max_concurrency,
+        )
+        return {item.xuid: item for batch in batches for item in batch}
+
     async def get_presence_own(
         self, presence_level: PresenceLevel = PresenceLevel.ALL, **kwargs
     ) -> PresenceItem:
@@ -91,7 +175,7 @@ class PresenceProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_PRESENCE, **kwargs
         )
         resp.raise_for_status()
-        return PresenceItem(**resp.json())
+        return await self._parse_response(resp, PresenceItem, **kwargs)
 
     async def set_presence_own(self, presence_state: PresenceState, **kwargs) -> bool:
         """
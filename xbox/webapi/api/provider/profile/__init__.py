@@ -3,31 +3,87 @@ Profile
 
 Get Userprofiles by XUID or Gamertag
 """
-from typing import List
+from typing import Dict, List, Optional
 
+from xbox.webapi.api.provider.profile.models import (
+    ProfileResponse,
+    ProfileSettings,
+    ProfileUser,
+)
 from xbox.webapi.api.provider.ratelimitedprovider import RateLimitedProvider
-from xbox.webapi.api.provider.profile.models import ProfileResponse, ProfileSettings
+from xbox.webapi.common.batching import (
+    MicroBatcher,
+    chunks,
+    gather_bounded,
+    unique,
+)
+from xbox.webapi.common.decoding import ResponseMode
+from xbox.webapi.common.ratelimits.models import RateLimitPolicy
 
 
 class ProfileProvider(RateLimitedProvider):
     PROFILE_URL = "https://profile.xboxlive.com"
     HEADERS_PROFILE = {"x-xbl-contract-version": "3"}
     SEPARATOR = ","
+    # Maximum number of xuids per batch request
+    BATCH_MAX_XUIDS = 100
+    # Seconds to keep single profiles in the response cache, if enabled
+    CACHE_TTL = 600
+
+    # Settings requested for single profiles
+    SINGLE_PROFILE_SETTINGS = [
+        ProfileSettings.GAMERTAG,
+        ProfileSettings.MODERN_GAMERTAG,
+        ProfileSettings.MODERN_GAMERTAG_SUFFIX,
+        ProfileSettings.UNIQUE_MODERN_GAMERTAG,
+        ProfileSettings.REAL_NAME_OVERRIDE,
+        ProfileSettings.BIOGRAPHY,
+        ProfileSettings.LOCATION,
+        ProfileSettings.GAMERSCORE,
+        ProfileSettings.GAME_DISPLAYPIC_RAW,
+        ProfileSettings.TENURE_LEVEL,
+        ProfileSettings.ACCOUNT_TIER,
+        ProfileSettings.XBOX_ONE_REP,
+        ProfileSettings.PREFERRED_COLOR,
+        ProfileSettings.WATERMARKS,
+        ProfileSettings.IS_QUARANTINED,
+    ]
 
     RATE_LIMITS = {"burst": 10, "sustain": 30}
 
-    async def get_profiles(self, xuid_list: List[str], **kwargs) -> ProfileResponse:
+    def __init__(self, client):
+        """
+        Initialize Baseclass, set up micro-batching if enabled on the client
+
+        Args:
+            client (:class:`XboxLiveClient`): Instance of XboxLiveClient
+        """
+        super().__init__(client)
+        self._batcher: Optional[MicroBatcher[str, ProfileUser]] = None
+        if client.micro_batch_window is not None:
+            self._batcher = MicroBatcher(
+                self._load_profiles, self.BATCH_MAX_XUIDS, client.micro_batch_window
+            )
+
+    async def get_profiles(
+        self,
+        xuid_list: List[str],
+        settings: Optional[List[ProfileSettings]] = None,
+        **kwargs,
+    ) -> ProfileResponse:
         """
         Get profile info for list of xuids
 
         Args:
             xuid_list (list): List of xuids
+            settings: Settings to request, defaults to display name, gamerscore etc.
 
         Returns:
             :class:`ProfileResponse`: Profile Response
         """
         post_data = {
-            "settings": [
+            "settings": settings
+            or [
                 ProfileSettings.GAME_DISPLAY_NAME,
                 ProfileSettings.APP_DISPLAY_NAME,
                 ProfileSettings.APP_DISPLAYPIC_RAW,
@@ -54,40 +110,63 @@ class ProfileProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return ProfileResponse(**resp.json())
+        parsed = await self._parse_response(resp, ProfileResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
+
+    async def get_profiles_bulk(
+        self, xuids: List[str], max_concurrency: int = 4, **kwargs
+    ) -> Dict[str, ProfileUser]:
+        """
+        Get profile info for any number of xuids
+
+        Duplicates are removed and the list is split into as few batch requests
+        as possible. Batches wait for rate limit budget instead of raising
+        :class:`RateLimitExceededException`, unless `rate_limit_policy` is passed.
+
+        Args:
+            xuids: List of xuids
+            max_concurrency: Maximum number of batch requests in-flight
+
+        Returns: Dict[str, :class:`ProfileUser`]: Profiles by xuid
+        """
+        kwargs.setdefault("rate_limit_policy", RateLimitPolicy.WAIT)
+        kwargs["response_mode"] = ResponseMode.MODEL
+        xuids = unique(str(x) for x in xuids)
+        responses = await gather_bounded(
+            (
+                self.get_profiles(list(chunk), **kwargs)
+                for chunk in chunks(xuids, self.BATCH_MAX_XUIDS)
+            ),
+            max_concurrency,
+        )
+        return {user.id: user for resp in responses for user in resp.profile_users}
 
     async def get_profile_by_xuid(self, target_xuid: str, **kwargs) -> ProfileResponse:
         """
         Get Userprofile by xuid
 
+        If micro-batching is enabled on the client, lookups without extra
+        arguments are merged into :meth:`get_profiles` requests.
+
         Args:
             target_xuid: XUID to get profile for
 
         Returns:
             :class:`ProfileResponse`: Profile Response
         """
+        if (
+            self._batcher is not None
+            and not kwargs
+            and self.client.response_mode == ResponseMode.MODEL
+        ):
+            user = await self._batcher.load(str(target_xuid))
+            if user is not None:
+                return ProfileResponse(profile_users=[user])
+
         url = self.PROFILE_URL + f"/users/xuid({target_xuid})/profile/settings"
-        params = {
-            "settings": self.SEPARATOR.join(
-                [
-                    ProfileSettings.GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG_SUFFIX,
-                    ProfileSettings.UNIQUE_MODERN_GAMERTAG,
-                    ProfileSettings.REAL_NAME_OVERRIDE,
-                    ProfileSettings.BIOGRAPHY,
-                    ProfileSettings.LOCATION,
-                    ProfileSettings.GAMERSCORE,
-                    ProfileSettings.GAME_DISPLAYPIC_RAW,
-                    ProfileSettings.TENURE_LEVEL,
-                    ProfileSettings.ACCOUNT_TIER,
-                    ProfileSettings.XBOX_ONE_REP,
-                    ProfileSettings.PREFERRED_COLOR,
-                    ProfileSettings.WATERMARKS,
-                    ProfileSettings.IS_QUARANTINED,
-                ]
-            )
-        }
+        params = {"settings": self.SEPARATOR.join(self.SINGLE_PROFILE_SETTINGS)}
+        kwargs.setdefault("cache_ttl", self.CACHE_TTL)
         resp = await self.client.session.get(
             url,
             params=params,
@@ -96,7 +175,17 @@ class ProfileProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return ProfileResponse(**resp.json())
+        parsed = await self._parse_response(resp, ProfileResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
+
+    async def _load_profiles(self, xuids: List[str]) -> Dict[str, ProfileUser]:
+        resp = await self.get_profiles(
+            xuids,
+            settings=self.SINGLE_PROFILE_SETTINGS,
+            response_mode=ResponseMode.MODEL,
+        )
+        return {user.id: user for user in resp.profile_users}
 
     async def get_profile_by_gamertag(self, gamertag: str, **kwargs) -> ProfileResponse:
         """
@@ -109,27 +198,8 @@ class ProfileProvider(RateLimitedProvider):
             :class:`ProfileResponse`: Profile Response
         """
         url = self.PROFILE_URL + f"/users/gt({gamertag})/profile/settings"
-        params = {
-            "settings": self.SEPARATOR.join(
-                [
-                    ProfileSettings.GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG,
-                    ProfileSettings.MODERN_GAMERTAG_SUFFIX,
-                    ProfileSettings.UNIQUE_MODERN_GAMERTAG,
-                    ProfileSettings.REAL_NAME_OVERRIDE,
-                    ProfileSettings.BIOGRAPHY,
-                    ProfileSettings.LOCATION,
-                    ProfileSettings.GAMERSCORE,
-                    ProfileSettings.GAME_DISPLAYPIC_RAW,
-                    ProfileSettings.TENURE_LEVEL,
-                    ProfileSettings.ACCOUNT_TIER,
-                    ProfileSettings.XBOX_ONE_REP,
-                    ProfileSettings.PREFERRED_COLOR,
-                    ProfileSettings.WATERMARKS,
-                    ProfileSettings.IS_QUARANTINED,
-                ]
-            )
-        }
+        params = {"settings": self.SEPARATOR.join(self.SINGLE_PROFILE_SETTINGS)}
+        kwargs.setdefault("cache_ttl", self.CACHE_TTL)
         resp = await self.client.session.get(
             url,
             params=params,
@@ -138,4 +208,6 @@ class ProfileProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return ProfileResponse(**resp.json())
+        parsed = await self._parse_response(resp, ProfileResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
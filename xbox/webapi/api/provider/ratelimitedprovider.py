@@ -4,17 +4,32 @@ RateLimitedProvider
 Subclassed by providers with rate limit support
 """
 
-from typing import Dict, Union
+from typing import Dict, Optional, Tuple, Type, Union
 
 from xbox.webapi.api.provider.baseprovider import BaseProvider
 from xbox.webapi.common.exceptions import XboxException
-from xbox.webapi.common.ratelimits import CombinedRateLimit
-from xbox.webapi.common.ratelimits.models import LimitType, ParsedRateLimit, TimePeriod
+from xbox.webapi.common.ratelimits import (
+    CombinedRateLimit,
+    SingleRateLimit,
+    SlidingWindowRateLimit,
+)
+from xbox.webapi.common.ratelimits.models import (
+    LimitType,
+    ParsedRateLimit,
+    RateLimitPolicy,
+    TimePeriod,
+)
 
 
 class RateLimitedProvider(BaseProvider):
     # dict -> Dict (typing.dict) https://stackoverflow.com/a/63460173
     RATE_LIMITS: Dict[str, Union[int, Dict[str, int]]]
+    # None -> Use the policy of the client session
+    RATE_LIMIT_POLICY: Optional[RateLimitPolicy] = None
+    # Limiter backend, SingleRateLimit for the legacy fixed window
+    RATE_LIMIT_CLASS: Type[
+        Union[SingleRateLimit, SlidingWindowRateLimit]
+    ] = SlidingWindowRateLimit
 
     def __init__(self, client):
         """
@@ -52,13 +67,54 @@ class RateLimitedProvider(BaseProvider):
             sustain_key, TimePeriod.SUSTAIN
         )
 
+        self.__parsed_limits = (burst_rate_limits, sustain_rate_limits)
+        self.__policy = self.RATE_LIMIT_POLICY
+        self.__rate_limits: Optional[Tuple[CombinedRateLimit, CombinedRateLimit]] = None
+        if self.client.rate_limit_store is None:
+            self.__create_rate_limits()
+
+    def __create_rate_limits(self) -> Tuple[CombinedRateLimit, CombinedRateLimit]:
+        # Budgets in a shared store are kept per (xuid, provider, read/write).
+        # Created on first use then, the xuid requires a valid XSTS token.
+        store = self.client.rate_limit_store
+        key = f"{self.client.xuid}:{type(self).__name__}" if store is not None else ""
+
         # Instanciate CombinedRateLimits for read and write respectively
-        self.rate_limit_read = CombinedRateLimit(
-            burst_rate_limits, sustain_rate_limits, type=LimitType.READ
-        )
-        self.rate_limit_write = CombinedRateLimit(
-            burst_rate_limits, sustain_rate_limits, type=LimitType.WRITE
+        self.__rate_limits = tuple(
+            CombinedRateLimit(
+                *self.__parsed_limits,
+                type=limit_type,
+                policy=self.__policy,
+                limit_class=self.RATE_LIMIT_CLASS,
+                store=store,
+                key=key,
+            )
+            for limit_type in (LimitType.READ, LimitType.WRITE)
         )
+        return self.__rate_limits
+
+    @property
+    def rate_limit_read(self) -> CombinedRateLimit:
+        return (self.__rate_limits or self.__create_rate_limits())[0]
+
+    @property
+    def rate_limit_write(self) -> CombinedRateLimit:
+        return (self.__rate_limits or self.__create_rate_limits())[1]
+
+    @property
+    def rate_limit_policy(self) -> Optional[RateLimitPolicy]:
+        """
+        Policy applied when a rate limit of this provider is exceeded
+
+        Returns: Policy, `None` if the policy of the client session is used
+        """
+        return self.__policy
+
+    @rate_limit_policy.setter
+    def rate_limit_policy(self, policy: Optional[RateLimitPolicy]) -> None:
+        self.__policy = policy
+        for rate_limit in self.__rate_limits or ():
+            rate_limit.policy = policy
 
     def __parse_rate_limit_key(
         self, key: Union[int, Dict[str, int]], period: TimePeriod
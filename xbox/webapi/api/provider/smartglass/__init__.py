@@ -52,7 +52,7 @@ class SmartglassProvider(BaseProvider):
             "includeStorageDevices": str(include_storage_devices).lower(),
         }
         resp = await self._fetch_list("devices", params, **kwargs)
-        return SmartglassConsoleList(**resp.json())
+        return await self._parse_response(resp, SmartglassConsoleList, **kwargs)
 
     async def get_installed_apps(
         self, device_id: Optional[str] = None, **kwargs
@@ -69,7 +69,7 @@ class SmartglassProvider(BaseProvider):
         if device_id:
             params["deviceId"] = device_id
         resp = await self._fetch_list("installedApps", params, **kwargs)
-        return InstalledPackagesList(**resp.json())
+        return await self._parse_response(resp, InstalledPackagesList, **kwargs)
 
     async def get_storage_devices(self, device_id: str, **kwargs) -> StorageDevicesList:
         """
@@ -82,7 +82,7 @@ class SmartglassProvider(BaseProvider):
         """
         params = {"deviceId": device_id}
         resp = await self._fetch_list("storageDevices", params, **kwargs)
-        return StorageDevicesList(**resp.json())
+        return await self._parse_response(resp, StorageDevicesList, **kwargs)
 
     async def get_console_status(
         self, device_id: str, **kwargs
@@ -98,7 +98,7 @@ class SmartglassProvider(BaseProvider):
         url = f"{self.SG_URL}/consoles/{device_id}"
         resp = await self.client.session.get(url, headers=self.HEADERS_SG, **kwargs)
         resp.raise_for_status()
-        return SmartglassConsoleStatus(**resp.json())
+        return await self._parse_response(resp, SmartglassConsoleStatus, **kwargs)
 
     async def get_op_status(
         self, device_id: str, op_id: str, **kwargs
@@ -120,7 +120,7 @@ class SmartglassProvider(BaseProvider):
         }
         resp = await self.client.session.get(url, headers=headers, **kwargs)
         resp.raise_for_status()
-        return OperationStatusResponse(**resp.json())
+        return await self._parse_response(resp, OperationStatusResponse, **kwargs)
 
     async def wake_up(self, device_id: str, **kwargs) -> CommandResponse:
         """
@@ -395,4 +395,4 @@ class SmartglassProvider(BaseProvider):
             url, json=body, headers=self.HEADERS_SG, **kwargs
         )
         resp.raise_for_status()
-        return CommandResponse(**resp.json())
+        return await self._parse_response(resp, CommandResponse, **kwargs)
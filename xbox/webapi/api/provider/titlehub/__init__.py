@@ -10,6 +10,8 @@ from xbox.webapi.api.provider.titlehub.models import TitleFields, TitleHubRespon
 class TitlehubProvider(BaseProvider):
     TITLEHUB_URL = "https://titlehub.xboxlive.com"
     SEPARATOR = ","
+    # Seconds to keep title info in the response cache, if enabled
+    CACHE_TTL = 3600
 
     def __init__(self, client):
         """
@@ -59,7 +61,7 @@ class TitlehubProvider(BaseProvider):
             url, params=params, headers=self._headers, **kwargs
         )
         resp.raise_for_status()
-        return TitleHubResponse(**resp.json())
+        return await self._parse_response(resp, TitleHubResponse, **kwargs)
 
     async def _get_title_info(
         self, moniker: str, fields: Optional[List[TitleFields]] = None, **kwargs
@@ -75,9 +77,10 @@ class TitlehubProvider(BaseProvider):
         fields = self.SEPARATOR.join(fields)
 
         url = f"{self.TITLEHUB_URL}/users/xuid({self.client.xuid})/titles/{moniker}/decoration/{fields}"
+        kwargs.setdefault("cache_ttl", self.CACHE_TTL)
         resp = await self.client.session.get(url, headers=self._headers, **kwargs)
         resp.raise_for_status()
-        return TitleHubResponse(**resp.json())
+        return await self._parse_response(resp, TitleHubResponse, **kwargs)
 
     async def get_title_info(
         self, title_id: str, fields: Optional[List[TitleFields]] = None, **kwargs
@@ -137,4 +140,4 @@ class TitlehubProvider(BaseProvider):
             url, json=post_data, headers=self._headers, **kwargs
         )
         resp.raise_for_status()
-        return TitleHubResponse(**resp.json())
+        return await self._parse_response(resp, TitleHubResponse, **kwargs)
@@ -25,4 +25,6 @@ class UserSearchProvider(BaseProvider):
             url, params=params, headers=self.HEADERS_USER_SEARCH, **kwargs
         )
         resp.raise_for_status()
-        return UserSearchResponse(**resp.json())
+        parsed = await self._parse_response(resp, UserSearchResponse, **kwargs)
+        self.client.gamertags.observe(parsed)
+        return parsed
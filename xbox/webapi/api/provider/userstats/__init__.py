@@ -51,7 +51,7 @@ class UserStatsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return UserStatsResponse(**resp.json())
+        return await self._parse_response(resp, UserStatsResponse, **kwargs)
 
     async def get_stats_with_metadata(
         self,
@@ -85,7 +85,7 @@ class UserStatsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return UserStatsResponse(**resp.json())
+        return await self._parse_response(resp, UserStatsResponse, **kwargs)
 
     async def get_stats_batch(
         self,
@@ -123,7 +123,7 @@ class UserStatsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return UserStatsResponse(**resp.json())
+        return await self._parse_response(resp, UserStatsResponse, **kwargs)
 
     async def get_stats_batch_by_scid(
         self,
@@ -162,4 +162,4 @@ class UserStatsProvider(RateLimitedProvider):
             **kwargs,
         )
         resp.raise_for_status()
-        return UserStatsResponse(**resp.json())
+        return await self._parse_response(resp, UserStatsResponse, **kwargs)
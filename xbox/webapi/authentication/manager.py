@@ -3,8 +3,11 @@ Authentication Manager
 
 Authenticate with Windows Live Server and Xbox Live.
 """
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import httpx
 
@@ -13,12 +16,16 @@ from xbox.webapi.authentication.models import (
     XAUResponse,
     XSTSResponse,
 )
+from xbox.webapi.authentication.xsts_cache import XSTSTokenCache
 from xbox.webapi.common.exceptions import AuthenticationException
 from xbox.webapi.common.signed_session import SignedSession
 
 log = logging.getLogger("authentication")
 
 DEFAULT_SCOPES = ["Xboxlive.signin", "Xboxlive.offline_access"]
+DEFAULT_RELYING_PARTY = "http://xboxlive.com"
+# Tokens expiring within this timespan are refreshed in the background
+DEFAULT_REFRESH_AHEAD = timedelta(minutes=5)
 
 
 class AuthenticationManager:
@@ -29,6 +36,8 @@ class AuthenticationManager:
         client_secret: str,
         redirect_uri: str,
         scopes: Optional[List[str]] = None,
+        refresh_ahead: timedelta = DEFAULT_REFRESH_AHEAD,
+        xsts_cache: Optional[XSTSTokenCache] = None,
     ):
         if not isinstance(client_session, (SignedSession, httpx.AsyncClient)):
             raise DeprecationWarning(
@@ -41,6 +50,10 @@ class AuthenticationManager:
         self._client_secret: str = client_secret
         self._redirect_uri: str = redirect_uri
         self._scopes: List[str] = scopes or DEFAULT_SCOPES
+        self._refresh_ahead: timedelta = refresh_ahead
+        self._refresh_task: Optional[asyncio.Task] = None
+        # XSTS tokens by relying party, may be shared by many managers
+        self.xsts_cache: XSTSTokenCache = xsts_cache or XSTSTokenCache(refresh_ahead)
 
         self.oauth: OAuth2TokenResponse = None
         self.user_token: XAUResponse = None
@@ -71,13 +84,65 @@ class AuthenticationManager:
         self.user_token = await self.request_user_token()
         self.xsts_token = await self.request_xsts_token()
 
+    def tokens_valid(self, margin: timedelta = timedelta(0)) -> bool:
+        """Check if all tokens are present and valid for at least `margin`."""
+        return all(
+            token is not None and token.is_valid(margin)
+            for token in (self.oauth, self.user_token, self.xsts_token)
+        )
+
+    def get_expirations(self) -> Dict[str, datetime]:
+        """
+        Get the expiry of the present tokens, by tier: "oauth", "user" and "xsts"
+        """
+        tokens = {"oauth": self.oauth, "user": self.user_token, "xsts": self.xsts_token}
+        return {
+            tier: token.not_after for tier, token in tokens.items() if token is not None
+        }
+
+    async def refresh_tokens_ahead(self, margin: timedelta) -> None:
+        """
+        Refresh all tokens that expire within `margin`.
+
+        Joins an in-flight refresh instead, if there is one.
+        """
+        await asyncio.shield(self._schedule_refresh(margin))
+
     async def refresh_tokens(self) -> None:
-        """Refresh all tokens."""
-        if not (self.oauth and self.oauth.is_valid()):
+        """
+        Refresh all tokens.
+
+        Concurrent callers share a single in-flight refresh.
+        Tokens that are still valid but expire within `refresh_ahead` are
+        refreshed in the background, without blocking the caller.
+        """
+        if self.tokens_valid():
+            if not self.tokens_valid(self._refresh_ahead):
+                self._schedule_refresh(self._refresh_ahead)
+            return
+
+        await asyncio.shield(self._schedule_refresh())
+
+    def _schedule_refresh(self, margin: timedelta = timedelta(0)) -> asyncio.Task:
+        """Start a refresh, unless one is in-flight already."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_tokens(margin))
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    @staticmethod
+    def _on_refresh_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("Token refresh failed: %r", task.exception())
+
+    async def _refresh_tokens(self, margin: timedelta) -> None:
+        if not (self.oauth and self.oauth.is_valid(margin)):
             self.oauth = await self.refresh_oauth_token()
-        if not (self.user_token and self.user_token.is_valid()):
+        if not (self.user_token and self.user_token.is_valid(margin)):
             self.user_token = await self.request_user_token()
-        if not (self.xsts_token and self.xsts_token.is_valid()):
+        if not (self.xsts_token and self.xsts_token.is_valid(margin)):
+            # The cache would return the same token
+            self.xsts_cache.invalidate(DEFAULT_RELYING_PARTY, self.user_token.token)
             self.xsts_token = await self.request_xsts_token()
 
     async def request_oauth_token(self, authorization_code: str) -> OAuth2TokenResponse:
@@ -137,9 +202,21 @@ class AuthenticationManager:
         return XAUResponse(**resp.json())
 
     async def request_xsts_token(
-        self, relying_party: str = "http://xboxlive.com"
+        self, relying_party: str = DEFAULT_RELYING_PARTY
     ) -> XSTSResponse:
-        """Authorize via user token and receive final X token."""
+        """
+        Authorize via user token and receive final X token.
+
+        Tokens are cached per relying party and user token, a cached token
+        is returned while it is valid.
+        """
+        return await self.xsts_cache.get(
+            relying_party,
+            self.user_token.token,
+            partial(self._request_xsts_token, relying_party),
+        )
+
+    async def _request_xsts_token(self, relying_party: str) -> XSTSResponse:
         url = "https://xsts.auth.xboxlive.com/xsts/authorize"
         headers = {"x-xbl-contract-version": "1"}
         data = {
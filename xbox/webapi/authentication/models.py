@@ -17,8 +17,16 @@ class XTokenResponse(PascalCaseModel):
     not_after: datetime
     token: str
 
-    def is_valid(self) -> bool:
-        return self.not_after > utc_now()
+    def is_valid(self, margin: timedelta = timedelta(0)) -> bool:
+        """
+        Check if token is still valid
+
+        Args:
+            margin: Treat token as expired if it expires within this timespan
+
+        Returns: True if token is valid, False otherwise
+        """
+        return (self.not_after - margin) > utc_now()
 
 
 class XADDisplayClaims(BaseModel):
@@ -91,8 +99,28 @@ class OAuth2TokenResponse(BaseModel):
     user_id: str
     issued: datetime = Field(default_factory=utc_now)
 
-    def is_valid(self) -> bool:
-        return (self.issued + timedelta(seconds=self.expires_in)) > utc_now()
+    @property
+    def not_after(self) -> datetime:
+        return self.issued + timedelta(seconds=self.expires_in)
+
+    def is_valid(self, margin: timedelta = timedelta(0)) -> bool:
+        """
+        Check if token is still valid
+
+        Args:
+            margin: Treat token as expired if it expires within this timespan
+
+        Returns: True if token is valid, False otherwise
+        """
+        return (self.not_after - margin) > utc_now()
+
+
+class TokenSet(BaseModel):
+    """Tokens of an :class:`AuthenticationManager`, as persisted by token stores."""
+
+    oauth: Optional[OAuth2TokenResponse] = None
+    user_token: Optional[XAUResponse] = None
+    xsts_token: Optional[XSTSResponse] = None
 
 
 """XAL related models"""
@@ -128,6 +156,13 @@ class SisuAuthorizationResponse(PascalCaseModel):
     use_modern_gamertag: Optional[bool] = None
 
 
+class XalDeviceState(BaseModel):
+    """Device token of a :class:`XALManager`, with the signing key it is bound to."""
+
+    signing_key: str
+    device_token: XADResponse
+
+
 """Signature related models"""
 
 
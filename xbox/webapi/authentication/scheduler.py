@@ -0,0 +1,257 @@
+"""
+Refresh Scheduler
+
+Refresh the tokens of many authentication managers in the background,
+shortly before they expire.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import heapq
+import itertools
+import logging
+import random
+from time import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from pydantic.dataclasses import dataclass
+
+from xbox.webapi.authentication.manager import AuthenticationManager
+
+log = logging.getLogger("authentication")
+
+
+@dataclass
+class RefreshMetrics:
+    # Successful refreshes
+    refreshes: int = 0
+    # Failed refreshes, retried with backoff
+    failures: int = 0
+    # Refreshes that started after the token had expired already
+    expired: int = 0
+    # Seconds refreshes started after they were due, summed up and maximum
+    total_lag: float = 0.0
+    max_lag: float = 0.0
+
+    @property
+    def mean_lag(self) -> float:
+        attempts = self.refreshes + self.failures
+        return self.total_lag / attempts if attempts else 0.0
+
+
+class _Entry:
+    __slots__ = ("due", "auth_mgr", "tier", "expires", "failures")
+
+    def __init__(
+        self,
+        due: float,
+        auth_mgr: AuthenticationManager,
+        tier: str,
+        expires: datetime,
+        failures: int = 0,
+    ):
+        self.due = due
+        self.auth_mgr = auth_mgr
+        self.tier = tier
+        self.expires = expires
+        self.failures = failures
+
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        refresh_ahead: timedelta = timedelta(minutes=5),
+        jitter: timedelta = timedelta(minutes=1),
+        max_concurrency: int = 8,
+        retry_delay: timedelta = timedelta(seconds=10),
+        max_retry_delay: timedelta = timedelta(minutes=5),
+    ):
+        """
+        Refresh OAuth, user and XSTS tokens before they expire
+
+        Expirations of all registered managers are kept in a heap. Each token
+        is refreshed `refresh_ahead` plus a random part of `jitter` before
+        its expiry, so tokens issued at the same time are not all refreshed at
+        once, and requests find valid tokens instead of refreshing inline.
+
+        Usage::
+
+            async with RefreshScheduler() as scheduler:
+                for auth_mgr in auth_mgrs:
+                    scheduler.add(auth_mgr)
+                ...
+
+        Args:
+            refresh_ahead: Refresh tokens at least this long before they expire
+            jitter: Refresh up to this much earlier, picked at random
+            max_concurrency: Maximum number of refreshes in-flight
+            retry_delay: Delay before retrying a failed refresh, doubled per failure
+            max_retry_delay: Maximum delay before retrying a failed refresh
+        """
+        self.refresh_ahead = refresh_ahead
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.metrics = RefreshMetrics()
+
+        # (due timestamp, sequence, entry), one entry per manager and token tier
+        self._heap: List[Tuple[float, int, _Entry]] = []
+        self._seq = itertools.count()
+        # Token tiers with a scheduled refresh, by manager id
+        self._managers: Dict[int, Set[str]] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, auth_mgr: AuthenticationManager) -> None:
+        """
+        Schedule the refreshes of a manager
+
+        Tokens that are not present yet, e.g. user and XSTS tokens of a manager
+        holding only an OAuth token, are scheduled after its next refresh.
+        """
+        self._managers.setdefault(id(auth_mgr), set())
+        self._track(auth_mgr)
+
+    def remove(self, auth_mgr: AuthenticationManager) -> None:
+        """
+        Stop refreshing the tokens of a manager
+        """
+        # Entries are dropped lazily, when they are due
+        self._managers.pop(id(auth_mgr), None)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of scheduled token refreshes
+        """
+        return len(self._heap)
+
+    def get_next_due(self) -> Optional[datetime]:
+        """
+        Get the time of the next refresh, `None` if nothing is scheduled
+        """
+        if not self._heap:
+            return None
+        return datetime.fromtimestamp(self._heap[0][0], timezone.utc)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop scheduling, cancels in-flight refreshes
+        """
+        tasks = [t for t in (self._task, *self._inflight) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def __aenter__(self) -> "RefreshScheduler":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def _get_due(self, expires: datetime) -> float:
+        jitter = random.uniform(0, self.jitter.total_seconds())
+        return (expires - self.refresh_ahead).timestamp() - jitter
+
+    def _track(self, auth_mgr: AuthenticationManager) -> None:
+        """Schedule the refresh of present tokens whose tier is not tracked yet."""
+        tracked = self._managers[id(auth_mgr)]
+        for tier, expires in auth_mgr.get_expirations().items():
+            if tier not in tracked:
+                tracked.add(tier)
+                self._push(_Entry(self._get_due(expires), auth_mgr, tier, expires))
+
+    def _push(self, entry: _Entry) -> None:
+        heapq.heappush(self._heap, (entry.due, next(self._seq), entry))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, entry = heapq.heappop(self._heap)
+            if id(entry.auth_mgr) not in self._managers:
+                continue
+
+            expires = entry.auth_mgr.get_expirations().get(entry.tier)
+            if expires is None:
+                # Token was dropped, tracked again once it is present
+                self._managers[id(entry.auth_mgr)].discard(entry.tier)
+                continue
+            if expires != entry.expires:
+                # Refreshed meanwhile, e.g. together with another tier
+                self._push(
+                    _Entry(self._get_due(expires), entry.auth_mgr, entry.tier, expires)
+                )
+                continue
+
+            await self._semaphore.acquire()
+            task = asyncio.ensure_future(self._refresh(entry))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _refresh(self, entry: _Entry) -> None:
+        try:
+            now = time()
+            lag = max(0.0, now - entry.due)
+            self.metrics.total_lag += lag
+            self.metrics.max_lag = max(self.metrics.max_lag, lag)
+            if entry.expires.timestamp() <= now:
+                self.metrics.expired += 1
+
+            try:
+                # Covers the tokens of other tiers that are due soon as well
+                await entry.auth_mgr.refresh_tokens_ahead(
+                    self.refresh_ahead + self.jitter
+                )
+                expires = entry.auth_mgr.get_expirations().get(entry.tier)
+                if expires is None or expires <= entry.expires:
+                    raise RuntimeError(f"{entry.tier} token was not renewed")
+            except Exception as e:
+                self.metrics.failures += 1
+                delay = min(
+                    self.retry_delay.total_seconds() * 2**entry.failures,
+                    self.max_retry_delay.total_seconds(),
+                )
+                log.warning(
+                    "Refresh of %s token failed, retrying in %.0fs: %r",
+                    entry.tier,
+                    delay,
+                    e,
+                )
+                entry.due = time() + random.uniform(delay / 2, delay)
+                entry.failures += 1
+                self._push(entry)
+                return
+
+            self.metrics.refreshes += 1
+            self._push(
+                _Entry(self._get_due(expires), entry.auth_mgr, entry.tier, expires)
+            )
+            if id(entry.auth_mgr) in self._managers:
+                # Tokens of other tiers may have been issued by this refresh
+                self._track(entry.auth_mgr)
+        finally:
+            self._semaphore.release()
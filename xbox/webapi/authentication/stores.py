@@ -0,0 +1,285 @@
+"""
+Token stores
+
+Persist the OAuth, user and XSTS tokens of :class:`AuthenticationManager`,
+so a new process reuses tokens that are still valid instead of authenticating again.
+
+Both stores are safe to share between processes: a file lock plus atomic
+rename for :class:`FileTokenStore`, SQLite's locking for :class:`SQLiteTokenStore`.
+"""
+from abc import ABCMeta, abstractmethod
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import AsyncIterator, Dict, Iterator, Optional
+import weakref
+
+from xbox.webapi.authentication.manager import AuthenticationManager
+from xbox.webapi.authentication.models import TokenSet
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+# Key of the tokens, for stores holding a single account
+DEFAULT_KEY = "default"
+
+# asyncio locks by store path, per event loop
+_async_locks: Dict[
+    asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]
+] = weakref.WeakKeyDictionary()
+
+
+class TokenStore(metaclass=ABCMeta):
+    """
+    Abstract storage for token sets, one per key (e.g. per account).
+    """
+
+    def __init__(self, path: str):
+        # Lock held by this instance across threads, and its nesting depth
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        # Stores of the same path share one asyncio lock, see alocked()
+        self.__lock_path = os.path.abspath(path)
+
+    @abstractmethod
+    def _acquire(self) -> None:
+        """
+        Acquires the lock shared with other processes, blocking.
+        """
+        pass
+
+    @abstractmethod
+    def _release(self) -> None:
+        pass
+
+    @abstractmethod
+    def _read(self, key: str) -> Optional[TokenSet]:
+        pass
+
+    @abstractmethod
+    def _write(self, key: str, tokens: TokenSet) -> None:
+        pass
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Hold the store's lock, e.g. across load, refresh and save
+
+        Only one process refreshes the tokens then, the others wait and
+        load the refreshed tokens afterwards. Reentrant.
+
+        Waiting blocks the calling thread, use :meth:`alocked` in coroutines.
+        """
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                self._acquire()
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    self._release()
+
+    @asynccontextmanager
+    async def alocked(self) -> AsyncIterator[None]:
+        """
+        Hold the store's lock from a coroutine, see :meth:`locked`
+
+        Coroutines using stores of the same path wait on an asyncio lock,
+        other processes are waited for in a worker thread, so neither blocks
+        the event loop. Not reentrant.
+        """
+        loop = asyncio.get_running_loop()
+        async_lock = _async_locks.setdefault(loop, {}).setdefault(
+            self.__lock_path, asyncio.Lock()
+        )
+        async with async_lock:
+            with self._thread_lock:
+                if self._lock_depth == 0:
+                    await loop.run_in_executor(None, self._acquire)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    if self._lock_depth == 0:
+                        self._release()
+
+    def load(self, key: str = DEFAULT_KEY) -> Optional[TokenSet]:
+        """
+        Returns the stored tokens, `None` if there are none.
+        """
+        with self.locked():
+            return self._read(key)
+
+    def save(self, tokens: TokenSet, key: str = DEFAULT_KEY) -> None:
+        """
+        Stores the tokens, keeping stored ones that expire later.
+
+        A process that refreshed earlier does not overwrite the tokens
+        of one that refreshed later.
+        """
+        with self.locked():
+            stored = self._read(key)
+            if stored is not None:
+                tokens = TokenSet(
+                    **{
+                        tier: self.__newer(getattr(stored, tier), getattr(tokens, tier))
+                        for tier in TokenSet.model_fields
+                    }
+                )
+            self._write(key, tokens)
+
+    def load_into(
+        self, auth_mgr: AuthenticationManager, key: str = DEFAULT_KEY
+    ) -> bool:
+        """
+        Set the stored tokens on `auth_mgr`
+
+        Returns: True if tokens were found, False otherwise
+        """
+        tokens = self.load(key)
+        if tokens is None:
+            return False
+        auth_mgr.oauth = tokens.oauth
+        auth_mgr.user_token = tokens.user_token
+        auth_mgr.xsts_token = tokens.xsts_token
+        return True
+
+    def save_from(
+        self, auth_mgr: AuthenticationManager, key: str = DEFAULT_KEY
+    ) -> None:
+        """
+        Store the tokens of `auth_mgr`
+        """
+        self.save(
+            TokenSet(
+                oauth=auth_mgr.oauth,
+                user_token=auth_mgr.user_token,
+                xsts_token=auth_mgr.xsts_token,
+            ),
+            key,
+        )
+
+    @staticmethod
+    def __newer(stored, token):
+        if token is None or (stored is not None and stored.not_after > token.not_after):
+            return stored
+        return token
+
+
+class FileTokenStore(TokenStore):
+    """
+    A store keeping the tokens in a JSON file, by key.
+
+    Writes go to a temporary file that atomically replaces the previous
+    one, so readers never see a partial file. A lock on `<path>.lock`
+    serializes read-modify-write cycles across processes.
+
+    Files holding only an OAuth token, as written by previous versions
+    of the scripts, are read as the tokens of the default key.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.path = path
+        self.__lock_file = None
+
+    def _acquire(self) -> None:
+        self.__lock_file = open(self.path + ".lock", "a+")
+        if fcntl is not None:
+            fcntl.flock(self.__lock_file.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover
+            msvcrt.locking(self.__lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _release(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.__lock_file.fileno(), fcntl.LOCK_UN)
+        else:  # pragma: no cover
+            msvcrt.locking(self.__lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.__lock_file.close()
+        self.__lock_file = None
+
+    def __read_all(self) -> dict:
+        try:
+            with open(self.path, encoding="utf8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if "access_token" in data:
+            # Legacy file, OAuth token only
+            return {DEFAULT_KEY: {"oauth": data}}
+        return data
+
+    def _read(self, key: str) -> Optional[TokenSet]:
+        data = self.__read_all().get(key)
+        return TokenSet.model_validate(data) if data is not None else None
+
+    def _write(self, key: str, tokens: TokenSet) -> None:
+        data = self.__read_all()
+        data[key] = tokens.model_dump(mode="json", by_alias=True)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode="w", encoding="utf8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    A store keeping the tokens in a SQLite database, one row per key.
+
+    Suited for many accounts and workers: SQLite's file locking
+    serializes the updates of all processes opening the same database file.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Open or create the database
+
+        Args:
+            path: Path of the database file
+            timeout: Seconds to wait for a lock held by another process
+        """
+        super().__init__(path)
+        # Autocommit mode, transactions are started explicitly
+        self.__connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS tokens "
+            "(key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+
+    def _acquire(self) -> None:
+        # Takes the write lock, readers of other processes are not blocked (WAL)
+        self.__connection.execute("BEGIN IMMEDIATE")
+
+    def _release(self) -> None:
+        self.__connection.execute("COMMIT")
+
+    def _read(self, key: str) -> Optional[TokenSet]:
+        row = self.__connection.execute(
+            "SELECT data FROM tokens WHERE key = ?", (key,)
+        ).fetchone()
+        return TokenSet.model_validate_json(row[0]) if row is not None else None
+
+    def _write(self, key: str, tokens: TokenSet) -> None:
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO tokens (key, data) VALUES (?, ?)",
+            (key, tokens.model_dump_json(by_alias=True)),
+        )
@@ -4,10 +4,13 @@ Xbox Authentication Library
 Authenticate with Windows Live Server and Xbox Live (used by mobile Xbox Apps)
 """
 import base64
+from datetime import timedelta
+from functools import partial
 import hashlib
 import logging
 import os
-from typing import Callable, Tuple
+import time
+from typing import Callable, Optional, Tuple
 from urllib import parse
 import uuid
 
@@ -22,8 +25,11 @@ from xbox.webapi.authentication.models import (
     XADResponse,
     XalAppParameters,
     XalClientParameters,
+    XalDeviceState,
     XSTSResponse,
 )
+from xbox.webapi.authentication.xsts_cache import XSTSTokenCache
+from xbox.webapi.common.request_signer import RequestSigner
 from xbox.webapi.common.signed_session import SignedSession
 
 log = logging.getLogger("xal.authentication")
@@ -74,17 +80,39 @@ CLIENT_PARAMS_ANDROID = XalClientParameters(
 
 
 class XALManager:
+    # Title endpoints are the same for all managers, cached for this long
+    TITLE_ENDPOINTS_TTL = timedelta(hours=1)
+    # Cached (title endpoints, expiry timestamp)
+    _title_endpoints: Optional[Tuple[TitleEndpointsResponse, float]] = None
+
     def __init__(
         self,
         session: SignedSession,
         device_id: uuid.UUID,
         app_params: XalAppParameters,
         client_params: XalClientParameters,
+        device_token: Optional[XADResponse] = None,
+        xsts_cache: Optional[XSTSTokenCache] = None,
     ):
+        """
+        Initialize the XAL manager
+
+        Args:
+            session: Signed session, its signing key is bound to the device token
+            device_id: Device ID
+            app_params: App parameters
+            client_params: Client parameters
+            device_token: Device token obtained before with the signing key of
+                `session`, reused until it expires
+            xsts_cache: Cache for tokens of :meth:`xsts_authorization`,
+                may be shared with other managers
+        """
         self.session = session
         self.device_id = device_id
         self.app_params = app_params
         self.client_params = client_params
+        self.device_token = device_token
+        self.xsts_cache = xsts_cache or XSTSTokenCache()
         self.cv = CorrelationVector()
 
     @staticmethod
@@ -117,14 +145,64 @@ class XALManager:
         # Base64 urlsafe encoding WITHOUT stripping trailing '='
         return base64.b64encode(state).decode()
 
-    @staticmethod
-    async def get_title_endpoints(session: httpx.AsyncClient) -> TitleEndpointsResponse:
+    @classmethod
+    async def get_title_endpoints(
+        cls, session: httpx.AsyncClient, ttl: Optional[timedelta] = None
+    ) -> TitleEndpointsResponse:
+        """
+        Get the title endpoints, cached for `ttl`
+
+        Args:
+            session: HTTP client
+            ttl: Overrides `TITLE_ENDPOINTS_TTL`, zero to fetch them anew
+
+        Returns: Title endpoints
+        """
+        ttl = cls.TITLE_ENDPOINTS_TTL if ttl is None else ttl
+        cached = XALManager._title_endpoints
+        if ttl and cached is not None and cached[1] > time.time():
+            return cached[0]
+
         url = "https://title.mgt.xboxlive.com/titles/default/endpoints"
         headers = {"x-xbl-contract-version": "1"}
         params = {"type": 1}
         resp = await session.get(url, headers=headers, params=params)
         resp.raise_for_status()
-        return TitleEndpointsResponse(**resp.json())
+        endpoints = TitleEndpointsResponse(**resp.json())
+        XALManager._title_endpoints = (endpoints, time.time() + ttl.total_seconds())
+        return endpoints
+
+    async def get_device_token(
+        self, margin: timedelta = timedelta(minutes=5)
+    ) -> XADResponse:
+        """
+        Get the device token, requesting a new one if it expires within `margin`
+        """
+        if not (self.device_token and self.device_token.is_valid(margin)):
+            self.device_token = await self.request_device_token()
+        return self.device_token
+
+    def export_device_state(self) -> Optional[XalDeviceState]:
+        """
+        Get the device token with its signing key, to persist them
+
+        Returns: Device state, `None` if no device token was obtained yet
+        """
+        if self.device_token is None:
+            return None
+        return XalDeviceState(
+            signing_key=self.session.request_signer.export_signing_key(),
+            device_token=self.device_token,
+        )
+
+    def import_device_state(self, state: XalDeviceState) -> None:
+        """
+        Reuse a persisted device token, switches the session to its signing key
+        """
+        self.session.request_signer = RequestSigner.from_pem(
+            state.signing_key, backend=self.session.request_signer.backend.name
+        )
+        self.device_token = state.device_token
 
     async def request_device_token(self) -> XADResponse:
         # Proof of possession: https://tools.ietf.org/html/rfc7800
@@ -267,7 +345,29 @@ class XALManager:
     ) -> XSTSResponse:
         """
         Request additional XSTS tokens for specific relying parties
+
+        Tokens are cached per relying party and user token, a cached token
+        is returned while it is valid.
         """
+        return await self.xsts_cache.get(
+            relying_party,
+            user_token_jwt,
+            partial(
+                self._xsts_authorization,
+                device_token_jwt,
+                title_token_jwt,
+                user_token_jwt,
+                relying_party,
+            ),
+        )
+
+    async def _xsts_authorization(
+        self,
+        device_token_jwt: str,
+        title_token_jwt: str,
+        user_token_jwt: str,
+        relying_party: str,
+    ) -> XSTSResponse:
         url = "https://xsts.auth.xboxlive.com/xsts/authorize"
         headers = {"x-xbl-contract-version": "1", "MS-CV": self.cv.increment()}
         post_body = {
@@ -301,8 +401,8 @@ class XALManager:
             Sisu authorization response with all tokens
         """
 
-        # Fetch device token
-        device_token_resp = await self.request_device_token()
+        # Fetch device token, unless a valid one is cached
+        device_token_resp = await self.get_device_token()
 
         # Generate states for OAUTH
         code_verifier = self._generate_code_verifier()
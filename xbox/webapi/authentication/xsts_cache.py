@@ -0,0 +1,100 @@
+"""
+XSTS Token Cache
+
+Reuse XSTS tokens per relying party and user, shared by
+:class:`AuthenticationManager` and :class:`XALManager`.
+"""
+import asyncio
+from datetime import timedelta
+import logging
+from typing import Awaitable, Callable, Dict, Tuple
+
+from xbox.webapi.authentication.models import XSTSResponse
+
+log = logging.getLogger("authentication")
+
+# (relying party, user token)
+CacheKey = Tuple[str, str]
+
+
+class XSTSTokenCache:
+    def __init__(self, refresh_ahead: timedelta = timedelta(minutes=5)):
+        """
+        Cache of XSTS tokens, keyed by relying party and user token
+
+        Valid tokens are returned as they are. Tokens expiring within
+        `refresh_ahead` are returned too, while a new one is issued in the
+        background. Concurrent requests for the same key share one issuance.
+
+        Args:
+            refresh_ahead: Issue a new token this long before the cached one expires
+        """
+        self.refresh_ahead = refresh_ahead
+        self._tokens: Dict[CacheKey, XSTSResponse] = {}
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+
+    async def get(
+        self,
+        relying_party: str,
+        user_token: str,
+        issue: Callable[[], Awaitable[XSTSResponse]],
+    ) -> XSTSResponse:
+        """
+        Get a valid token, calling `issue` if none is cached
+
+        Args:
+            relying_party: Relying party of the token
+            user_token: User token JWT the token is issued for
+            issue: Coroutine function requesting a new token
+
+        Returns: XSTS token
+        """
+        key = (relying_party, user_token)
+        token = self._tokens.get(key)
+        if token is not None and token.is_valid():
+            if not token.is_valid(self.refresh_ahead):
+                self._schedule_issue(key, issue)
+            return token
+
+        return await asyncio.shield(self._schedule_issue(key, issue))
+
+    def invalidate(self, relying_party: str, user_token: str) -> None:
+        """
+        Drop a cached token, the next :meth:`get` issues a new one
+        """
+        self._tokens.pop((relying_party, user_token), None)
+
+    def clear(self) -> None:
+        self._tokens.clear()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def _schedule_issue(
+        self, key: CacheKey, issue: Callable[[], Awaitable[XSTSResponse]]
+    ) -> asyncio.Task:
+        """Start issuing a token, unless one is in-flight already."""
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = self._inflight[key] = asyncio.ensure_future(self._issue(key, issue))
+            task.add_done_callback(self._on_issue_done)
+        return task
+
+    async def _issue(
+        self, key: CacheKey, issue: Callable[[], Awaitable[XSTSResponse]]
+    ) -> XSTSResponse:
+        try:
+            token = await issue()
+        finally:
+            self._inflight.pop(key, None)
+
+        # Drop expired tokens, e.g. of replaced user tokens
+        for expired in [k for k, t in self._tokens.items() if not t.is_valid()]:
+            del self._tokens[expired]
+        self._tokens[key] = token
+        return token
+
+    @staticmethod
+    def _on_issue_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("XSTS token issuance failed: %r", task.exception())
@@ -0,0 +1,150 @@
+"""
+Batching helpers
+
+Split large inputs into server-sized chunks and fan requests out concurrently,
+or merge single lookups into batch requests.
+"""
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def unique(items: Iterable[T]) -> List[T]:
+    """
+    Remove duplicates, keeping the order of first occurrence
+
+    Args:
+        items: Input items
+
+    Returns: List of unique items
+    """
+    return list(dict.fromkeys(items))
+
+
+def chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """
+    Split a sequence into chunks of at most `size` items
+
+    Args:
+        items: Input sequence
+        size: Maximum chunk size
+
+    Returns: Iterator over the chunks
+    """
+    if size < 1:
+        raise ValueError("Chunk size must be >= 1")
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+async def gather_bounded(aws: Iterable[Awaitable[T]], max_concurrency: int) -> List[T]:
+    """
+    Await all awaitables, running at most `max_concurrency` at the same time
+
+    Args:
+        aws: Awaitables, e.g. coroutines of provider methods
+        max_concurrency: Maximum number of awaitables running concurrently
+
+    Returns: Results, in the order of the input
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*[run(aw) for aw in aws])
+
+
+class MicroBatcher(Generic[K, V]):
+    def __init__(
+        self,
+        load_batch: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int,
+        window: float = 0.01,
+    ):
+        """
+        Collect single lookups issued within a short window into batch requests
+
+        Concurrent lookups of the same key share one result. A batch is
+        sent when the window elapses or `max_batch_size` keys are pending.
+
+        Args:
+            load_batch: Coroutine function returning results by key for a list of keys
+            max_batch_size: Maximum number of keys per batch
+            window: Seconds to wait for more lookups after the first one
+        """
+        self.load_batch = load_batch
+        self.max_batch_size = max_batch_size
+        self.window = window
+
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        """
+        Look up a single key as part of the next batch
+
+        Args:
+            key: Key to look up
+
+        Returns: Result for `key`, `None` if the batch did not return it
+        """
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+
+        # A cancelled caller must not cancel the lookup for the others
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._dispatch(batch))
+            # Keep a reference until done, the event loop only holds weak ones
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: Dict[K, asyncio.Future]) -> None:
+        try:
+            results = await self.load_batch(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark as retrieved, all callers may have been cancelled
+                    future.exception()
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
@@ -0,0 +1,281 @@
+"""
+Response Cache
+
+TTL cache for responses of idempotent requests, used by :class:`Session`.
+"""
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+# Headers that differ for every request, excluded from the cache key
+VOLATILE_REQUEST_HEADERS = {"authorization", "ms-cv", "signature"}
+# Headers that no longer apply to the decoded, cached content
+STRIPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CacheEntry(NamedTuple):
+    status_code: int
+    headers: List[Tuple[str, str]]
+    content: bytes
+    # Wall-clock expiry, so entries stay valid across processes
+    expires: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(len(k) + len(v) for k, v in self.headers)
+
+    def is_valid(self) -> bool:
+        return self.expires > time.time()
+
+
+class CacheBackend(metaclass=ABCMeta):
+    """
+    Abstract storage for cache entries
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns a valid entry and marks it as recently used, `None` otherwise.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Stores an entry, evicting least recently used entries when over capacity.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    LRU cache in memory, bounded by number of entries and total size in bytes.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_valid():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = entry
+        self._size += entry.size
+
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    LRU cache on disk, bounded by number of entries.
+
+    The cache persists across restarts and can be shared by processes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, timeout: float = 5.0):
+        """
+        Open or create the database
+
+        Args:
+            path: Path of the database file
+            max_entries: Maximum number of cached responses
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.max_entries = max_entries
+
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, status_code INTEGER NOT NULL, "
+            "headers TEXT NOT NULL, content BLOB NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_accessed "
+            "ON response_cache (accessed)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._connection.execute(
+            "SELECT status_code, headers, content, expires FROM response_cache "
+            "WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        status_code, headers, content, expires = row
+        entry = CacheEntry(
+            status_code, [tuple(h) for h in json.loads(headers)], content, expires
+        )
+        if not entry.is_valid():
+            self._connection.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            return None
+
+        self._connection.execute(
+            "UPDATE response_cache SET accessed = ? WHERE key = ?", (time.time(), key)
+        )
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        now = time.time()
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(key, status_code, headers, content, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    entry.expires,
+                    now,
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM response_cache WHERE expires <= ?", (now,)
+            )
+            self._connection.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM response_cache")
+
+    def close(self) -> None:
+        """
+        Close the database connection
+        """
+        self._connection.close()
+
+
+class ResponseCache:
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """
+        Cache for successful responses of GET requests
+
+        Only requests that pass a `cache_ttl` (seconds) are cached. Providers
+        set a default TTL for endpoints whose data rarely changes, e.g.
+        profiles, title info and catalog products.
+
+        Args:
+            backend: Storage, defaults to :class:`InMemoryCacheBackend`
+        """
+        self.backend = backend or InMemoryCacheBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        scope: str = "",
+    ) -> str:
+        """
+        Build a key identifying a request by method, URL, query and relevant headers
+
+        Responses differ per requesting user, e.g. privacy filtered profiles,
+        while the Authorization header is not part of the key. Pass the xuid
+        of authenticated requests as `scope`, so accounts sharing a cache do
+        not get each other's responses.
+        """
+        relevant_headers = sorted(
+            (k.lower(), str(v))
+            for k, v in (headers or {}).items()
+            if k.lower() not in VOLATILE_REQUEST_HEADERS
+        )
+        raw = json.dumps(
+            [
+                scope,
+                method.upper(),
+                str(httpx.URL(url, params=params)),
+                relevant_headers,
+            ]
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str, request: httpx.Request) -> Optional[httpx.Response]:
+        """
+        Get a cached response, counts as hit or miss
+        """
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            content=entry.content,
+            request=request,
+        )
+
+    def set(self, key: str, response: httpx.Response, ttl: float) -> None:
+        """
+        Cache a successful response for `ttl` seconds
+        """
+        if not response.is_success:
+            return
+
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in STRIPPED_RESPONSE_HEADERS
+        ]
+        entry = CacheEntry(
+            response.status_code, headers, response.content, time.time() + ttl
+        )
+        self.backend.set(key, entry)
+
+    def clear(self) -> None:
+        self.backend.clear()
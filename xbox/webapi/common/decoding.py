@@ -0,0 +1,217 @@
+"""
+Decoding
+
+Decode JSON responses into models, with an optional fast JSON backend.
+"""
+from enum import Enum
+import json
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, RootModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ResponseMode(Enum):
+    """
+    What provider methods return, per call (`response_mode=...`) or per client
+    """
+
+    # Validated pydantic model
+    MODEL = 0
+    # Response body as bytes, e.g. to forward it unchanged
+    RAW = 1
+    # Decoded JSON, without validation
+    DICT = 2
+    # :class:`LazyModel`, validating fields on first access
+    LAZY = 3
+
+
+# JSON backend, opt in to orjson via `set_json_backend("orjson")`
+# - pydantic: Validate straight from bytes via `model_validate_json`, the
+#   fastest path for most models
+# - orjson: Decode with orjson, validate the resulting dict. Requires the
+#   orjson package (`pip install xbox-webapi[orjson]`), may pay off for
+#   DICT/LAZY response modes
+JSON_BACKEND = "pydantic"
+
+
+def set_json_backend(backend: Optional[str] = None) -> None:
+    """
+    Select the JSON backend
+
+    Args:
+        backend: "pydantic" or "orjson", "pydantic" if `None`
+    """
+    global JSON_BACKEND
+    if backend is None:
+        backend = "pydantic"
+    elif backend == "orjson" and orjson is None:
+        raise ImportError("JSON backend 'orjson' requires the orjson package")
+    elif backend not in ("orjson", "pydantic"):
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    JSON_BACKEND = backend
+
+
+def loads(content: bytes) -> Any:
+    """
+    Decode JSON to Python objects
+    """
+    if JSON_BACKEND == "orjson":
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def parse_model(model: Type[ModelT], content: bytes) -> ModelT:
+    """
+    Decode and validate JSON into `model`
+
+    Avoids the intermediate keyword argument expansion of `Model(**resp.json())`.
+
+    Args:
+        model: Pydantic model class
+        content: Raw JSON
+
+    Returns: Model instance
+    """
+    if JSON_BACKEND == "orjson":
+        return model.model_validate(orjson.loads(content))
+    return model.model_validate_json(content)
+
+
+def decode(model: Type[ModelT], content: bytes, mode: ResponseMode) -> Any:
+    """
+    Decode a response body according to `mode`
+
+    Args:
+        model: Pydantic model class of the response
+        content: Raw JSON
+        mode: Response mode
+
+    Returns: Model instance, bytes, decoded JSON or :class:`LazyModel`
+    """
+    if mode == ResponseMode.RAW:
+        return content
+    if mode == ResponseMode.DICT:
+        return loads(content)
+    if mode == ResponseMode.LAZY:
+        return LazyModel(model, loads(content))
+    return parse_model(model, content)
+
+
+# (model, field name) -> TypeAdapter of the field, shared by all LazyModel instances
+_field_adapters: Dict[Tuple[type, str], TypeAdapter] = {}
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+class LazyModel:
+    """
+    Read-only proxy over decoded JSON, validating a field on first access
+
+    Nested models, and lists of nested models, are wrapped in
+    :class:`LazyModel` again. Fields that are never accessed are never
+    validated. Call :meth:`validate` to get the full model.
+    """
+
+    __slots__ = ("_model", "_data", "_values")
+
+    def __init__(self, model: Type[BaseModel], data: Any):
+        self._model = model
+        self._data = data
+        self._values: Dict[str, Any] = {}
+
+    @property
+    def raw(self) -> Any:
+        """
+        Decoded JSON, unvalidated
+        """
+        return self._data
+
+    def validate(self) -> BaseModel:
+        """
+        Validate all fields, returns the model instance
+        """
+        return self._model.model_validate(self._data)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+
+        field = self._model.model_fields.get(name)
+        if field is None:
+            raise AttributeError(
+                f"'{self._model.__name__}' object has no attribute '{name}'"
+            )
+
+        key = field.alias or name
+        if issubclass(self._model, RootModel):
+            raw = self._data
+        elif not isinstance(self._data, dict):
+            # Raises the same ValidationError as the eager model
+            return getattr(self.validate(), name)
+        elif key in self._data:
+            raw = self._data[key]
+        elif name in self._data:
+            raw = self._data[name]
+        elif field.is_required():
+            # Raises the same ValidationError as the eager model, succeeds
+            # for keys given in another spelling, e.g. via validation aliases
+            self._values[name] = getattr(self.validate(), name)
+            return self._values[name]
+        else:
+            self._values[name] = field.get_default(call_default_factory=True)
+            return self._values[name]
+
+        self._values[name] = self._wrap(name, field.annotation, raw)
+        return self._values[name]
+
+    def _wrap(self, name: str, annotation: Any, raw: Any) -> Any:
+        annotation = _unwrap_optional(annotation)
+        if raw is None:
+            return None
+        if _is_model(annotation) and isinstance(raw, dict):
+            return LazyModel(annotation, raw)
+        if get_origin(annotation) in (list, List) and isinstance(raw, list):
+            (item_annotation,) = get_args(annotation) or (Any,)
+            item_annotation = _unwrap_optional(item_annotation)
+            if _is_model(item_annotation):
+                return [
+                    LazyModel(item_annotation, item) if isinstance(item, dict) else item
+                    for item in raw
+                ]
+        adapter = _field_adapters.get((self._model, name))
+        if adapter is None:
+            adapter = _field_adapters[(self._model, name)] = TypeAdapter(annotation)
+        return adapter.validate_python(raw)
+
+    def __repr__(self) -> str:
+        return f"LazyModel({self._model.__name__})"
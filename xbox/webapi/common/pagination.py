@@ -0,0 +1,61 @@
+"""
+Pagination
+
+Helpers for endpoints that return results in pages, chained by a continuation token.
+"""
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Fetches the page following `continuation_token` (`None` for the first page),
+# returns its items and the token of the next page, `None` on the last page
+PageFetcher = Callable[[Optional[str]], Awaitable[Tuple[List[T], Optional[str]]]]
+
+
+async def paginate(
+    fetch_page: PageFetcher, max_items: Optional[int] = None, prefetch: bool = True
+) -> AsyncIterator[T]:
+    """
+    Stream items of all pages lazily
+
+    While the items of a page are consumed, the next page is already
+    requested in the background if `prefetch` is enabled. Leaving the
+    iteration early cancels a pending prefetch.
+
+    Args:
+        fetch_page: Coroutine function returning (items, next continuation token)
+        max_items: Stop after this many items, unlimited if `None`
+        prefetch: Request the next page while the current one is consumed
+
+    Returns: Async iterator over the items
+    """
+    count = 0
+    if max_items is not None and max_items <= 0:
+        return
+
+    pending: Optional[asyncio.Future] = asyncio.ensure_future(fetch_page(None))
+    try:
+        while pending is not None:
+            items, token = await pending
+            pending = None
+            # Stop on an empty page too, in case the service keeps returning a token
+            remaining = None if max_items is None else max_items - count
+            if token and items and (remaining is None or len(items) < remaining):
+                next_page = fetch_page(token)
+                pending = asyncio.ensure_future(next_page) if prefetch else next_page
+
+            for item in items:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+    finally:
+        if isinstance(pending, asyncio.Future):
+            if pending.done() and not pending.cancelled():
+                # Prefetch failed, but its page is no longer needed
+                pending.exception()
+            pending.cancel()
+        elif pending is not None:
+            # Never awaited coroutine
+            pending.close()
@@ -1,13 +1,17 @@
 from abc import ABCMeta, abstractmethod
-from datetime import datetime, timedelta
-from typing import List, Union
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic
+from typing import List, Optional, Tuple, Type, Union
 
 from xbox.webapi.common.ratelimits.models import (
     IncrementResult,
     LimitType,
     ParsedRateLimit,
+    RateLimitPolicy,
     TimePeriod,
 )
+from xbox.webapi.common.ratelimits.stores import InMemoryRateLimitStore, RateLimitStore
 
 
 class RateLimit(metaclass=ABCMeta):
@@ -21,8 +25,13 @@ class RateLimit(metaclass=ABCMeta):
     a reset_after variable is set detailing when the rate limit(s) reset.
 
     Upon each function invokation, the reset_after variable is checked and the timer is automatically reset if the reset_after time has passed.
+
+    The `policy` attribute decides how a request hitting an exceeded rate limit is handled.
+    If it is `None`, the policy of the session is used.
     """
 
+    policy: Optional[RateLimitPolicy] = None
+
     @abstractmethod
     def get_counter(self) -> int:
         # Docstrings are defined in child classes due to their differing implementations.
@@ -53,6 +62,19 @@ class RateLimit(metaclass=ABCMeta):
 
         pass
 
+    def try_increment(self) -> bool:
+        """
+        This function counts a request only if the rate limit has not been exceeded.
+
+        It returns `True` if the request was counted and may be sent, `False` otherwise.
+        Limits in a shared store check and count atomically, across clients and processes.
+        """
+
+        if self.is_exceeded():
+            return False
+        self.increment()
+        return True
+
 
 class SingleRateLimit(RateLimit):
     """
@@ -83,6 +105,14 @@ class SingleRateLimit(RateLimit):
     def get_limit(self) -> int:
         return self.__limit
 
+    def set_limit(self, limit: int):
+        """
+        This function replaces the request limit, e.g. with the limit reported by the server.
+        """
+
+        self.__limit = limit
+        self.__exceeded = self.__counter >= limit
+
     def get_limit_type(self) -> "LimitType":
         return self.__type
 
@@ -146,24 +176,152 @@ class SingleRateLimit(RateLimit):
         )
 
 
+class SlidingWindowRateLimit(RateLimit):
+    """
+    A sliding-log rate limit implementation for a single rate limit, such as a burst or sustain limit.
+    This is the default implementation used by the CombinedRateLimit class.
+
+    Unlike `SingleRateLimit`, the window is not fixed to the first request of a cycle.
+    A request counts against the limit for exactly one time period after it was made,
+    so the full budget cannot be spent twice around a window boundary.
+
+    Request timestamps are kept in a `RateLimitStore` under the given key.
+    The default in-memory store uses a monotonic clock and amortized O(1) checks.
+    A shared store makes multiple clients or processes count against one budget.
+    """
+
+    def __init__(
+        self,
+        time_period: TimePeriod,
+        type: LimitType,
+        limit: int,
+        store: Optional[RateLimitStore] = None,
+        key: str = "",
+    ):
+        self.__time_period = time_period
+        self.__type = type
+        self.__limit = limit
+
+        self.__store = store or InMemoryRateLimitStore()
+        self.__key = key
+
+    def get_counter(self) -> int:
+        """
+        This function returns the number of requests within the current window.
+        """
+
+        counter, _ = self.__get_window()
+        return counter
+
+    def get_time_period(self) -> "TimePeriod":
+        return self.__time_period
+
+    def get_limit(self) -> int:
+        return self.__limit
+
+    def set_limit(self, limit: int):
+        """
+        This function replaces the request limit, e.g. with the limit reported by the server.
+        """
+
+        self.__limit = limit
+
+    def get_limit_type(self) -> "LimitType":
+        return self.__type
+
+    def get_reset_after(self) -> Union[datetime, None]:
+        """
+        This getter returns the time when the oldest request leaves the window.
+
+        If the limit is exceeded, this is the earliest time the next request is allowed.
+
+        If there are no requests within the window, `None` is returned.
+        """
+
+        _, oldest = self.__get_window()
+        if oldest is None:
+            return None
+
+        remaining = oldest + self.__time_period.value - self.__store.now()
+        return datetime.now() + timedelta(seconds=remaining)
+
+    def is_exceeded(self) -> bool:
+        """
+        This functions returns `True` if the rate limit has been exceeded.
+        """
+
+        counter, _ = self.__get_window()
+        return counter >= self.__limit
+
+    def increment(self) -> IncrementResult:
+        now = self.__store.now()
+        counter = self.__store.add(self.__key, now, now - self.__time_period.value)
+        return IncrementResult(counter=counter, exceeded=counter >= self.__limit)
+
+    def try_increment(self) -> bool:
+        now = self.__store.now()
+        return self.__store.try_add([self.get_window(now)], now)
+
+    def get_store(self) -> RateLimitStore:
+        return self.__store
+
+    def get_window(self, now: float) -> Tuple[str, float, int]:
+        """
+        This function returns the (key, window_start, limit) of this limit at `now`, as used by `RateLimitStore.try_add`.
+        """
+
+        return self.__key, now - self.__time_period.value, self.__limit
+
+    def __get_window(self) -> Tuple[int, Optional[float]]:
+        window_start = self.__store.now() - self.__time_period.value
+        return self.__store.get_window(self.__key, window_start)
+
+
 class CombinedRateLimit(RateLimit):
     """
     A rate limit implementation for multiple rate limits, such as burst and sustain.
 
     """
 
-    def __init__(self, *parsed_limits: ParsedRateLimit, type: LimitType):
+    def __init__(
+        self,
+        *parsed_limits: ParsedRateLimit,
+        type: LimitType,
+        policy: Optional[RateLimitPolicy] = None,
+        limit_class: Type[
+            Union[SingleRateLimit, SlidingWindowRateLimit]
+        ] = SlidingWindowRateLimit,
+        store: Optional[RateLimitStore] = None,
+        key: str = "",
+    ):
+        """
+        A shared `store` requires `SlidingWindowRateLimit` as limit_class.
+        The limits are stored under `key`, extended by limit type and time period.
+        """
         # *parsed_limits is a tuple
+        self.policy = policy
+
+        # Monotonic time until which the server asked us to back off (Retry-After)
+        self.__retry_after: Union[float, None] = None
 
-        # Create a SingleRateLimit instance for each limit
-        self.__limits: list[SingleRateLimit] = []
+        # Create a limit_class instance for each limit
+        self.__limits: List[Union[SingleRateLimit, SlidingWindowRateLimit]] = []
 
         for limit in parsed_limits:
             # Use the type param (enum LimitType) to determine which limit to select
             limit_num = limit.read if type == LimitType.READ else limit.write
 
-            # Create a new instance of SingleRateLimit and append it to the limits array.
-            srl = SingleRateLimit(limit.period, type, limit_num)
+            # Create a new instance of limit_class and append it to the limits array.
+            if store is not None:
+                srl = limit_class(
+                    limit.period,
+                    type,
+                    limit_num,
+                    store=store,
+                    key=f"{key}:{type.name}:{limit.period.name}",
+                )
+            else:
+                srl = limit_class(limit.period, type, limit_num)
             self.__limits.append(srl)
 
     def get_counter(self) -> int:
@@ -206,6 +364,12 @@ class CombinedRateLimit(RateLimit):
         # Convert the map object to a list
         dates = list(dates_map)
 
+        # Include the back-off requested by the server
+        if self.__is_retry_after_active():
+            dates.append(
+                datetime.now() + timedelta(seconds=self.__retry_after - monotonic())
+            )
+
         # Construct a new list with only elements of instance datetime
         # (Effectively filtering out any None elements)
         dates_valid = [elem for elem in dates if isinstance(elem, datetime)]
@@ -224,11 +388,13 @@ class CombinedRateLimit(RateLimit):
         return None
 
     # list -> List (typing.List) https://stackoverflow.com/a/63460173
-    def get_limits(self) -> List[SingleRateLimit]:
+    def get_limits(self) -> List[Union[SingleRateLimit, SlidingWindowRateLimit]]:
         return self.__limits
 
     # list -> List (typing.List) https://stackoverflow.com/a/63460173
-    def get_limits_by_period(self, period: TimePeriod) -> List[SingleRateLimit]:
+    def get_limits_by_period(
+        self, period: TimePeriod
+    ) -> List[Union[SingleRateLimit, SlidingWindowRateLimit]]:
         # Filter the list for the given LimitType
         matches = filter(lambda limit: limit.get_time_period() == period, self.__limits)
         # Convert the filter object to a list and return it
@@ -246,7 +412,71 @@ class CombinedRateLimit(RateLimit):
         is_exceeded_list = list(is_exceeded_map)
 
         # Return True if any variable in list is True
-        return True in is_exceeded_list
+        return True in is_exceeded_list or self.__is_retry_after_active()
+
+    def get_remaining(self) -> int:
+        """
+        This function returns the number of requests left before **any** rate limit is exceeded.
+
+        While the server asked us to back off (`Retry-After`), no requests are left.
+        """
+
+        if self.__is_retry_after_active():
+            return 0
+
+        remaining = [limit.get_limit() - limit.get_counter() for limit in self.__limits]
+        return max(0, min(remaining))
+
+    def set_retry_after(self, seconds: float):
+        """
+        This function marks the rate limit as exceeded for the given number of seconds.
+
+        It is used to honor the `Retry-After` header of a throttled (HTTP 429) response.
+        """
+
+        retry_after = monotonic() + seconds
+        if self.__retry_after is None or retry_after > self.__retry_after:
+            self.__retry_after = retry_after
+
+    def set_server_limit(self, max_requests: int, period_in_seconds: int):
+        """
+        This function replaces the limit of the matching time period with the limit reported by the server.
+
+        Xbox Live reports `maxRequests` and `periodInSeconds` in the body of throttled (HTTP 429) responses.
+        Limits with a different time period are left untouched.
+        """
+
+        for limit in self.__limits:
+            if limit.get_time_period().value == period_in_seconds:
+                limit.set_limit(max_requests)
+
+    def try_increment(self) -> bool:
+        """
+        This function counts a request only if **no** rate limit has been exceeded.
+
+        Sliding window limits sharing a store are checked and counted in one atomic step,
+        so clients and processes sharing the store cannot exceed the budget together.
+        """
+
+        if self.__is_retry_after_active():
+            return False
+
+        # Requires a single store holding all limits, e.g. not for SingleRateLimit
+        stores = {
+            limit.get_store() if isinstance(limit, SlidingWindowRateLimit) else None
+            for limit in self.__limits
+        }
+        if len(stores) != 1 or None in stores:
+            return super().try_increment()
+
+        store = stores.pop()
+        now = store.now()
+        return store.try_add([limit.get_window(now) for limit in self.__limits], now)
+
+    def __is_retry_after_active(self) -> bool:
+        if self.__retry_after is not None and self.__retry_after <= monotonic():
+            self.__retry_after = None
+        return self.__retry_after is not None
 
     def increment(self) -> IncrementResult:
         # Increment each limit
@@ -267,3 +497,30 @@ class CombinedRateLimit(RateLimit):
             ].counter,  # Use the highest counter (sorted in descending order)
             exceeded=self.is_exceeded(),  # Call self.is_exceeded (True if any limit has been exceeded, like an OR gate.)
         )
+
+
+def parse_retry_after(value: Union[str, None]) -> Union[float, None]:
+    """
+    Parse the value of a `Retry-After` header.
+
+    Both delay-seconds and HTTP-date are supported.
+
+    Returns the number of seconds to wait, or `None` if the value is missing or invalid.
+    """
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
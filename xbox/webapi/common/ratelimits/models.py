@@ -12,6 +12,11 @@ class LimitType(Enum):
     READ = 1
 
 
+class RateLimitPolicy(Enum):
+    RAISE = 0  # Raise RateLimitExceededException
+    WAIT = 1  # Wait (FIFO) until the rate limit resets
+
+
 class IncrementResult(BaseModel):
     counter: int
     exceeded: bool
@@ -0,0 +1,211 @@
+"""
+Rate limit stores
+
+Storage backends for the request logs of :class:`SlidingWindowRateLimit`.
+
+A store shared between clients - or between processes, for the SQLite store -
+makes them coordinate one budget per (xuid, provider, read/write).
+"""
+from abc import ABCMeta, abstractmethod
+from collections import deque
+import sqlite3
+import time
+from time import monotonic
+from typing import Deque, Dict, Optional, Sequence, Tuple
+
+
+class RateLimitStore(metaclass=ABCMeta):
+    """
+    Abstract storage for request timestamps, grouped by key.
+
+    Every store provides its own clock, timestamps are only compared within a store.
+    """
+
+    @abstractmethod
+    def now(self) -> float:
+        """
+        Returns the current time in seconds, on the clock used by this store.
+        """
+        pass
+
+    @abstractmethod
+    def get_window(self, key: str, window_start: float) -> Tuple[int, Optional[float]]:
+        """
+        Returns the number of requests after `window_start` and the oldest of their timestamps.
+
+        If there are no requests within the window, the timestamp is `None`.
+        """
+        pass
+
+    @abstractmethod
+    def add(self, key: str, timestamp: float, window_start: float) -> int:
+        """
+        Records a request at `timestamp` and drops requests up to `window_start`.
+
+        Returns the number of requests within the window, including the new one.
+        """
+        pass
+
+    @abstractmethod
+    def try_add(
+        self, windows: Sequence[Tuple[str, float, int]], timestamp: float
+    ) -> bool:
+        """
+        Records a request at `timestamp` under each key, if every limit allows it.
+
+        `windows` holds (key, window_start, limit) tuples, e.g. the burst and
+        sustain limits of one budget. Checking and recording is atomic, so
+        concurrent clients sharing the store cannot exceed a limit together.
+
+        Returns `True` if the request was recorded, `False` if a limit is exhausted.
+        """
+        pass
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    A store keeping the request logs in memory, using a monotonic clock.
+
+    This is the default store, one instance per :class:`SlidingWindowRateLimit`.
+    Pass a single instance to multiple clients to share budgets within a process.
+    """
+
+    def __init__(self):
+        self.__logs: Dict[str, Deque[float]] = {}
+
+    def now(self) -> float:
+        return monotonic()
+
+    def get_window(self, key: str, window_start: float) -> Tuple[int, Optional[float]]:
+        log = self.__logs.get(key)
+        if not log:
+            return 0, None
+
+        self.__drop_expired(log, window_start)
+        return len(log), log[0] if log else None
+
+    def add(self, key: str, timestamp: float, window_start: float) -> int:
+        log = self.__logs.setdefault(key, deque())
+        self.__drop_expired(log, window_start)
+        log.append(timestamp)
+        return len(log)
+
+    def try_add(
+        self, windows: Sequence[Tuple[str, float, int]], timestamp: float
+    ) -> bool:
+        for key, window_start, limit in windows:
+            count, _ = self.get_window(key, window_start)
+            if count >= limit:
+                return False
+        for key, window_start, _ in windows:
+            self.add(key, timestamp, window_start)
+        return True
+
+    @staticmethod
+    def __drop_expired(log: Deque[float], window_start: float):
+        # Each timestamp is dropped once, so this is amortized O(1)
+        while log and log[0] <= window_start:
+            log.popleft()
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    A store keeping the request logs in a SQLite database.
+
+    All processes opening the same database file share their budgets.
+    SQLite's file locking serializes the updates, and timestamps are taken
+    from the wall clock so they compare across processes.
+
+    To keep the database in shared memory, place it on a tmpfs (e.g. `/dev/shm`).
+
+    Queries run on the calling thread, i.e. block the event loop. They take
+    microseconds, but wait up to `timeout` seconds while another process
+    holds the lock, so keep the number of processes sharing a database moderate.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        Open or create the database
+
+        Args:
+            path: Path of the database file
+            timeout: Seconds to wait for a lock held by another process
+        """
+        # Autocommit mode, transactions are started explicitly
+        self.__connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_log "
+            "(key TEXT NOT NULL, timestamp REAL NOT NULL)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS rate_limit_log_key_timestamp "
+            "ON rate_limit_log (key, timestamp)"
+        )
+
+    def now(self) -> float:
+        return time.time()
+
+    def get_window(self, key: str, window_start: float) -> Tuple[int, Optional[float]]:
+        count, oldest = self.__connection.execute(
+            "SELECT COUNT(*), MIN(timestamp) FROM rate_limit_log "
+            "WHERE key = ? AND timestamp > ?",
+            (key, window_start),
+        ).fetchone()
+        return count, oldest
+
+    def add(self, key: str, timestamp: float, window_start: float) -> int:
+        # Take the write lock up front, so the count includes concurrent writers
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.__connection.execute(
+                "DELETE FROM rate_limit_log WHERE key = ? AND timestamp <= ?",
+                (key, window_start),
+            )
+            self.__connection.execute(
+                "INSERT INTO rate_limit_log (key, timestamp) VALUES (?, ?)",
+                (key, timestamp),
+            )
+            (count,) = self.__connection.execute(
+                "SELECT COUNT(*) FROM rate_limit_log WHERE key = ?", (key,)
+            ).fetchone()
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            raise
+        self.__connection.execute("COMMIT")
+        return count
+
+    def try_add(
+        self, windows: Sequence[Tuple[str, float, int]], timestamp: float
+    ) -> bool:
+        # Count and insert within one write transaction, see `add`
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            for key, window_start, limit in windows:
+                (count,) = self.__connection.execute(
+                    "SELECT COUNT(*) FROM rate_limit_log WHERE key = ? AND timestamp > ?",
+                    (key, window_start),
+                ).fetchone()
+                if count >= limit:
+                    self.__connection.execute("ROLLBACK")
+                    return False
+            for key, window_start, _ in windows:
+                self.__connection.execute(
+                    "DELETE FROM rate_limit_log WHERE key = ? AND timestamp <= ?",
+                    (key, window_start),
+                )
+                self.__connection.execute(
+                    "INSERT INTO rate_limit_log (key, timestamp) VALUES (?, ?)",
+                    (key, timestamp),
+                )
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            raise
+        self.__connection.execute("COMMIT")
+        return True
+
+    def close(self):
+        """
+        Close the database connection
+        """
+        self.__connection.close()
@@ -3,16 +3,19 @@ Request Signer
 
 Employed for generating the "Signature" header in authentication requests.
 """
+import asyncio
 import base64
+from concurrent.futures import Executor
 from datetime import datetime, timezone
 import hashlib
 import struct
-from typing import Optional
+from typing import Iterable, Optional, Tuple, Union
 
 from ecdsa import NIST256p, SigningKey, VerifyingKey
 
 from xbox.webapi.authentication.models import SignaturePolicy
 from xbox.webapi.common import filetimes
+from xbox.webapi.common.signing_backend import get_signing_backend
 
 DEFAULT_SIGNING_POLICY = SignaturePolicy(
     version=1, supported_algorithms=["ES256"], max_body_bytes=8192
@@ -20,11 +23,13 @@ DEFAULT_SIGNING_POLICY = SignaturePolicy(
 
 
 class RequestSigner:
-    def __init__(self, signing_key=None, signing_policy=None):
+    def __init__(self, signing_key=None, signing_policy=None, backend=None):
         self.signing_key: SigningKey = signing_key or SigningKey.generate(
             curve=NIST256p
         )
         self.signing_policy = signing_policy or DEFAULT_SIGNING_POLICY
+        # "cryptography" (OpenSSL) if installed, "ecdsa" otherwise
+        self.backend = get_signing_backend(self.signing_key, backend)
 
         pk_point = self.signing_key.verifying_key.pubkey.point
         self.proof_field = {
@@ -44,9 +49,9 @@ class RequestSigner:
         return SigningKey.from_pem(signing_key)
 
     @classmethod
-    def from_pem(cls, pem_string: str):
+    def from_pem(cls, pem_string: str, backend: Optional[str] = None):
         request_signer = RequestSigner.import_signing_key(pem_string)
-        return cls(request_signer)
+        return cls(request_signer, backend=backend)
 
     @staticmethod
     def get_timestamp_buffer(dt: datetime) -> bytes:
@@ -96,7 +101,7 @@ class RequestSigner:
         self,
         method: str,
         path_and_query: str,
-        body: bytes = b"",
+        body: Union[bytes, Iterable[bytes]] = b"",
         authorization: str = "",
         timestamp: datetime = None,
     ) -> str:
@@ -108,39 +113,89 @@ class RequestSigner:
         )
         return base64.b64encode(signature).decode("ascii")
 
+    async def sign_async(
+        self,
+        method: str,
+        path_and_query: str,
+        body_chunks: Iterable[bytes] = (),
+        authorization: str = "",
+        timestamp: datetime = None,
+        executor: Optional[Executor] = None,
+    ) -> str:
+        """
+        Sign a request, computing the ECDSA signature in `executor`
+
+        The body is hashed incrementally on the calling thread, chunks beyond
+        `max_body_bytes` of the signing policy are not read.
+
+        Args:
+            method: HTTP method
+            path_and_query: Path and query of the URL
+            body_chunks: Body, in chunks
+            authorization: Value of the "Authorization" header
+            timestamp: Signing time, now if omitted
+            executor: Executor for the signing, signs on the event loop if `None`
+
+        Returns: Value of the "Signature" header
+        """
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        prefix, digest = self._get_digest(
+            method, path_and_query, body_chunks, authorization, timestamp
+        )
+        if executor is None:
+            signature = self.backend.sign_digest(digest)
+        else:
+            signature = await asyncio.get_running_loop().run_in_executor(
+                executor, self.backend.sign_digest, digest
+            )
+        return base64.b64encode(prefix + signature).decode("ascii")
+
     def _sign_raw(
         self,
         method: str,
         path_and_query: str,
-        body: bytes,
+        body: Union[bytes, Iterable[bytes]],
         authorization: str,
         timestamp: datetime,
     ) -> bytes:
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            body = (body,)
+        prefix, digest = self._get_digest(
+            method, path_and_query, body, authorization, timestamp
+        )
+
+        # Sign the hash
+        signature = self.backend.sign_digest(digest)
+
+        # Return signature version + timestamp encoded + signature
+        return prefix + signature
+
+    def _get_digest(
+        self,
+        method: str,
+        path_and_query: str,
+        body_chunks: Iterable[bytes],
+        authorization: str,
+        timestamp: datetime,
+    ) -> Tuple[bytes, bytes]:
         # Get big-endian representation of signature version and timestamp (FILETIME)
         signature_version_bytes = self.get_signature_version_buffer(
             self.signing_policy.version
         )
         ts_bytes = self.get_timestamp_buffer(timestamp)
 
-        # Concatenate bytes to sign + hash
-        data = self._concat_data_to_sign(
+        digest = self._hash_data_to_sign(
             signature_version_bytes,
             method,
             path_and_query,
-            body,
+            body_chunks,
             authorization,
             ts_bytes,
             self.signing_policy.max_body_bytes,
         )
-
-        # Calculate digest
-        digest = self._hash(data)
-
-        # Sign the hash
-        signature = self.signing_key.sign_digest_deterministic(digest)
-
-        # Return signature version + timestamp encoded + signature
-        return signature_version_bytes + ts_bytes + signature
+        return signature_version_bytes + ts_bytes, digest
 
     @staticmethod
     def _hash(data: bytes) -> bytes:
@@ -175,6 +230,42 @@ class RequestSigner:
             + b"\x00"
         )
 
+    @staticmethod
+    def _hash_data_to_sign(
+        signature_version: bytes,
+        method: str,
+        path_and_query: str,
+        body_chunks: Iterable[bytes],
+        authorization: str,
+        ts_bytes: bytes,
+        max_body_bytes: int,
+    ) -> bytes:
+        """
+        Hash the same data as :meth:`_concat_data_to_sign`, without concatenating it
+        """
+        hash = hashlib.sha256()
+        for field in (
+            signature_version,
+            ts_bytes,
+            method.upper().encode("ascii"),
+            path_and_query.encode("ascii"),
+            authorization.encode("ascii"),
+        ):
+            hash.update(field)
+            hash.update(b"\x00")
+
+        remaining = max_body_bytes
+        for chunk in body_chunks:
+            if remaining <= 0:
+                break
+            # Slicing a memoryview does not copy the chunk
+            view = memoryview(chunk)[:remaining]
+            hash.update(view)
+            remaining -= len(view)
+        hash.update(b"\x00")
+
+        return hash.digest()
+
     @staticmethod
     def __base64_escaped(binary: bytes) -> str:
         encoded = base64.b64encode(binary).decode("ascii")
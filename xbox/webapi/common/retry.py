@@ -0,0 +1,163 @@
+"""
+Retry
+
+Retry policies for transient failures, used by :class:`Session`.
+"""
+from collections import deque
+import random
+from time import monotonic
+from typing import Collection, Optional, Tuple, Type
+
+import httpx
+
+# Methods that can be repeated without changing the result
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Throttled, or server side failures that are likely to go away
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryBudget:
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        ttl: float = 10.0,
+    ):
+        """
+        Limit retries to a fraction of the requests
+
+        When a service is down, every request fails and would be retried
+        several times, multiplying the load. The budget allows
+        `ratio` retries per request sent in the last `ttl` seconds, plus a
+        minimum of `min_retries_per_second` for low traffic.
+
+        Args:
+            ratio: Retries allowed per request
+            min_retries_per_second: Retries allowed regardless of traffic
+            ttl: Seconds requests and retries are taken into account
+        """
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.ttl = ttl
+        # Number of retries denied because the budget was exhausted
+        self.exhausted = 0
+
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+
+    def record_request(self) -> None:
+        """
+        Deposit a request, called once per request (not per attempt)
+        """
+        now = monotonic()
+        self._expire(now)
+        self._requests.append(now)
+
+    def try_withdraw(self) -> bool:
+        """
+        Withdraw a retry
+
+        Returns: True if the retry is allowed, False if the budget is exhausted
+        """
+        now = monotonic()
+        self._expire(now)
+        allowed = self.min_retries_per_second * self.ttl + self.ratio * len(
+            self._requests
+        )
+        if len(self._retries) >= allowed:
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def _expire(self, now: float) -> None:
+        for entries in (self._requests, self._retries):
+            while entries and entries[0] <= now - self.ttl:
+                entries.popleft()
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+        status_codes: Collection[int] = RETRY_STATUS_CODES,
+        exceptions: Tuple[Type[Exception], ...] = (httpx.TransportError,),
+        respect_retry_after: bool = True,
+    ):
+        """
+        Decide if and when a failed request is repeated
+
+        Delays follow "decorrelated jitter" backoff: each delay is drawn
+        between `base_delay` and three times the previous delay, capped at
+        `max_delay`. This spreads retries of many clients over time.
+
+        Args:
+            max_attempts: Maximum number of attempts, including the first one
+            base_delay: Minimum delay between attempts in seconds
+            max_delay: Maximum delay between attempts in seconds
+            methods: HTTP methods to retry, idempotent ones by default
+            status_codes: Response status codes to retry
+            exceptions: Exceptions to retry, connection errors and timeouts by default
+            respect_retry_after: Wait at least `Retry-After` seconds, if sent by
+                the server. A longer `Retry-After` than `max_delay` ends retrying.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.methods = frozenset(m.upper() for m in methods)
+        self.status_codes = frozenset(status_codes)
+        self.exceptions = exceptions
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+        exception: Optional[Exception] = None,
+    ) -> bool:
+        """
+        Check if an attempt failed in a way that is worth repeating
+
+        Args:
+            method: HTTP method
+            attempt: Number of the failed attempt, starting at 1
+            response: Response of the attempt, if any
+            exception: Exception raised by the attempt, if any
+
+        Returns: True if another attempt should be made
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return False
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return response is not None and response.status_code in self.status_codes
+
+    def get_delay(
+        self, previous_delay: Optional[float], retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Get the delay before the next attempt
+
+        Args:
+            previous_delay: Delay before the previous attempt, `None` on first retry
+            retry_after: Seconds requested by the server via `Retry-After`
+
+        Returns: Seconds to wait, `None` if the server asks to wait for too long
+        """
+        upper = max(self.base_delay, (previous_delay or self.base_delay) * 3)
+        delay = min(self.max_delay, random.uniform(self.base_delay, upper))
+        if self.respect_retry_after and retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+# Pass as `retry_policy` to disable retries for a call or provider
+NO_RETRY = RetryPolicy(max_attempts=1)
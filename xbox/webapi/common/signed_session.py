@@ -5,44 +5,87 @@ A wrapper around httpx' AsyncClient which transparently calculates the "Signatur
 
 import httpx
 
+from concurrent.futures import Executor
 from ssl import SSLContext
+from typing import Optional
+
 from xbox.webapi.common.request_signer import RequestSigner
+from xbox.webapi.common.transport import TransportConfig
 
 
 class SignedSession(httpx.AsyncClient):
-    def __init__(self, request_signer=None, ssl_context: SSLContext=None):
-        super().__init__(verify=ssl_context if ssl_context is not None else True)
+    def __init__(
+        self,
+        request_signer=None,
+        ssl_context: SSLContext = None,
+        transport_config: Optional[TransportConfig] = None,
+        sign_executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            request_signer: Signer for the "Signature" header, a new key if omitted
+            ssl_context: SSL context for certificate verification
+            transport_config: Connection pool, HTTP/2 and timeout settings
+            sign_executor: Executor for computing signatures off the event loop,
+                e.g. a thread pool for many concurrent signed requests
+        """
+        self.transport_config = transport_config or TransportConfig()
+        super().__init__(
+            **self.transport_config.get_client_kwargs(
+                verify=ssl_context if ssl_context is not None else True
+            )
+        )
 
         self.request_signer = request_signer or RequestSigner()
+        self.sign_executor = sign_executor
 
     @classmethod
-    def from_pem_signing_key(cls, pem_string: str):
+    def from_pem_signing_key(
+        cls,
+        pem_string: str,
+        transport_config: Optional[TransportConfig] = None,
+        sign_executor: Optional[Executor] = None,
+    ):
         request_signer = RequestSigner.from_pem(pem_string)
-        return cls(request_signer)
+        return cls(
+            request_signer,
+            transport_config=transport_config,
+            sign_executor=sign_executor,
+        )
 
     def _prepare_signed_request(self, request: httpx.Request) -> httpx.Request:
         path_and_query = request.url.raw_path.decode()
         authorization = request.headers.get("Authorization", "")
 
-        body = b""
-        for byte in request.stream:
-            body += byte
-
+        # Body chunks are hashed as they are, without joining them
         signature = self.request_signer.sign(
             method=request.method,
             path_and_query=path_and_query,
-            body=body,
+            body=request.stream,
             authorization=authorization,
         )
 
         request.headers["Signature"] = signature
         return request
 
+    async def _prepare_signed_request_async(
+        self, request: httpx.Request
+    ) -> httpx.Request:
+        # Signing runs in `sign_executor`, if set
+        request.headers["Signature"] = await self.request_signer.sign_async(
+            method=request.method,
+            path_and_query=request.url.raw_path.decode(),
+            body_chunks=request.stream,
+            authorization=request.headers.get("Authorization", ""),
+            executor=self.sign_executor,
+        )
+        return request
+
     async def send_request_signed(self, request: httpx.Request) -> httpx.Response:
         """
         Shorthand for prepare signed + send
         """
-        prepared = self._prepare_signed_request(request)
+        prepared = await self._prepare_signed_request_async(request)
         return await self.send(prepared)
 
     async def send_signed(self, method: str, url: str, **kwargs):
@@ -50,5 +93,5 @@ class SignedSession(httpx.AsyncClient):
         Shorthand for creating request + prepare signed + send
         """
         request = httpx.Request(method, url, **kwargs)
-        prepared = self._prepare_signed_request(request)
+        prepared = await self._prepare_signed_request_async(request)
         return await self.send(prepared)
@@ -0,0 +1,126 @@
+"""
+Signing Backend
+
+ECDSA implementations for :class:`RequestSigner`, all producing identical signatures.
+"""
+from abc import ABCMeta, abstractmethod
+from typing import Dict, Optional, Type
+
+from ecdsa import SigningKey, rfc6979
+
+try:
+    from cryptography.hazmat.primitives.asymmetric import ec
+except ImportError:  # pragma: no cover
+    ec = None
+
+
+class SigningBackend(metaclass=ABCMeta):
+    """
+    Abstract ECDSA implementation, signing with a given key
+    """
+
+    name: str
+
+    def __init__(self, signing_key: SigningKey):
+        self.signing_key = signing_key
+
+    @abstractmethod
+    def sign_digest(self, digest: bytes) -> bytes:
+        """
+        Sign a digest deterministically (RFC 6979)
+
+        Args:
+            digest: Hash of the data to sign
+
+        Returns: Signature, raw `r || s`
+        """
+        pass
+
+
+class EcdsaBackend(SigningBackend):
+    """
+    Pure Python, via the `ecdsa` package
+    """
+
+    name = "ecdsa"
+
+    def sign_digest(self, digest: bytes) -> bytes:
+        return self.signing_key.sign_digest_deterministic(digest)
+
+
+class CryptographyBackend(SigningBackend):
+    """
+    OpenSSL, via the `cryptography` package
+
+    The nonce is derived exactly like `ecdsa` does, with the default hash
+    function of the key (SHA-1 for keys loaded from PEM). OpenSSL's own
+    deterministic signing uses the hash of the digest instead, so only the
+    expensive point multiplication is done by OpenSSL to stay byte compatible.
+    """
+
+    name = "cryptography"
+
+    def __init__(self, signing_key: SigningKey):
+        if ec is None:
+            raise ImportError(
+                "Signing backend 'cryptography' requires the cryptography package"
+            )
+        if signing_key.curve.name != "NIST256p":
+            raise ValueError(f"Unsupported curve: {signing_key.curve.name}")
+        super().__init__(signing_key)
+        self._order = signing_key.curve.order
+        self._size = signing_key.curve.baselen
+        self._secret = signing_key.privkey.secret_multiplier
+
+    def sign_digest(self, digest: bytes) -> bytes:
+        if len(digest) > self._size:
+            raise ValueError(f"Digest is longer than {self._size} bytes")
+
+        order = self._order
+        number = int.from_bytes(digest, "big")
+        retry_gen = 0
+        while True:
+            k = rfc6979.generate_k(
+                order,
+                self._secret,
+                self.signing_key.default_hashfunc,
+                digest,
+                retry_gen=retry_gen,
+            )
+            point = ec.derive_private_key(k, ec.SECP256R1()).public_key()
+            r = point.public_numbers().x % order
+            s = pow(k, -1, order) * (number + self._secret * r) % order
+            if r and s:
+                break
+            retry_gen += 1
+
+        return r.to_bytes(self._size, "big") + s.to_bytes(self._size, "big")
+
+
+BACKENDS: Dict[str, Type[SigningBackend]] = {
+    EcdsaBackend.name: EcdsaBackend,
+    CryptographyBackend.name: CryptographyBackend,
+}
+
+
+def get_signing_backend(
+    signing_key: SigningKey, backend: Optional[str] = None
+) -> SigningBackend:
+    """
+    Create a signing backend for `signing_key`
+
+    Args:
+        signing_key: Private key
+        backend: "cryptography" or "ecdsa", auto-detect if `None`:
+            cryptography if installed and the curve is supported, ecdsa otherwise
+
+    Returns: Signing backend
+    """
+    if backend is None:
+        if ec is not None and signing_key.curve.name == "NIST256p":
+            backend = CryptographyBackend.name
+        else:
+            backend = EcdsaBackend.name
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown signing backend: {backend}")
+    return BACKENDS[backend](signing_key)
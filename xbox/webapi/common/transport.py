@@ -0,0 +1,128 @@
+"""
+Transport
+
+Connection pool, HTTP/2 and timeout settings for :class:`SignedSession`.
+"""
+import asyncio
+from ssl import SSLContext
+from typing import AsyncIterator, Callable, Dict, Optional, Union
+
+import httpx
+from pydantic.dataclasses import dataclass
+
+
+@dataclass
+class TransportConfig:
+    """
+    Connection settings, the defaults match those of httpx
+
+    Requests are spread over many `*.xboxlive.com` hosts. Raise
+    `max_connections` and `max_keepalive_connections` for high
+    concurrency, and bound the share of a single host with
+    `max_connections_per_host`. HTTP/2 multiplexes concurrent requests to
+    a host over one connection, it requires the `h2` package
+    (`pip install xbox-webapi[http2]`).
+    """
+
+    # Maximum number of open connections, across all hosts
+    max_connections: Optional[int] = 100
+    # Maximum number of idle connections kept open for reuse
+    max_keepalive_connections: Optional[int] = 20
+    # Seconds an idle connection is kept open
+    keepalive_expiry: Optional[float] = 5.0
+    # Maximum number of concurrent requests per host, unlimited if None
+    max_connections_per_host: Optional[int] = None
+    http2: bool = False
+    connect_timeout: Optional[float] = 5.0
+    read_timeout: Optional[float] = 5.0
+    write_timeout: Optional[float] = 5.0
+    # Seconds to wait for a free connection from the pool
+    pool_timeout: Optional[float] = 5.0
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def get_client_kwargs(self, verify: Union[SSLContext, bool] = True) -> dict:
+        """
+        Get keyword arguments for :class:`httpx.AsyncClient`
+        """
+        kwargs = {"timeout": self.timeout}
+        if self.max_connections_per_host is None:
+            kwargs.update(verify=verify, http2=self.http2, limits=self.limits)
+        else:
+            # Client level pool settings are ignored once a transport is passed
+            kwargs["transport"] = HostLimitedTransport(
+                self.max_connections_per_host,
+                verify=verify,
+                http2=self.http2,
+                limits=self.limits,
+            )
+        return kwargs
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class HostLimitedTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, max_connections_per_host: int, **kwargs):
+        """
+        Transport that bounds the number of concurrent requests per host
+
+        A request holds its slot until the response is closed, i.e. until
+        its body was read for regular, non-streaming requests.
+
+        Args:
+            max_connections_per_host: Maximum number of concurrent requests per host
+            kwargs: Arguments for :class:`httpx.AsyncHTTPTransport`
+        """
+        super().__init__(**kwargs)
+        self.max_connections_per_host = max_connections_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(
+                self.max_connections_per_host
+            )
+
+        await semaphore.acquire()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        response.stream = _ReleasingStream(response.stream, semaphore.release)
+        return response
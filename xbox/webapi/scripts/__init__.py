@@ -1,7 +1,10 @@
+from argparse import ArgumentParser, Namespace
 import os
 
 from appdirs import user_data_dir
 
+from xbox.webapi.common.transport import TransportConfig
+
 CLIENT_ID = "388ea51c-0b25-4029-aae2-17df49d23905"
 # No secret needed, we registered as "Desktop App" in Azure AD
 CLIENT_SECRET = ""
@@ -13,3 +16,46 @@ XAL_TOKENS_FILE = os.path.join(DATA_DIR, "xal_tokens.json")
 
 if not os.path.exists(DATA_DIR):
     os.makedirs(DATA_DIR)
+
+
+def add_transport_arguments(parser: ArgumentParser) -> None:
+    """
+    Add connection pool, HTTP/2 and timeout options to a script's arguments
+    """
+    group = parser.add_argument_group("transport")
+    group.add_argument(
+        "--max-connections",
+        type=int,
+        default=100,
+        help="Maximum number of open connections. Default: 100",
+    )
+    group.add_argument(
+        "--max-connections-per-host",
+        type=int,
+        default=None,
+        help="Maximum number of concurrent requests per host. Default: unlimited",
+    )
+    group.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use HTTP/2, requires 'pip install xbox-webapi[http2]'",
+    )
+    group.add_argument(
+        "--timeout",
+        type=float,
+        default=5.0,
+        help="Connect/read timeout in seconds. Default: 5",
+    )
+
+
+def transport_config_from_args(args: Namespace) -> TransportConfig:
+    """
+    Build :class:`TransportConfig` from options added by :func:`add_transport_arguments`
+    """
+    return TransportConfig(
+        max_connections=args.max_connections,
+        max_connections_per_host=args.max_connections_per_host,
+        http2=args.http2,
+        connect_timeout=args.timeout,
+        read_timeout=args.timeout,
+    )
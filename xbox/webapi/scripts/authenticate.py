@@ -12,7 +12,7 @@ from urllib.parse import parse_qs, urlparse
 import webbrowser
 
 from xbox.webapi.authentication.manager import AuthenticationManager
-from xbox.webapi.authentication.models import OAuth2TokenResponse
+from xbox.webapi.authentication.stores import FileTokenStore
 from xbox.webapi.common.signed_session import SignedSession
 from xbox.webapi.scripts import CLIENT_ID, CLIENT_SECRET, REDIRECT_URI, TOKENS_FILE
 
@@ -78,12 +78,13 @@ async def do_auth(
             session, client_id, client_secret, redirect_uri
         )
 
-        # Refresh tokens if we have them
-        if os.path.exists(token_filepath):
-            with open(token_filepath) as f:
-                tokens = f.read()
-            auth_mgr.oauth = OAuth2TokenResponse.model_validate_json(tokens)
-            await auth_mgr.refresh_tokens()
+        store = FileTokenStore(token_filepath)
+
+        # Refresh tokens if we have them, valid ones are reused as they are
+        async with store.alocked():
+            if store.load_into(auth_mgr):
+                await auth_mgr.refresh_tokens()
+                store.save_from(auth_mgr)
 
         # Request new ones if they are not valid
         if not (auth_mgr.xsts_token and auth_mgr.xsts_token.is_valid()):
@@ -93,9 +94,8 @@ async def do_auth(
             code = QUEUE.get()
             await auth_mgr.request_tokens(code)
 
-        with open(token_filepath, mode="w") as f:
-            print(f"Finished authentication, writing tokens to {token_filepath}")
-            f.write(auth_mgr.oauth.json())
+        print(f"Finished authentication, writing tokens to {token_filepath}")
+        store.save_from(auth_mgr)
 
 
 async def async_main():
@@ -14,9 +14,15 @@ from xbox.webapi.api.provider.account.models import (
     ClaimGamertagResult,
 )
 from xbox.webapi.authentication.manager import AuthenticationManager
-from xbox.webapi.authentication.models import OAuth2TokenResponse
+from xbox.webapi.authentication.stores import FileTokenStore
 from xbox.webapi.common.signed_session import SignedSession
-from xbox.webapi.scripts import CLIENT_ID, CLIENT_SECRET, TOKENS_FILE
+from xbox.webapi.scripts import (
+    CLIENT_ID,
+    CLIENT_SECRET,
+    TOKENS_FILE,
+    add_transport_arguments,
+    transport_config_from_args,
+)
 
 
 async def async_main():
@@ -41,6 +47,7 @@ async def async_main():
     )
     parser.add_argument("gamertag", help="Desired Gamertag")
 
+    add_transport_arguments(parser)
     args = parser.parse_args()
 
     if len(args.gamertag) > 15:
@@ -51,22 +58,22 @@ async def async_main():
         print("No token file found, run xbox-authenticate")
         sys.exit(-1)
 
-    async with SignedSession() as session:
+    transport_config = transport_config_from_args(args)
+    async with SignedSession(transport_config=transport_config) as session:
         auth_mgr = AuthenticationManager(
             session, args.client_id, args.client_secret, ""
         )
 
-        with open(args.tokens) as f:
-            tokens = f.read()
-        auth_mgr.oauth = OAuth2TokenResponse.model_validate_json(tokens)
-        try:
-            await auth_mgr.refresh_tokens()
-        except HTTPStatusError:
-            print("Could not refresh tokens")
-            sys.exit(-1)
-
-        with open(args.tokens, mode="w") as f:
-            f.write(auth_mgr.oauth.json())
+        # Tokens that are still valid are reused, others are refreshed
+        store = FileTokenStore(args.tokens)
+        async with store.alocked():
+            store.load_into(auth_mgr)
+            try:
+                await auth_mgr.refresh_tokens()
+            except HTTPStatusError:
+                print("Could not refresh tokens")
+                sys.exit(-1)
+            store.save_from(auth_mgr)
 
         xbl_client = XboxLiveClient(auth_mgr)
 
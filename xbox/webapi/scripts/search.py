@@ -11,15 +11,18 @@ from httpx import HTTPStatusError
 from xbox.webapi.api.client import XboxLiveClient
 from xbox.webapi.authentication.manager import AuthenticationManager
 from xbox.webapi.common.signed_session import SignedSession
+from xbox.webapi.scripts import add_transport_arguments, transport_config_from_args
 
 
 async def async_main():
     parser = argparse.ArgumentParser(description="Search for Content on XBL")
     parser.add_argument("search_query", help="Name to search for")
 
+    add_transport_arguments(parser)
     args = parser.parse_args()
 
-    async with SignedSession() as session:
+    transport_config = transport_config_from_args(args)
+    async with SignedSession(transport_config=transport_config) as session:
         auth_mgr = AuthenticationManager(session, "", "", "")
 
         # No Auth necessary for catalog searches
@@ -5,6 +5,7 @@ import argparse
 import asyncio
 import json
 import os
+from typing import Optional
 import uuid
 
 from pydantic import BaseModel
@@ -14,6 +15,7 @@ from xbox.webapi.authentication.models import (
     SisuAuthorizationResponse,
     XalAppParameters,
     XalClientParameters,
+    XalDeviceState,
 )
 from xbox.webapi.authentication.xal import (
     APP_PARAMS_GAMEPASS_BETA,
@@ -31,6 +33,7 @@ class XALStore(BaseModel):
     device_id: uuid.UUID
     app_params: XalAppParameters
     client_params: XalClientParameters
+    device: Optional[XalDeviceState] = None
 
 
 def user_prompt_authentication(auth_url: str) -> str:
@@ -63,11 +66,14 @@ async def do_auth(device_id: uuid.UUID, token_filepath: str):
             # Convert SISU authorization data
             store = XALStore(**store)
 
+        # Do authentication, reusing the device token of a previous run
         if store:
-            raise NotImplementedError("Token refreshing")
-
-        # Do authentication
+            device_id = store.device_id
+            app_params = store.app_params
+            client_params = store.client_params
         xal = XALManager(session, device_id, app_params, client_params)
+        if store and store.device:
+            xal.import_device_state(store.device)
         response = await xal.auth_flow(user_prompt_authentication)
         print(f"Sisu auth finished:\n\n{response}")
 
@@ -77,6 +83,7 @@ async def do_auth(device_id: uuid.UUID, token_filepath: str):
             device_id=device_id,
             app_params=app_params,
             client_params=client_params,
+            device=xal.export_device_state(),
         )
 
         with open(token_filepath, mode="w") as f: